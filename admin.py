@@ -0,0 +1,397 @@
+# admin.py
+from datetime import date, timedelta
+
+from flask import Blueprint, current_app, request, jsonify, render_template
+from flask_login import login_required, current_user
+from sqlalchemy import func
+
+from db_routing import replica_reads
+from extensions import db, user_cache, dashboard_cache
+from helpers import api_login_required, next_display_order, apply_full_reorder, handle_move_request
+from models import Employee, Position, WorkArea, Holiday, Notification, DailyEmployeeHours
+from pool_stats import pool_monitor
+
+bp = Blueprint('admin', __name__)
+
+
+@bp.route('/api/admin/cache-stats', methods=['GET'])
+@api_login_required
+def get_cache_stats():
+    return jsonify({'user_cache': user_cache.stats(), 'dashboard_cache': dashboard_cache.stats()})
+
+@bp.route('/api/admin/db-pool', methods=['GET'])
+@api_login_required
+def get_db_pool_stats():
+    return jsonify(pool_monitor.stats())
+
+def get_dashboard_stats(today):
+    """
+    Landing page totals in a single round trip. The month is matched with a plain
+    work_date range so the work_date index can be used instead of scanning every row.
+    """
+    stats = dashboard_cache.get(today)
+    if stats is not None:
+        return stats
+
+    month_start = today.replace(day=1)
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    row = db.session.execute(db.select(
+        db.select(func.coalesce(func.sum(DailyEmployeeHours.actual_hours), 0)).where(
+            DailyEmployeeHours.work_date >= month_start,
+            DailyEmployeeHours.work_date < next_month_start
+        ).scalar_subquery().label('this_months_hours'),
+        db.select(func.count(Employee.employee_id)).where(
+            Employee.employment_end_date == None
+        ).scalar_subquery().label('total_employees'),
+        db.select(func.count(WorkArea.work_area_id)).scalar_subquery().label('total_work_areas'),
+        db.select(func.count(Position.position_id)).scalar_subquery().label('total_positions'),
+        db.select(func.count(Holiday.id)).where(
+            Holiday.holiday_date >= today
+        ).scalar_subquery().label('upcoming_holidays')
+    )).one()
+
+    stats = dict(row._mapping)
+    dashboard_cache.set(today, stats)
+    return stats
+
+# --- Frontend Serving Routes ---
+@bp.route('/')
+@login_required
+def index():
+    return render_template('index.html', **get_dashboard_stats(date.today()))
+
+@bp.route('/work_areas')
+@login_required
+def work_areas_page():
+    return render_template('work_areas.html')
+
+@bp.route('/employees')
+@login_required
+def employees_page():
+    return render_template('employees.html')
+
+@bp.route('/positions')
+@login_required
+def positions_page():
+    return render_template('positions.html')
+
+@bp.route('/get_notifications')
+@login_required
+def get_notifications():
+    notifications = Notification.query.filter_by(user_id=current_user.id, is_read=False).order_by(Notification.timestamp.desc()).all()
+    return jsonify([{
+        'id': n.id,
+        'message': n.message,
+        'link': n.link,
+        'timestamp': n.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+    } for n in notifications])
+
+@bp.before_app_request
+def mark_notification_as_read():
+    if not current_user.is_authenticated:
+        return
+    notification_id = request.args.get('notification_id', type=int)
+    if notification_id:
+        notification = Notification.query.filter_by(id=notification_id, user_id=current_user.id).first()
+        if notification:
+            notification.is_read = True
+            db.session.commit()
+        else:
+            current_app.logger.debug("Notification %s not found for user %s; not marked as read.", notification_id, current_user.id)
+
+@bp.route('/holidays')
+@login_required
+def holidays_page():
+    return render_template('holidays.html')
+
+# --- API Endpoints ---
+@bp.route('/api/holidays', methods=['GET'])
+@api_login_required
+@replica_reads
+def get_holidays():
+    holidays = Holiday.query.order_by(Holiday.holiday_date.asc()).all()
+    return jsonify([h.to_dict() for h in holidays])
+
+@bp.route('/api/holidays', methods=['POST'])
+@api_login_required
+def add_holiday():
+    data = request.get_json()
+    if not data or not data.get('description') or not data.get('holiday_date'):
+        return jsonify({'message': 'Missing description or date'}), 400
+    try:
+        holiday_date = date.fromisoformat(data['holiday_date'])
+        if Holiday.query.filter_by(holiday_date=holiday_date).first():
+            return jsonify({'message': 'A holiday for this date already exists'}), 409
+        new_holiday = Holiday(description=data['description'], holiday_date=holiday_date)
+        db.session.add(new_holiday)
+        db.session.commit()
+        return jsonify(new_holiday.to_dict()), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 500
+
+@bp.route('/api/holidays/<int:id>', methods=['DELETE'])
+@api_login_required
+def delete_holiday(id):
+    holiday = Holiday.query.get_or_404(id)
+    db.session.delete(holiday)
+    db.session.commit()
+    return jsonify({'message': 'Holiday deleted successfully'}), 200
+
+# --- API Endpoints ---
+
+# Work Areas API
+@bp.route('/api/work-areas', methods=['GET'])
+@api_login_required
+@replica_reads
+def get_work_areas():
+    work_areas = WorkArea.query.order_by(WorkArea.display_order, WorkArea.work_area_id).all()
+    return jsonify([wa.to_dict() for wa in work_areas])
+
+@bp.route('/api/work-areas', methods=['POST'])
+@api_login_required
+def create_work_area():
+    data = request.get_json()
+    if not data or not 'work_area_name' in data or not 'reporting_week_start_offset_days' in data:
+        return jsonify({'message': 'Missing required data'}), 400
+    new_work_area = WorkArea(
+        work_area_name=data['work_area_name'],
+        reporting_week_start_offset_days=data['reporting_week_start_offset_days'],
+        contributing_duration_days=data.get('contributing_duration_days', 7),
+        display_order=next_display_order(WorkArea)
+    )
+    db.session.add(new_work_area)
+    db.session.commit()
+    return jsonify(new_work_area.to_dict()), 201
+
+@bp.route('/api/work-areas/<int:id>', methods=['PUT'])
+@api_login_required
+def update_work_area(id):
+    work_area = WorkArea.query.get_or_404(id)
+    data = request.get_json()
+    if not data:
+        return jsonify({'message': 'No data provided for update'}), 400
+    work_area.work_area_name = data.get('work_area_name', work_area.work_area_name)
+    work_area.reporting_week_start_offset_days = data.get('reporting_week_start_offset_days', work_area.reporting_week_start_offset_days)
+    work_area.contributing_duration_days = data.get('contributing_duration_days', work_area.contributing_duration_days)
+    db.session.commit()
+    return jsonify(work_area.to_dict())
+
+@bp.route('/api/work-areas/<int:id>', methods=['DELETE'])
+@api_login_required
+def delete_work_area(id):
+    work_area = WorkArea.query.get_or_404(id)
+    if Employee.query.filter_by(primary_work_area_id=id).count() > 0:
+        return jsonify({'message': 'Cannot delete work area with associated employees. Reassign employees first.'}), 409
+    if DailyEmployeeHours.query.filter_by(work_area_id=id).count() > 0:
+        return jsonify({'message': 'Cannot delete work area with associated daily hours entries. Delete related daily hours first.'}), 409
+    db.session.delete(work_area)
+    db.session.commit()
+    return jsonify({'message': 'Work Area deleted successfully'}), 204
+
+@bp.route('/api/work-areas/reorder', methods=['PUT'])
+@api_login_required
+def reorder_work_areas():
+    data = request.get_json()
+    if not isinstance(data, list):
+        return jsonify({'message': 'Expected a list of work area order objects'}), 400
+    try:
+        error = apply_full_reorder(WorkArea, WorkArea.work_area_id, 'work_area_id', data)
+        if error:
+            return jsonify({'message': error}), 400
+        db.session.commit()
+        return jsonify({'message': 'Work Area order updated successfully'}), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error reordering work areas: {e}")
+        return jsonify({'message': 'An error occurred during reordering.', 'details': str(e)}), 500
+
+@bp.route('/api/work-areas/<int:id>/move', methods=['PUT'])
+@api_login_required
+def move_work_area(id):
+    return handle_move_request(WorkArea, WorkArea.work_area_id, id, 'Work Area')
+
+@bp.route('/api/positions', methods=['GET'])
+@api_login_required
+@replica_reads
+def get_positions():
+    positions = Position.query.order_by(Position.display_order, Position.position_id).all()
+    return jsonify([p.to_dict() for p in positions])
+
+# Employees API
+@bp.route('/api/employees', methods=['GET'])
+@api_login_required
+@replica_reads
+def get_employees():
+    employees = Employee.query.order_by(Employee.display_order, Employee.employee_id).all()
+    return jsonify([emp.to_dict() for emp in employees])
+
+@bp.route('/api/positions', methods=['POST'])
+@api_login_required
+def create_position():
+    data = request.get_json()
+    if not data or not 'title' in data or not 'default_hours' in data:
+        return jsonify({'message': 'Missing title or default_hours'}), 400
+    try:
+        new_position = Position(
+            title=data['title'],
+            default_hours=float(data['default_hours']),
+            display_order=next_display_order(Position)
+        )
+        db.session.add(new_position)
+        db.session.commit()
+        return jsonify(new_position.to_dict()), 201
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error creating position: {e}")
+        return jsonify({'message': 'Failed to create position.', 'details': str(e)}), 500
+
+@bp.route('/api/positions/<int:id>', methods=['PUT'])
+@api_login_required
+def update_position(id):
+    position = Position.query.get_or_404(id)
+    data = request.get_json()
+    if not data:
+        return jsonify({'message': 'No data provided for update'}), 400
+    if 'title' in data:
+        position.title = data['title']
+    if 'default_hours' in data:
+        position.default_hours = float(data['default_hours'])
+    try:
+        db.session.commit()
+        return jsonify(position.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error updating position: {e}")
+        return jsonify({'message': 'Failed to update position.', 'details': str(e)}), 500
+
+@bp.route('/api/positions/<int:id>', methods=['DELETE'])
+@api_login_required
+def delete_position(id):
+    position = Position.query.get_or_404(id)
+    if Employee.query.filter_by(position_id=id).count() > 0:
+        return jsonify({'message': 'Cannot delete position with associated employees. Reassign employees first.'}), 409
+    try:
+        db.session.delete(position)
+        db.session.commit()
+        return jsonify({'message': 'Position deleted successfully'}), 204
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error deleting position: {e}")
+        return jsonify({'message': 'Failed to delete position.', 'details': str(e)}), 500
+
+@bp.route('/api/positions/reorder', methods=['PUT'])
+@api_login_required
+def reorder_positions():
+    data = request.get_json()
+    if not isinstance(data, list):
+        return jsonify({'message': 'Expected a list of position order objects'}), 400
+    try:
+        error = apply_full_reorder(Position, Position.position_id, 'position_id', data)
+        if error:
+            return jsonify({'message': error}), 400
+        db.session.commit()
+        return jsonify({'message': 'Position order updated successfully'}), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error reordering positions: {e}")
+        return jsonify({'message': 'An error occurred during reordering.', 'details': str(e)}), 500
+
+@bp.route('/api/positions/<int:id>/move', methods=['PUT'])
+@api_login_required
+def move_position(id):
+    return handle_move_request(Position, Position.position_id, id, 'Position')
+
+@bp.route('/api/employees', methods=['POST'])
+@api_login_required
+def create_employee():
+    data = request.get_json()
+    required_fields = ['first_name', 'last_initial', 'position_id', 'primary_work_area_id', 'employment_start_date']
+    if not all(field in data for field in required_fields):
+        return jsonify({'message': 'Missing required data'}), 400
+    try:
+        employment_start_date = date.fromisoformat(data['employment_start_date'])
+        employment_end_date = date.fromisoformat(data['employment_end_date']) if data.get('employment_end_date') else None
+    except ValueError:
+        return jsonify({'message': 'Invalid date format for employment dates. Use THAT-MM-DD.'}), 400
+    if not WorkArea.query.get(data['primary_work_area_id']):
+        return jsonify({'message': 'Primary Work Area not found'}), 400
+    new_employee = Employee(
+        first_name=data['first_name'],
+        last_initial=data['last_initial'],
+        position_id=data['position_id'],
+        primary_work_area_id=data['primary_work_area_id'],
+        employment_start_date=employment_start_date,
+        employment_end_date=employment_end_date,
+        display_order=next_display_order(Employee)
+    )
+    try:
+        db.session.add(new_employee)
+        db.session.commit()
+        return jsonify(new_employee.to_dict()), 201
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error creating employee in DB: {e}")
+        return jsonify({'message': 'Failed to create employee due to a database error.', 'details': str(e)}), 500
+
+@bp.route('/api/employees/<int:id>', methods=['PUT'])
+@api_login_required
+def update_employee(id):
+    employee = Employee.query.get_or_404(id)
+    data = request.get_json()
+    employee.first_name = data.get('first_name', employee.first_name)
+    employee.last_initial = data.get('last_initial', employee.last_initial)
+    employee.position_id = data['position_id']
+    employee.primary_work_area_id = data.get('primary_work_area_id', employee.primary_work_area_id)
+    if 'employment_start_date' in data:
+        try:
+            employee.employment_start_date = date.fromisoformat(data['employment_start_date'])
+        except ValueError:
+            return jsonify({'message': 'Invalid employment_start_date format. Use THAT-MM-DD.'}), 400
+    if 'employment_end_date' in data:
+        try:
+            employee.employment_end_date = date.fromisoformat(data['employment_end_date']) if data['employment_end_date'] else None
+        except ValueError:
+            return jsonify({'message': 'Invalid employment_end_date format. Use THAT-MM-DD or leave empty.'}), 400
+    if not WorkArea.query.get(employee.primary_work_area_id):
+        return jsonify({'message': 'Primary Work Area not found after update'}), 400
+    try:
+        db.session.commit()
+        return jsonify(employee.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error updating employee in DB: {e}")
+        return jsonify({'message': 'Failed to save employee changes due to a database error.', 'details': str(e)}), 500
+
+@bp.route('/api/employees/<int:id>', methods=['DELETE'])
+@api_login_required
+def delete_employee(id):
+    employee = Employee.query.get_or_404(id)
+    if DailyEmployeeHours.query.filter_by(employee_id=id).count() > 0:
+        return jsonify({'message': 'Cannot delete employee with recorded hours. Delete associated daily hours entries first.'}), 409
+    db.session.delete(employee)
+    db.session.commit()
+    return jsonify({'message': 'Employee deleted successfully'}), 204
+
+@bp.route('/api/employees/reorder', methods=['PUT'])
+@api_login_required
+def reorder_employees():
+    data = request.get_json()
+    if not isinstance(data, list):
+        return jsonify({'message': 'Expected a list of employee order objects'}), 400
+    try:
+        error = apply_full_reorder(Employee, Employee.employee_id, 'employee_id', data)
+        if error:
+            return jsonify({'message': error}), 400
+        db.session.commit()
+        return jsonify({'message': 'Employee order updated successfully'}), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error reordering employees: {e}")
+        return jsonify({'message': 'An error occurred during reordering.', 'details': str(e)}), 500
+
+@bp.route('/api/employees/<int:id>/move', methods=['PUT'])
+@api_login_required
+def move_employee(id):
+    return handle_move_request(Employee, Employee.employee_id, id, 'Employee')
+
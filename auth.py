@@ -0,0 +1,89 @@
+# auth.py
+from flask import Blueprint, request, render_template, redirect, url_for, flash, current_app
+from flask_login import login_user, logout_user, current_user
+
+from extensions import db, login_manager, password_verifier, user_cache, login_user_limiter, login_ip_limiter
+from login_guard import VerifierBusy
+from models import User, SessionUser
+
+# cli_group=None keeps commands at the top level, e.g. `flask create-user`
+bp = Blueprint('auth', __name__, cli_group=None)
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    user_id = int(user_id)
+    session_user = user_cache.get(user_id)
+    if session_user is None:
+        user = User.query.get(user_id)
+        if user is None:
+            return None
+        session_user = SessionUser(user)
+        user_cache.set(user_id, session_user)
+    return session_user
+
+@bp.cli.command("create-user")
+def create_user():
+    """Creates a new user."""
+    import getpass
+    username = input("Enter username: ")
+    email = input("Enter email: ")
+    password = getpass.getpass("Enter password: ")
+    confirm_password = getpass.getpass("Confirm password: ")
+
+    if password != confirm_password:
+        print("Passwords do not match.")
+        return
+
+    # Check if user already exists
+    if User.query.filter_by(username=username).first() or User.query.filter_by(email=email).first():
+        print("User with that username or email already exists.")
+        return
+        
+    password_hash = password_verifier.hash(password)
+    new_user = User(username=username, email=email, password_hash=password_hash)
+    
+    db.session.add(new_user)
+    db.session.commit()
+    print(f"User '{username}' created successfully.")
+
+@bp.route("/login", methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('admin.index'))
+    from forms import LoginForm # WTForms is only needed once someone signs in
+    form = LoginForm()
+    if form.validate_on_submit():
+        username = form.username.data.strip().lower()
+        # Shed floods and guessing before they reach the database or bcrypt. Only failed
+        # attempts count against a username, so a shared shop login survives the shift-start rush.
+        retry_after = max(login_ip_limiter.hit(request.remote_addr or 'unknown'), login_user_limiter.retry_after(username))
+        if retry_after:
+            flash(f"Too many login attempts. Try again in {int(retry_after) + 1} seconds.", 'danger')
+            response = current_app.make_response((render_template('login.html', title='Login', form=form), 429))
+            response.headers['Retry-After'] = str(int(retry_after) + 1)
+            return response
+
+        user = User.query.filter_by(username=form.username.data).first()
+        try:
+            valid = bool(user) and password_verifier.check(user.password_hash, form.password.data)
+        except VerifierBusy:
+            flash("The server is busy signing other users in. Please try again in a moment.", 'danger')
+            response = current_app.make_response((render_template('login.html', title='Login', form=form), 503))
+            response.headers['Retry-After'] = '5'
+            return response
+
+        if valid:
+            login_user(user, remember=True)
+            next_page = request.args.get('next')
+            return redirect(next_page) if next_page else redirect(url_for('admin.index'))
+        else:
+            login_user_limiter.hit(username)
+            flash("Login Unsuccessful. Please check username and password", 'danger')
+            print("Login Unsuccessful. Please check username and password")
+    return render_template('login.html', title='Login', form=form)
+
+@bp.route("/logout")
+def logout():
+    logout_user()
+    return redirect(url_for('auth.login'))
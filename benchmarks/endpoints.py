@@ -0,0 +1,207 @@
+# benchmarks/endpoints.py
+"""
+Times the hot endpoints against synthetic data at several scales, in process through
+the Flask test client: the daily hours grid, both batch saves, week creation and the
+four monthly/weekly reports. Each scale is EMPLOYEESxWEEKS and gets a fresh database
+filled by seed.generate().
+
+    python benchmarks/endpoints.py --scales 20x8,100x26,300x52 --output baseline.json
+    python benchmarks/endpoints.py --compare baseline.json
+
+--compare prints the change in median per endpoint and exits non-zero when any
+endpoint got slower than --threshold percent. Without --database-url every scale uses
+a temporary SQLite file; with it (e.g. a scratch PostgreSQL database) ALL TABLES IN
+THAT DATABASE ARE DROPPED before each scale.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SECRET_KEY', 'endpoint-benchmark')
+
+from config import Config, engine_options
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def parse_scales(value):
+    scales = []
+    for item in value.split(','):
+        employees, weeks = item.lower().split('x')
+        scales.append((int(employees), int(weeks)))
+    return scales
+
+
+def make_app(database_uri):
+    from app import create_app
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_uri)
+        METRICS_DIR = None
+        SQL_PROFILING = 'off'
+
+    return create_app(BenchmarkConfig)
+
+
+def timed(client, runs, method, url, payload=None):
+    """Runs one warm-up request, then `runs` timed ones; returns the latencies in ms."""
+    samples = []
+    for attempt in range(runs + 1):
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=payload)
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {url} returned HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        if attempt:
+            samples.append(elapsed)
+    return samples
+
+
+def bench_scale(database_uri, employees, weeks, runs):
+    from extensions import db
+    from models import User, OverallProductionWeek
+    import seed
+
+    app = make_app(database_uri)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', password_hash='!')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        seed_start = time.perf_counter()
+        counts = seed.generate(employees=employees, weeks=weeks)
+        seed_seconds = time.perf_counter() - seed_start
+        latest_week = OverallProductionWeek.query.order_by(OverallProductionWeek.reporting_week_start_date.desc()).first()
+        week_start = latest_week.reporting_week_start_date
+        year = week_start.year
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    grid_url = f"/api/daily-hours-entry?reporting_week_start_date={week_start.isoformat()}"
+    grid = client.get(grid_url).get_json()
+    cells = [
+        (employee, entry) for employee in grid['employees_data'] for entry in employee['daily_entries']
+        if entry['daily_hour_id'] is not None
+    ]
+    actuals = [{
+        'daily_hour_id': entry['daily_hour_id'],
+        'employee_id': employee['employee_id'],
+        'work_date': entry['work_date'],
+        'work_area_id': entry['work_area_id'],
+        'actual_hours': entry['forecasted_hours'],
+        'overall_production_week_id': entry['overall_production_week_id'],
+    } for employee, entry in cells]
+    forecasts = [{'daily_hour_id': entry['daily_hour_id'], 'new_forecasted_hours': entry['forecasted_hours']} for _, entry in cells]
+
+    results = {
+        'GET /api/daily-hours-entry': timed(client, runs, 'GET', grid_url),
+        'POST /api/daily-hours-entry/batch-update': timed(client, runs, 'POST', '/api/daily-hours-entry/batch-update', actuals),
+        'PUT /api/daily-hours/update-forecasts': timed(client, runs, 'PUT', '/api/daily-hours/update-forecasts', forecasts),
+        'GET /api/reports/weekly-overview': timed(client, runs, 'GET', '/api/reports/weekly-overview'),
+        'GET /api/reports/monthly-work-area-hours': timed(client, runs, 'GET', f'/api/reports/monthly-work-area-hours?year={year}'),
+        'GET /api/reports/monthly-employee-hours': timed(client, runs, 'GET', f'/api/reports/monthly-employee-hours?year={year}'),
+        'GET /api/reports/monthly-company-actuals': timed(client, runs, 'GET', '/api/reports/monthly-company-actuals?last_12_months=true'),
+    }
+
+    # Each creation needs a Monday with no week yet; the new weeks are deleted afterwards (untimed)
+    creations = []
+    for attempt in range(runs + 1):
+        monday = week_start + timedelta(weeks=attempt + 1)
+        start = time.perf_counter()
+        response = client.post('/api/overall-production-weeks', json={'reporting_week_start_date': monday.isoformat()})
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != 201:
+            raise RuntimeError(f"Week creation returned HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        client.delete(f"/api/overall-production-weeks/{response.get_json()['overall_production_week_id']}")
+        if attempt:
+            creations.append(elapsed)
+    results['POST /api/overall-production-weeks'] = creations
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+    return {
+        'rows': counts,
+        'grid_cells': len(cells),
+        'seed_seconds': round(seed_seconds, 2),
+        'endpoints': {
+            name: {
+                'median_ms': round(statistics.median(samples), 2),
+                'p95_ms': round(percentile(samples, 95), 2),
+                'min_ms': round(min(samples), 2),
+                'runs': len(samples),
+            } for name, samples in results.items()
+        },
+    }
+
+
+def compare(current, baseline, threshold):
+    regressions = 0
+    for scale, result in current['scales'].items():
+        before = baseline.get('scales', {}).get(scale)
+        if not before:
+            print(f"{scale}: not in baseline")
+            continue
+        print(f"{scale}:")
+        for name, stats in result['endpoints'].items():
+            old = before['endpoints'].get(name)
+            if not old:
+                print(f"  {name:<45} {stats['median_ms']:>9.1f} ms  (new)")
+                continue
+            change = (stats['median_ms'] - old['median_ms']) / old['median_ms'] * 100 if old['median_ms'] else 0
+            flag = '  REGRESSION' if change > threshold else ''
+            regressions += bool(flag)
+            print(f"  {name:<45} {old['median_ms']:>9.1f} -> {stats['median_ms']:>9.1f} ms  {change:+6.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='20x8,100x26,300x52', help='Comma-separated EMPLOYEESxWEEKS (default: %(default)s)')
+    parser.add_argument('--runs', type=int, default=5, help='Timed requests per endpoint, after one warm-up (default: %(default)s)')
+    parser.add_argument('--output', help='Write the results as JSON, e.g. to keep as a baseline')
+    parser.add_argument('--compare', help='Baseline JSON to compare medians against')
+    parser.add_argument('--threshold', type=float, default=20, help='Percent slowdown counted as a regression (default: %(default)s)')
+    parser.add_argument('--database-url', help='Database to use instead of temporary SQLite files; it is wiped')
+    args = parser.parse_args()
+
+    results = {'python': platform.python_version(), 'machine': platform.node(), 'runs': args.runs, 'scales': {}}
+    for employees, weeks in parse_scales(args.scales):
+        database_uri = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        label = f"{employees}x{weeks}"
+        result = bench_scale(database_uri, employees, weeks, args.runs)
+        results['scales'][label] = result
+        print(f"{label}: {result['grid_cells']} grid cells, seeded in {result['seed_seconds']}s")
+        for name, stats in result['endpoints'].items():
+            print(f"  {name:<45} median={stats['median_ms']:>9.1f}ms p95={stats['p95_ms']:>9.1f}ms min={stats['min_ms']:>9.1f}ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
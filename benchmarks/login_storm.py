@@ -0,0 +1,148 @@
+# benchmarks/login_storm.py
+"""
+Simulates the shift-start login storm: N clients POST /login at once while a
+background client keeps polling an ordinary API endpoint. Prints latency
+percentiles for both, so the effect of bcrypt on unrelated traffic is visible.
+
+    python benchmarks/login_storm.py --logins 50 --url http://localhost:5000
+
+Point it at a running server (ideally the multi-threaded production server) with a
+user created via `flask create-user`. Add --no-throttle-check to skip verifying that
+the per-username rate limit kicks in (it uses a made-up username).
+"""
+import argparse
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(label, samples, statuses):
+    if not samples:
+        print(f"{label}: no samples")
+        return
+    print(f"{label}: n={len(samples)} "
+          f"p50={percentile(samples, 50) * 1000:.1f}ms "
+          f"p95={percentile(samples, 95) * 1000:.1f}ms "
+          f"p99={percentile(samples, 99) * 1000:.1f}ms "
+          f"max={max(samples) * 1000:.1f}ms "
+          f"mean={statistics.mean(samples) * 1000:.1f}ms "
+          f"statuses={dict(sorted(statuses.items()))}")
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Session:
+    """Minimal cookie-keeping HTTP client; returns (status, body) and never follows redirects."""
+
+    def __init__(self):
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()), NoRedirect())
+
+    def request(self, url, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        try:
+            with self.opener.open(url, data=body) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.read()
+
+
+def new_session(base_url):
+    session = Session()
+    _, page = session.request(f"{base_url}/login")
+    match = re.search(r'name="csrf_token"[^>]*value="([^"]+)"', page.decode('utf-8', 'replace'))
+    return session, (match.group(1) if match else None)
+
+
+def login(base_url, username, password):
+    session, csrf_token = new_session(base_url)
+    data = {'username': username, 'password': password}
+    if csrf_token:
+        data['csrf_token'] = csrf_token
+    start = time.perf_counter()
+    status, _ = session.request(f"{base_url}/login", data=data)
+    return time.perf_counter() - start, status, session
+
+
+def poll(session, url, stop, samples, statuses):
+    while not stop.is_set():
+        start = time.perf_counter()
+        status, _ = session.request(url)
+        samples.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--logins', type=int, default=50, help='Concurrent logins to fire')
+    parser.add_argument('--pollers', type=int, default=4, help='Clients polling the other endpoint')
+    parser.add_argument('--endpoint', default='/api/employees', help='Endpoint whose latency is measured')
+    parser.add_argument('--no-throttle-check', action='store_true')
+    args = parser.parse_args()
+    base_url = args.url.rstrip('/')
+
+    # Pollers use an already authenticated session, as tablets that logged in earlier would
+    _, status, poll_session = login(base_url, args.username, args.password)
+    if status != 302:
+        raise SystemExit(f"Could not log in as {args.username} (HTTP {status})")
+
+    def run_pollers(duration=None, stop=None):
+        samples, statuses = [], {}
+        stop = stop or threading.Event()
+        threads = [threading.Thread(target=poll, args=(poll_session, base_url + args.endpoint, stop, samples, statuses))
+                   for _ in range(args.pollers)]
+        for thread in threads:
+            thread.start()
+        if duration:
+            time.sleep(duration)
+            stop.set()
+        return threads, samples, statuses, stop
+
+    threads, baseline, baseline_statuses, _ = run_pollers(duration=5)
+    for thread in threads:
+        thread.join()
+    summarize(f"{args.endpoint} (idle)", baseline, baseline_statuses)
+
+    stop = threading.Event()
+    threads, during, during_statuses, _ = run_pollers(stop=stop)
+    login_samples, login_statuses = [], {}
+    with ThreadPoolExecutor(max_workers=args.logins) as pool:
+        for elapsed, status, _ in pool.map(lambda _: login(base_url, args.username, args.password), range(args.logins)):
+            login_samples.append(elapsed)
+            login_statuses[status] = login_statuses.get(status, 0) + 1
+    stop.set()
+    for thread in threads:
+        thread.join()
+    summarize("POST /login (storm)", login_samples, login_statuses)
+    summarize(f"{args.endpoint} (during storm)", during, during_statuses)
+
+    if not args.no_throttle_check:
+        # A made-up username, so the real account is not locked out afterwards
+        bad_statuses = {}
+        for _ in range(30):
+            _, status, _ = login(base_url, args.username + '-throttle-check', 'wrong')
+            bad_statuses[status] = bad_statuses.get(status, 0) + 1
+        print(f"30 bad passwords for one username: statuses={dict(sorted(bad_statuses.items()))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+# benchmarks/monday_rush.py
+"""
+Simulates the Monday-morning rush. Supervisors open the daily hours grid for last
+week and save actuals for overlapping sets of employees on that same week. Managers
+open reports. Everyone polls /get_notifications. Each virtual user runs its loop with
+a random think time until --duration runs out. For each endpoint it prints throughput,
+p50/p95/p99 latency, the error rate, and how many failures were deadlocks,
+serialization failures or lock timeouts.
+
+    python benchmarks/monday_rush.py --supervisors 8 --managers 3 --duration 60
+    python benchmarks/monday_rush.py --database-url postgresql://localhost/rush_scratch
+    python benchmarks/monday_rush.py --url http://localhost:8000 --password secret \\
+        --supervisor-users sup1,sup2,sup3 --manager-users boss
+
+Without --url the app is started in this process on a threaded server. That server
+uses a temporary SQLite file, or --database-url (ALL TABLES IN THAT DATABASE ARE
+DROPPED). It is seeded with seed.generate(), and one user is created per virtual user.
+With --url the named users must already exist; run `flask seed-synthetic` on that
+server's database first.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date, timedelta
+from http.cookiejar import CookieJar
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPORTS = [
+    '/api/reports/weekly-overview',
+    '/api/reports/monthly-work-area-hours?last_12_months=true',
+    '/api/reports/monthly-employee-hours?last_12_months=true',
+    '/api/reports/monthly-company-actuals?last_12_months=true',
+]
+# Error text from PostgreSQL, MySQL and SQLite that means a save lost a race, not a bug
+LOCK_FAILURES = {
+    'deadlock': re.compile(r'deadlock', re.I),
+    'serialization': re.compile(r'could not serialize|serialization failure', re.I),
+    'lock_timeout': re.compile(r'database is locked|lock wait timeout|lock timeout|could not obtain lock', re.I),
+}
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Session:
+    """Minimal cookie-keeping HTTP client; returns (status, body) and never follows redirects."""
+
+    def __init__(self, base_url, timeout=60):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()), NoRedirect())
+
+    def request(self, method, path, form=None, payload=None):
+        headers = {}
+        body = None
+        if form is not None:
+            body = urllib.parse.urlencode(form).encode()
+        elif payload is not None:
+            body = json.dumps(payload).encode()
+            headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.base_url + path, data=body, method=method, headers=headers)
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.read()
+
+    def login(self, username, password):
+        _, page = self.request('GET', '/login')
+        match = re.search(r'name="csrf_token"[^>]*value="([^"]+)"', page.decode('utf-8', 'replace'))
+        form = {'username': username, 'password': password}
+        if match:
+            form['csrf_token'] = match.group(1)
+        status, _ = self.request('POST', '/login', form=form)
+        if status != 302:
+            raise SystemExit(f"Could not log in as {username} (HTTP {status})")
+
+
+class Recorder:
+    """Latencies and outcomes per endpoint label, shared by every virtual user."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    def call(self, session, label, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            status, body = session.request(method, path, **kwargs)
+        except (urllib.error.URLError, OSError) as e: # Refused, reset or timed out
+            status, body = 0, str(e).encode()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats = self.endpoints.setdefault(label, {'samples': [], 'statuses': {}, 'errors': 0,
+                                                      **{kind: 0 for kind in LOCK_FAILURES}})
+            stats['samples'].append(elapsed)
+            stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+            if status == 0 or status >= 500:
+                stats['errors'] += 1
+                text = body.decode('utf-8', 'replace')
+                for kind, pattern in LOCK_FAILURES.items():
+                    if pattern.search(text):
+                        stats[kind] += 1
+                        break
+        return status, body
+
+    def summary(self, duration):
+        rows = {}
+        for label, stats in sorted(self.endpoints.items()):
+            samples = stats['samples']
+            rows[label] = {
+                'requests': len(samples),
+                'throughput_rps': round(len(samples) / duration, 2),
+                'p50_ms': round(percentile(samples, 50) * 1000, 1),
+                'p95_ms': round(percentile(samples, 95) * 1000, 1),
+                'p99_ms': round(percentile(samples, 99) * 1000, 1),
+                'error_rate': round(stats['errors'] / len(samples), 4),
+                'statuses': {str(k): v for k, v in sorted(stats['statuses'].items())},
+                **{kind: stats[kind] for kind in LOCK_FAILURES},
+            }
+        return rows
+
+
+def supervisor(session, recorder, week_start, stop, rng, think):
+    grid_path = f"/api/daily-hours-entry?reporting_week_start_date={week_start.isoformat()}"
+    while not stop.is_set():
+        status, body = recorder.call(session, 'GET grid', 'GET', grid_path)
+        if status == 200:
+            employees = json.loads(body)['employees_data']
+            # Neighbouring supervisors cover overlapping halves of the crew, so saves collide on rows and on the week
+            crew = rng.sample(employees, max(1, len(employees) // 2)) if employees else []
+            payload = [{
+                'daily_hour_id': entry['daily_hour_id'],
+                'employee_id': employee['employee_id'],
+                'work_date': entry['work_date'],
+                'work_area_id': entry['work_area_id'],
+                'actual_hours': str(max(0.0, float(entry['forecasted_hours']) + rng.choice([0, 0, -0.5, 0.5]))),
+                'overall_production_week_id': entry['overall_production_week_id'],
+            } for employee in crew for entry in employee['daily_entries'] if entry['daily_hour_id'] is not None]
+            if payload:
+                time.sleep(rng.uniform(0, think)) # Typing
+                recorder.call(session, 'POST batch-update', 'POST', '/api/daily-hours-entry/batch-update', payload=payload)
+        recorder.call(session, 'GET notifications', 'GET', '/get_notifications')
+        stop.wait(rng.uniform(0, think))
+
+
+def manager(session, recorder, stop, rng, think):
+    while not stop.is_set():
+        path = rng.choice(REPORTS)
+        recorder.call(session, 'GET ' + path.split('?')[0].rsplit('/', 1)[-1], 'GET', path)
+        recorder.call(session, 'GET notifications', 'GET', '/get_notifications')
+        stop.wait(rng.uniform(0, think))
+
+
+@contextlib.contextmanager
+def local_server(args, usernames, password):
+    """Seeds a scratch database and serves the app from a background thread."""
+    os.environ.setdefault('SECRET_KEY', 'monday-rush')
+    os.environ.setdefault('LOGIN_RATE_LIMIT_PER_IP', '100000') # Every virtual user signs in from 127.0.0.1
+    from werkzeug.serving import make_server
+
+    from config import Config, engine_options
+    from app import create_app
+    from extensions import db, password_verifier
+    from models import User, OverallProductionWeek
+    import seed
+
+    database_uri = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'rush.db')
+
+    class RushConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_uri)
+        METRICS_DIR = None
+
+    app = create_app(RushConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        password_hash = password_verifier.hash(password)
+        db.session.add_all(User(username=name, email=f"{name}@example.com", password_hash=password_hash) for name in usernames)
+        db.session.commit()
+        counts = seed.generate(employees=args.employees, weeks=args.weeks)
+        latest = OverallProductionWeek.query.order_by(OverallProductionWeek.reporting_week_start_date.desc()).first()
+        week_start = latest.reporting_week_start_date - timedelta(weeks=1)
+    print(f"Seeded {database_uri.split('@')[-1]}: {counts}")
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING) # No access log lines in the report
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}", week_start
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Running server to load; default: start one in process')
+    parser.add_argument('--database-url', help='Database for the in-process server; it is wiped')
+    parser.add_argument('--supervisors', type=int, default=8, help='Virtual users loading and saving the grid')
+    parser.add_argument('--managers', type=int, default=3, help='Virtual users opening reports')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of load')
+    parser.add_argument('--think', type=float, default=1.0, help='Maximum think time between actions, in seconds')
+    parser.add_argument('--employees', type=int, default=60, help='Employees to seed (in-process server only)')
+    parser.add_argument('--weeks', type=int, default=8, help='Weeks to seed (in-process server only)')
+    parser.add_argument('--week', type=date.fromisoformat, help='Monday of the week being saved (default: last week)')
+    parser.add_argument('--supervisor-users', help='Comma-separated usernames for --url; reused round-robin')
+    parser.add_argument('--manager-users', help='Comma-separated usernames for --url; reused round-robin')
+    parser.add_argument('--password', default='monday-rush', help='Password of every virtual user')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='Also write the per-endpoint results to this file')
+    args = parser.parse_args()
+
+    if args.url:
+        if not args.supervisor_users or not args.manager_users:
+            parser.error('--url needs --supervisor-users and --manager-users')
+        supervisor_names = args.supervisor_users.split(',')
+        manager_names = args.manager_users.split(',')
+        today = date.today()
+        server = contextlib.nullcontext((args.url.rstrip('/'), args.week or today - timedelta(days=today.weekday() + 7)))
+    else:
+        supervisor_names = [f"rush-sup-{i}" for i in range(args.supervisors)]
+        manager_names = [f"rush-mgr-{i}" for i in range(args.managers)]
+        server = local_server(args, supervisor_names + manager_names, args.password)
+
+    with server as (base_url, week_start):
+        week_start = args.week or week_start
+        rng = random.Random(args.seed)
+        recorder = Recorder()
+        stop = threading.Event()
+        users = [('supervisor', supervisor_names[i % len(supervisor_names)]) for i in range(args.supervisors)]
+        users += [('manager', manager_names[i % len(manager_names)]) for i in range(args.managers)]
+        threads = []
+        for role, username in users:
+            session = Session(base_url)
+            session.login(username, args.password)
+            user_rng = random.Random(rng.random())
+            if role == 'supervisor':
+                target, task_args = supervisor, (session, recorder, week_start, stop, user_rng, args.think)
+            else:
+                target, task_args = manager, (session, recorder, stop, user_rng, args.think)
+            threads.append(threading.Thread(target=target, args=task_args, daemon=True))
+
+        print(f"{args.supervisors} supervisors saving the week of {week_start}, {args.managers} managers, {args.duration:.0f}s against {base_url}")
+        # The app prints debug lines on every save; keep them out of the report when it runs in process
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull if not args.url else sys.stdout):
+            for thread in threads:
+                thread.start()
+            time.sleep(args.duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+
+    results = recorder.summary(elapsed)
+    print(f"{'endpoint':<32} {'reqs':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'deadlk':>6} {'serial':>6} {'locked':>6}")
+    for label, row in results.items():
+        print(f"{label:<32} {row['requests']:>6} {row['throughput_rps']:>7.1f} {row['p50_ms']:>6.0f}ms {row['p95_ms']:>6.0f}ms "
+              f"{row['p99_ms']:>6.0f}ms {row['error_rate']:>7.1%} {row['deadlock']:>6} {row['serialization']:>6} {row['lock_timeout']:>6}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'duration_seconds': round(elapsed, 1), 'supervisors': args.supervisors, 'managers': args.managers,
+                       'week': week_start.isoformat(), 'endpoints': results}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
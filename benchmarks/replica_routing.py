@@ -0,0 +1,132 @@
+# benchmarks/replica_routing.py
+"""
+Checks read-replica routing end to end against two databases: reports and GET list
+endpoints are answered by the replica, the hours grid and saves by the primary, and a
+client that just saved reads from the primary until DATABASE_REPLICA_STICKY_SECONDS
+pass. Which database answered is read from the X-DB-Route response header.
+
+    python benchmarks/replica_routing.py
+    python benchmarks/replica_routing.py --primary-url postgresql://localhost:5432/app \\
+        --replica-url postgresql://localhost:5433/app
+
+Without URLs the primary is a temporary SQLite file filled by seed.generate() and the
+replica a copy taken right after, so writes made later are visibly missing from it, as
+on a lagging replica. With URLs the databases are used as they are (the replica
+following the primary, e.g. a streaming standby); the check adds one holiday in 2099
+and deletes it again.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SECRET_KEY', 'replica-routing-check')
+
+from config import Config, engine_options
+
+CHECK_HOLIDAY = '2099-12-24'
+
+
+def make_app(primary_url, replica_url, sticky_seconds):
+    from app import create_app
+
+    class ReplicaCheckConfig(Config):
+        SQLALCHEMY_DATABASE_URI = primary_url
+        SQLALCHEMY_ENGINE_OPTIONS = engine_options(primary_url)
+        SQLALCHEMY_BINDS = {'replica': dict(engine_options(replica_url), url=replica_url)}
+        DATABASE_REPLICA_STICKY_SECONDS = sticky_seconds
+        METRICS_DIR = None
+        SQL_PROFILING = 'off'
+
+    return create_app(ReplicaCheckConfig)
+
+
+def sqlite_pair():
+    """A seeded temporary SQLite primary and a snapshot copy of it as the replica."""
+    from extensions import db
+    from models import User
+    import seed
+
+    directory = tempfile.mkdtemp()
+    primary_path, replica_path = os.path.join(directory, 'primary.db'), os.path.join(directory, 'replica.db')
+    app = make_app('sqlite:///' + primary_path, 'sqlite:///' + replica_path, 1)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        db.session.add(User(username='replica-check', email='replica-check@example.com', password_hash='!'))
+        db.session.commit()
+        seed.generate(employees=10, weeks=4, jobs=20)
+        db.session.remove()
+        db.engine.dispose()
+    shutil.copyfile(primary_path, replica_path)
+    return 'sqlite:///' + primary_path, 'sqlite:///' + replica_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--primary-url', help='Primary database (default: temporary SQLite file)')
+    parser.add_argument('--replica-url', help='Replica of the primary (default: a copy of the SQLite primary)')
+    parser.add_argument('--sticky-seconds', type=int, default=1, help='Read-your-writes window to test with (default: %(default)s)')
+    args = parser.parse_args()
+    if bool(args.primary_url) != bool(args.replica_url):
+        parser.error('--primary-url and --replica-url go together')
+
+    snapshot = not args.primary_url
+    primary_url, replica_url = sqlite_pair() if snapshot else (args.primary_url, args.replica_url)
+
+    from extensions import db
+    from models import User
+
+    app = make_app(primary_url, replica_url, args.sticky_seconds)
+    with app.app_context():
+        user = User.query.order_by(User.id).first()
+        if user is None:
+            sys.exit('The primary has no users; create one with `flask create-user`.')
+        user_id = user.id
+        db.session.remove()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    failures = 0
+
+    def check(label, response, expected_route, condition=True):
+        nonlocal failures
+        route = response.headers.get('X-DB-Route', 'primary')
+        ok = response.status_code < 400 and route == expected_route and condition
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {label:<55} HTTP {response.status_code}, answered by {route}")
+        return response
+
+    def has_check_holiday(response):
+        return any(h['holiday_date'] == CHECK_HOLIDAY for h in response.get_json())
+
+    check('GET /api/reports/weekly-overview', client.get('/api/reports/weekly-overview'), 'replica')
+    check('GET /api/employees', client.get('/api/employees'), 'replica')
+    monday = date.today() - timedelta(days=date.today().weekday())
+    check('GET /api/daily-hours-entry stays on the primary', client.get(f'/api/daily-hours-entry?reporting_week_start_date={monday.isoformat()}'), 'primary')
+
+    created = check('POST /api/holidays', client.post('/api/holidays', json={'holiday_date': CHECK_HOLIDAY, 'description': 'Replica routing check'}), 'primary')
+    response = client.get('/api/holidays')
+    check('GET /api/holidays right after saving: primary, sees it', response, 'primary', has_check_holiday(response))
+
+    time.sleep(args.sticky_seconds + 0.5)
+    response = client.get('/api/holidays')
+    if snapshot:
+        check('GET /api/holidays after the window: replica snapshot', response, 'replica', not has_check_holiday(response))
+    else:
+        check('GET /api/holidays after the window: replica', response, 'replica')
+        print(f"      the replica {'has' if has_check_holiday(response) else 'has not yet'} replicated the new holiday")
+
+    if created.status_code == 201:
+        client.delete(f"/api/holidays/{created.get_json()['id']}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/startup_time.py
+"""
+Measures cold-start cost in fresh interpreters: importing app.py, building the app
+with create_app(), and serving the first request (GET /login). Each run is a new
+process so nothing is already imported.
+
+    python benchmarks/startup_time.py --runs 10
+    python benchmarks/startup_time.py --json > startup.json
+
+DATABASE_URL and SECRET_KEY default to an in-memory SQLite database and a dummy key;
+the measured request does not touch the database.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+status = flask_app.test_client().get('/login').status_code
+served = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (served - created) * 1000,
+    'total_ms': (served - start) * 1000,
+    'status': status,
+    'modules_loaded': len(sys.modules),
+}))
+'''
+
+
+def run_probe(env):
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=PROJECT_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='Print a JSON summary for diffing between builds')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    env.setdefault('SECRET_KEY', 'startup-benchmark')
+
+    samples = [run_probe(env) for _ in range(args.runs)]
+    summary = {
+        metric: {
+            'median': round(statistics.median(s[metric] for s in samples), 1),
+            'min': round(min(s[metric] for s in samples), 1),
+            'max': round(max(s[metric] for s in samples), 1),
+        }
+        for metric in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms')
+    }
+    summary['modules_loaded'] = samples[-1]['modules_loaded']
+    summary['runs'] = args.runs
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    for metric in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms'):
+        stats = summary[metric]
+        print(f"{metric:18} median={stats['median']:8.1f}  min={stats['min']:8.1f}  max={stats['max']:8.1f}")
+    print(f"{'modules_loaded':18} {summary['modules_loaded']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/week_delete_memory.py
+"""
+Compares peak Python memory (tracemalloc) of deleting production weeks of growing
+size two ways: the old approach of loading a week's daily hours into the session and
+deleting them one by one, and hours.delete_production_weeks(), which deletes them with
+one DELETE per week without loading them. The first should grow with the week; the
+second should stay flat.
+
+    python benchmarks/week_delete_memory.py --employees 100,500,2000 --weeks 2
+
+Every size gets a fresh temporary SQLite database filled by seed.generate(). With
+--database-url (e.g. a scratch PostgreSQL database) ALL TABLES IN THAT DATABASE ARE
+DROPPED before each size.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SECRET_KEY', 'week-delete-benchmark')
+
+from config import Config, engine_options
+
+
+def make_app(database_uri):
+    from app import create_app
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_uri)
+        METRICS_DIR = None
+        SQL_PROFILING = 'off'
+
+    return create_app(BenchmarkConfig)
+
+
+def delete_loading_rows(week_ids):
+    """The pre-cascade delete: every hours row is loaded, then deleted through the session."""
+    from extensions import db
+    from models import OverallProductionWeek
+
+    for week_id in week_ids:
+        week = db.session.get(OverallProductionWeek, week_id)
+        for hours in list(week.daily_hours):
+            db.session.delete(hours)
+        db.session.delete(week)
+        db.session.commit()
+
+
+def measure(database_uri, employees, weeks, approach):
+    """Seeds a fresh database, deletes every week with `approach`; returns (hours rows, peak MiB, seconds)."""
+    from extensions import db
+    from models import OverallProductionWeek, DailyEmployeeHours
+    from hours import delete_production_weeks
+    import seed
+
+    app = make_app(database_uri)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed.generate(employees=employees, weeks=weeks, jobs=0)
+        week_ids = [week_id for (week_id,) in db.session.query(OverallProductionWeek.overall_production_week_id)]
+        rows = db.session.query(DailyEmployeeHours).count()
+        db.session.remove()
+
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        if approach == 'load':
+            delete_loading_rows(week_ids)
+        else:
+            delete_production_weeks(week_ids)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if db.session.query(DailyEmployeeHours).count():
+            raise RuntimeError(f"{approach}: hours rows left after deleting every week")
+        db.session.remove()
+        db.engine.dispose()
+    return rows, peak / (1024 * 1024), seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', default='100,500,2000', help='Comma-separated employee counts, one run each (default: %(default)s)')
+    parser.add_argument('--weeks', type=int, default=2, help='Weeks seeded and deleted per run (default: %(default)s)')
+    parser.add_argument('--database-url', help='Database to use instead of temporary SQLite files; it is wiped')
+    args = parser.parse_args()
+
+    print(f"{'employees':>9} {'hours rows':>10} {'load+delete MiB':>16} {'bulk MiB':>12} {'load+delete s':>14} {'bulk s':>10}")
+    for employees in (int(value) for value in args.employees.split(',')):
+        results = {}
+        for approach in ('load', 'bulk'):
+            database_uri = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+            results[approach] = measure(database_uri, employees, args.weeks, approach)
+        rows = results['load'][0]
+        print(f"{employees:>9} {rows:>10} {results['load'][1]:>16.1f} {results['bulk'][1]:>12.1f} "
+              f"{results['load'][2]:>14.2f} {results['bulk'][2]:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# compression.py
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+
+class Compress:
+    """
+    Compresses responses negotiated on Accept-Encoding (brotli when installed, then gzip).
+    Small bodies are left alone. Responses carrying an ETag have their compressed variants
+    cached, so a repeated hit on an unchanged payload skips recompression.
+    """
+
+    def __init__(self, app=None):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BR_LEVEL', 4)
+        app.config.setdefault('COMPRESS_CACHE_SIZE', 128)
+        app.config.setdefault('COMPRESS_ADD_ETAG', True)
+        app.config.setdefault('COMPRESS_MIMETYPES', ['application/json', 'text/html', 'text/css', 'application/javascript'])
+        self.app = app
+        app.after_request(self.after_request)
+        app.extensions['compress'] = self
+
+    def available_encodings(self):
+        return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    def after_request(self, response):
+        config = self.app.config
+        if not config['COMPRESS_ENABLED']:
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        if (response.direct_passthrough or
+                response.status_code != 200 or
+                'Content-Encoding' in response.headers or
+                response.mimetype not in config['COMPRESS_MIMETYPES']):
+            return response
+
+        encoding = request.accept_encodings.best_match(self.available_encodings())
+        if not encoding:
+            return response
+
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+
+        # Tag large GET payloads so clients can revalidate and the compressed variant can be cached
+        if config['COMPRESS_ADD_ETAG'] and request.method == 'GET' and 'ETag' not in response.headers:
+            response.add_etag()
+
+        etag, weak = response.get_etag()
+        compressed = self._get_cached(etag, encoding) if etag else None
+        if compressed is None:
+            compressed = self.compress(data, encoding)
+            if etag:
+                self._set_cached(etag, encoding, compressed)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            # Each encoding is a distinct representation and needs a distinct validator
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+            response.make_conditional(request)
+        return response
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.app.config['COMPRESS_BR_LEVEL'])
+        return gzip.compress(data, compresslevel=self.app.config['COMPRESS_GZIP_LEVEL'])
+
+    def _get_cached(self, etag, encoding):
+        with self._lock:
+            compressed = self._cache.get((etag, encoding))
+            if compressed is not None:
+                self._cache.move_to_end((etag, encoding))
+            return compressed
+
+    def _set_cached(self, etag, encoding, compressed):
+        with self._lock:
+            self._cache[(etag, encoding)] = compressed
+            self._cache.move_to_end((etag, encoding))
+            while len(self._cache) > self.app.config['COMPRESS_CACHE_SIZE']:
+                self._cache.popitem(last=False)
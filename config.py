@@ -7,9 +7,93 @@ basedir = os.path.abspath(os.path.dirname(__file__))
 # Load the .env file from the project root
 load_dotenv(os.path.join(basedir, '.env'))
 
+def engine_options(database_uri):
+    """Connection pool settings; in-memory SQLite keeps the single shared connection SQLAlchemy gives it."""
+    options = {
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true', # Replace connections dropped by a database restart
+    }
+    if database_uri and database_uri.startswith('sqlite') and (database_uri == 'sqlite://' or ':memory:' in database_uri):
+        return options
+    options.update({
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)), # Per worker process; keep workers x (size + overflow) under max_connections
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)), # Seconds to wait for a connection before failing the request
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)), # Seconds; stays under server/proxy idle timeouts
+    })
+    return options
+
 class Config:
     # Use environment variable for production, default to local PostgreSQL
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Optional read replica (see db_routing.py): reports and GET list endpoints read from it.
+    # Binds do not inherit SQLALCHEMY_ENGINE_OPTIONS, so the pool settings are repeated here.
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': dict(engine_options(DATABASE_REPLICA_URL), url=DATABASE_REPLICA_URL)} if DATABASE_REPLICA_URL else {}
+    DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DATABASE_REPLICA_STICKY_SECONDS', 10)) # After saving, a client reads from the primary this long
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False # Suppresses a warning, good practice
-    SECRET_KEY = os.environ.get('SECRET_KEY')
\ No newline at end of file
+    SECRET_KEY = os.environ.get('SECRET_KEY')
+
+    # Outgoing mail for emailed reports
+    SMTP_SERVER = os.environ.get('SMTP_SERVER')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT') or 465) # Sent over SSL
+    SMTP_USERNAME = os.environ.get('SMTP_USERNAME')
+    SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+    SENDER_EMAIL = os.environ.get('SENDER_EMAIL')
+    SENDER_NAME = os.environ.get('SENDER_NAME')
+
+    # Response compression (see compression.py)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024)) # Bytes; smaller bodies are sent as-is
+    COMPRESS_CACHE_SIZE = int(os.environ.get('COMPRESS_CACHE_SIZE', 128)) # Compressed variants kept per process
+
+    # Per-process cache of logged-in users for Flask-Login's user_loader
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 512))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60)) # Seconds
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 30)) # Seconds the landing page totals are reused
+
+    # Login storm protection (see login_guard.py)
+    LOGIN_HASH_WORKERS = int(os.environ.get('LOGIN_HASH_WORKERS', 2)) # Threads dedicated to bcrypt checks
+    LOGIN_HASH_MAX_PENDING = int(os.environ.get('LOGIN_HASH_MAX_PENDING', 32)) # Checks queued or running before logins are shed
+    LOGIN_HASH_TIMEOUT = float(os.environ.get('LOGIN_HASH_TIMEOUT', 10)) # Seconds a login waits for its check
+    LOGIN_RATE_WINDOW = int(os.environ.get('LOGIN_RATE_WINDOW', 60)) # Seconds
+    LOGIN_RATE_LIMIT_PER_USER = int(os.environ.get('LOGIN_RATE_LIMIT_PER_USER', 10)) # Failed attempts per username per window
+    LOGIN_RATE_LIMIT_PER_IP = int(os.environ.get('LOGIN_RATE_LIMIT_PER_IP', 200)) # Shop tablets may share one address
+
+    # Request profiling (see sql_profiler.py): 'off', 'header' (requests sending X-Profile-SQL: 1) or 'all'
+    SQL_PROFILING = os.environ.get('SQL_PROFILING', 'off').lower()
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 500)) # Profiled requests slower than this are logged
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', 5)) # Repeats of one SELECT flagged as N+1
+    SLOW_REQUEST_LOG = os.environ.get('SLOW_REQUEST_LOG') # File path; defaults to the app log
+
+    # Request capture for `flask replay` (see traffic_capture.py); off unless a file is given, e.g. /var/log/app/capture-{pid}.jsonl
+    TRAFFIC_CAPTURE_FILE = os.environ.get('TRAFFIC_CAPTURE_FILE')
+    TRAFFIC_CAPTURE_MAX_BYTES = int(os.environ.get('TRAFFIC_CAPTURE_MAX_BYTES', 50 * 1024 * 1024)) # Rotate after this many bytes
+    TRAFFIC_CAPTURE_BACKUPS = int(os.environ.get('TRAFFIC_CAPTURE_BACKUPS', 5)) # Rotated files kept
+
+    # Background report jobs (see report_jobs.py); every worker process has its own pool
+    REPORT_JOB_WORKERS = int(os.environ.get('REPORT_JOB_WORKERS', 2)) # Threads running reports, apart from the request threads
+    REPORT_JOB_MAX_PENDING = int(os.environ.get('REPORT_JOB_MAX_PENDING', 16)) # Jobs queued or running before submissions are refused
+    REPORT_JOB_STALE_SECONDS = int(os.environ.get('REPORT_JOB_STALE_SECONDS', 900)) # An unfinished job this old is presumed lost and rerun
+    REPORT_JOB_STREAM_SECONDS = int(os.environ.get('REPORT_JOB_STREAM_SECONDS', 30)) # Status streams end after this; EventSource reconnects
+    REPORT_JOB_MAX_STREAMS = int(os.environ.get('REPORT_JOB_MAX_STREAMS', 2)) # Status streams open at once per process; each holds a request thread, so keep below WEB_THREADS
+    REPORT_RESULT_RETENTION_HOURS = int(os.environ.get('REPORT_RESULT_RETENTION_HOURS', 24)) # Finished jobs and their results are kept this long
+
+    # Metrics at /metrics (see metrics.py). Under `flask serve` METRICS_DIR lets every worker's numbers be aggregated.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 1)) # How stale other workers' numbers may be
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') # When set, scrapes must send Authorization: Bearer <token>
+
+    # Production server (`flask serve`, see serve.py). Each worker is a process with WEB_THREADS request threads.
+    WEB_BIND = os.environ.get('WEB_BIND', '0.0.0.0:8000')
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 4)) # Also bounds REPORT_JOB_MAX_STREAMS: one thread always stays free for other requests
+    WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', 60)) # Seconds before a stuck worker is restarted
+    WEB_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30)) # Seconds in-flight saves get to finish on shutdown
+    WEB_KEEPALIVE = int(os.environ.get('WEB_KEEPALIVE', 5))
+    WEB_MAX_REQUESTS = int(os.environ.get('WEB_MAX_REQUESTS', 1000)) # Recycle workers to bound memory growth
+    WEB_MAX_REQUESTS_JITTER = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 100))
+    WEB_ACCESS_LOG = os.environ.get('WEB_ACCESS_LOG', 'true').lower() == 'true'
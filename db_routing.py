@@ -0,0 +1,84 @@
+# db_routing.py
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = 'replica' # SQLALCHEMY_BINDS key of the read replica
+_PRIMARY_UNTIL = '_primary_reads_until' # Flask session key: this client saved recently
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the read replica when the current request has
+    opted in through route_reads_to_replica(). Flushes, INSERT/UPDATE/DELETE, SELECT ...
+    FOR UPDATE, raw text() statements, work outside a request and every request that did
+    not opt in use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context() and g.get('_db_route') == 'replica'
+                and isinstance(clause, Select) and clause._for_update_arg is None):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_route():
+    """
+    Where this client's reads may go: 'replica', or 'primary' for a client that saved
+    within DATABASE_REPLICA_STICKY_SECONDS so it sees its own writes despite replication
+    lag. None when no replica is configured.
+    """
+    if REPLICA_BIND not in current_app.config['SQLALCHEMY_BINDS']:
+        return None
+    return 'primary' if session.get(_PRIMARY_UNTIL, 0) > time.time() else 'replica'
+
+def route_reads_to_replica():
+    """
+    Sends this GET request's reads where replica_route() says. Use through
+    replica_reads, or register it as a blueprint's before_request hook.
+    """
+    if request.method == 'GET':
+        g._db_route = replica_route()
+
+def replica_reads(view):
+    """Decorator form of route_reads_to_replica() for a single view."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        route_reads_to_replica()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Read-your-writes bookkeeping for the read replica (DATABASE_REPLICA_URL). A
+    successful POST, PUT, PATCH or DELETE stamps the client's session so its reads stay
+    on the primary for DATABASE_REPLICA_STICKY_SECONDS. Requests that chose a database
+    say which one in an X-DB-Route response header. Nothing is installed without a replica.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('DATABASE_REPLICA_STICKY_SECONDS', 10)
+        self.app = app
+        app.extensions['replica_router'] = self
+        if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+            return
+
+        app.after_request(self._finish_request)
+
+    def _finish_request(self, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            session[_PRIMARY_UNTIL] = time.time() + self.app.config['DATABASE_REPLICA_STICKY_SECONDS']
+        route = g.get('_db_route')
+        if route:
+            response.headers['X-DB-Route'] = route
+        return response
@@ -0,0 +1,31 @@
+# extensions.py
+# Extension objects shared by the models and blueprints; bound to the app in create_app()
+from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from flask_login import LoginManager
+
+from compression import Compress
+from db_routing import RoutingSession, ReplicaRouter
+from login_guard import PasswordVerifier, RateLimiter
+from metrics import Metrics
+from sql_profiler import SQLProfiler
+from traffic_capture import TrafficCapture
+from ttl_cache import TTLCache
+
+db = SQLAlchemy(session_options={'class_': RoutingSession}) # GET reads can go to the read replica
+migrate = Migrate()
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login' # The route to redirect to if a user isn't logged in
+login_manager.login_message_category = 'info' # For flash messages
+compress = Compress() # gzip/brotli for large JSON payloads
+password_verifier = PasswordVerifier() # bcrypt on a bounded pool of its own
+sql_profiler = SQLProfiler() # Opt-in per-request query counts and N+1 detection
+metrics = Metrics() # Prometheus text format at /metrics
+traffic_capture = TrafficCapture() # Opt-in request recording for `flask replay`
+replica_router = ReplicaRouter() # Read-your-writes stickiness for the read replica
+
+# Per-process caches and limiters; sizes and windows are applied from Config in create_app()
+user_cache = TTLCache()
+dashboard_cache = TTLCache(maxsize=4)
+login_user_limiter = RateLimiter()
+login_ip_limiter = RateLimiter()
@@ -0,0 +1,84 @@
+# health.py
+import threading
+import time
+
+from flask import Blueprint, request, jsonify
+from sqlalchemy import text
+
+from extensions import db
+
+bp = Blueprint('health', __name__)
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class ServerState:
+    """
+    Tracks whether this process is shutting down and how many write requests it is
+    still serving, so a stopping worker can report not-ready and let saves finish.
+    """
+
+    def __init__(self):
+        self.draining = False
+        self.in_flight_writes = 0
+        self.started_at = time.time()
+        self._idle = threading.Condition()
+
+    def start_draining(self):
+        with self._idle:
+            self.draining = True
+
+    def write_started(self):
+        with self._idle:
+            self.in_flight_writes += 1
+
+    def write_finished(self):
+        with self._idle:
+            self.in_flight_writes -= 1
+            if self.in_flight_writes <= 0:
+                self._idle.notify_all()
+
+    def wait_for_writes(self, timeout):
+        """Blocks until no writes are in flight or timeout passes; returns how many are left."""
+        with self._idle:
+            self._idle.wait_for(lambda: self.in_flight_writes <= 0, timeout=timeout)
+            return self.in_flight_writes
+
+
+server_state = ServerState()
+
+
+@bp.before_app_request
+def track_write_started():
+    if request.method not in WRITE_METHODS:
+        return
+    if server_state.draining:
+        # The server has stopped accepting connections; a kept-alive client should retry elsewhere
+        response = jsonify({'message': 'Server is shutting down. Please retry.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    server_state.write_started()
+    request.environ['health.write_tracked'] = True
+
+@bp.teardown_app_request
+def track_write_finished(exc):
+    if request.environ.pop('health.write_tracked', False):
+        server_state.write_finished()
+
+@bp.route('/health/live', methods=['GET'])
+def liveness():
+    """The process is up and serving requests."""
+    return jsonify({'status': 'ok', 'uptime_seconds': round(time.time() - server_state.started_at)})
+
+@bp.route('/health/ready', methods=['GET'])
+def readiness():
+    """The process can take traffic: it is not shutting down and the database answers."""
+    if server_state.draining:
+        return jsonify({'status': 'draining', 'in_flight_writes': server_state.in_flight_writes}), 503
+    try:
+        db.session.execute(text('SELECT 1'))
+    except Exception as e:
+        print(f"Readiness check failed: {e}")
+        return jsonify({'status': 'unavailable', 'details': str(e)}), 503
+    return jsonify({'status': 'ok'})
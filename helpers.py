@@ -0,0 +1,201 @@
+# helpers.py
+from datetime import date, timedelta
+from functools import wraps
+
+from flask import current_app, request, jsonify
+from flask_login import current_user
+from sqlalchemy import func, case, values, column, update
+
+from extensions import db
+
+
+# --- Helper Functions ---
+def get_sunday_of_week(any_date):
+    days_to_subtract = (any_date.weekday() + 1) % 7
+    return any_date - timedelta(days=days_to_subtract)
+
+def get_monday_of_week(d):
+    date_obj = date(d.year, d.month, d.day)
+    day = date_obj.weekday()
+    if day == 6: # Sunday
+        date_obj += timedelta(days=1)
+        day = date_obj.weekday()
+    days_to_subtract = day
+    monday_of_week = date_obj - timedelta(days=days_to_subtract)
+    return monday_of_week
+
+def calculate_dollars_per_hour(value, hours):
+    if hours is None or float(hours) == 0:
+        return None
+    if value is None:
+        return None
+    try:
+        return round(float(value) / float(hours), 2)
+    except (ValueError, TypeError):
+        return None
+
+def upsert_insert(table):
+    """
+    INSERT for the current backend that supports on_conflict_do_nothing() and
+    on_conflict_do_update(), so a row two transactions create at once is not an error.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+# --- Display Order Helpers ---
+# display_order values are spaced ORDER_GAP apart so a single drag-and-drop can be
+# saved by giving only the moved row a key between its new neighbours. When two
+# neighbours run out of room the whole table is rebalanced in one statement.
+ORDER_GAP = 1024
+
+def next_display_order(model):
+    max_order = db.session.query(func.max(model.display_order)).scalar()
+    return (max_order or 0) + ORDER_GAP
+
+def bulk_apply_display_order(model, pk_column, new_orders):
+    """
+    Writes {pk: display_order} in a single UPDATE. PostgreSQL gets
+    UPDATE ... FROM (VALUES ...); other backends fall back to a CASE expression.
+    """
+    if not new_orders:
+        return 0
+    table = model.__table__
+    if db.engine.dialect.name == 'postgresql':
+        new_values = values(
+            column('pk', db.Integer), column('display_order', db.Integer), name='new_orders'
+        ).data(list(new_orders.items()))
+        stmt = update(table).where(
+            table.c[pk_column.key] == new_values.c.pk
+        ).values(display_order=new_values.c.display_order)
+    else:
+        stmt = update(table).where(
+            table.c[pk_column.key].in_(list(new_orders.keys()))
+        ).values(display_order=case(new_orders, value=table.c[pk_column.key]))
+    return db.session.execute(stmt).rowcount
+
+def rebalance_display_order(model, pk_column):
+    """Respaces every row ORDER_GAP apart, keeping the current order."""
+    ordered_ids = [row[0] for row in db.session.query(pk_column).order_by(model.display_order, pk_column).all()]
+    return bulk_apply_display_order(model, pk_column, {pk: (index + 1) * ORDER_GAP for index, pk in enumerate(ordered_ids)})
+
+def apply_full_reorder(model, pk_column, id_key, items):
+    """
+    Applies a full list of {id_key, order} items posted by Sortable. The list must name
+    every row exactly once, so the new keys never interleave with rows left out of it.
+    Rows are respaced ORDER_GAP apart in the posted sequence and written with one
+    statement. Returns an error message, or None on success.
+    """
+    for item in items:
+        if item.get(id_key) is None or item.get('order') is None:
+            return f'Missing {id_key} or order in one or more items'
+    try:
+        posted_ids = [int(item[id_key]) for item in items]
+    except (TypeError, ValueError):
+        return f'{id_key} must be an integer'
+    existing_ids = {row[0] for row in db.session.query(pk_column)}
+    missing_ids = sorted(existing_ids - set(posted_ids))
+    unknown_ids = sorted(set(posted_ids) - existing_ids)
+    if missing_ids or unknown_ids or len(posted_ids) != len(set(posted_ids)):
+        current_app.logger.warning(f"Rejected {model.__tablename__} reorder: missing {missing_ids}, unknown {unknown_ids}, {len(posted_ids)} items posted")
+        return f'The list must contain every row exactly once (missing: {missing_ids}, unknown: {unknown_ids}). Reload and try again.'
+    ordered_items = sorted(items, key=lambda item: item['order'])
+    new_orders = {int(item[id_key]): (index + 1) * ORDER_GAP for index, item in enumerate(ordered_items)}
+    updated = bulk_apply_display_order(model, pk_column, new_orders)
+    if updated != len(new_orders): # A row was deleted meanwhile; the rest are still evenly spaced
+        current_app.logger.warning(f"{len(new_orders) - updated} {model.__tablename__} rows vanished while reordering")
+    return None
+
+class DisplayOrderConflict(Exception):
+    """Raised by move_display_order when the posted neighbours are no longer next to each other."""
+
+
+def _ordered_after(model, pk_column, order, pk):
+    """Rows after (order, pk) in display order; ties on display_order are broken by primary key."""
+    return db.or_(model.display_order > order, db.and_(model.display_order == order, pk_column > pk))
+
+def _ordered_before(model, pk_column, order, pk):
+    return db.or_(model.display_order < order, db.and_(model.display_order == order, pk_column < pk))
+
+def move_display_order(model, pk_column, item_id, before_id, after_id):
+    """
+    Places one row between its new neighbours (before_id is the row now above it,
+    after_id the row now below it; either may be None at the ends of the list).
+    Only the moved row is written unless the gap is exhausted, in which case the
+    table is rebalanced first. Returns the moved row's new display_order.
+    Raises ValueError for a row placed next to itself, and DisplayOrderConflict when
+    a neighbour is gone or the two are not adjacent in the current order (the client's
+    list is stale), so nothing is written out of place.
+    """
+    neighbour_ids = [pk for pk in (before_id, after_id) if pk is not None]
+    if item_id in neighbour_ids:
+        raise ValueError('A row cannot be placed next to itself.')
+    neighbour_orders = dict(
+        db.session.query(pk_column, model.display_order).filter(pk_column.in_(neighbour_ids)).all()
+    ) if neighbour_ids else {}
+    if len(neighbour_orders) != len(set(neighbour_ids)) or None in neighbour_orders.values():
+        raise DisplayOrderConflict('A neighbouring row no longer exists.')
+
+    # Nothing but the moved row may sit between the neighbours, or beyond the one given at an end of the list
+    others = db.session.query(pk_column).filter(pk_column != item_id)
+    if before_id is not None:
+        others = others.filter(_ordered_after(model, pk_column, neighbour_orders[before_id], before_id))
+    if after_id is not None:
+        others = others.filter(_ordered_before(model, pk_column, neighbour_orders[after_id], after_id))
+    if neighbour_ids and others.first() is not None:
+        raise DisplayOrderConflict('The list has changed since it was loaded.')
+
+    def slot_between():
+        lower = neighbour_orders.get(before_id)
+        upper = neighbour_orders.get(after_id)
+        if lower is None and upper is None:
+            return next_display_order(model)
+        if lower is None:
+            return upper - ORDER_GAP
+        if upper is None:
+            return lower + ORDER_GAP
+        if upper - lower > 1:
+            return (lower + upper) // 2
+        return None
+
+    new_order = slot_between()
+    if new_order is None:
+        rebalance_display_order(model, pk_column)
+        neighbour_orders = dict(
+            db.session.query(pk_column, model.display_order).filter(pk_column.in_(neighbour_ids)).all()
+        )
+        new_order = slot_between()
+        if new_order is None: # Adjacent neighbours are ORDER_GAP apart after a rebalance
+            raise DisplayOrderConflict('The list has changed since it was loaded.')
+
+    bulk_apply_display_order(model, pk_column, {item_id: new_order})
+    return new_order
+
+def handle_move_request(model, pk_column, item_id, label):
+    data = request.get_json() or {}
+    if model.query.get(item_id) is None:
+        return jsonify({'message': f'{label} not found'}), 404
+    try:
+        new_order = move_display_order(model, pk_column, item_id, data.get('before_id'), data.get('after_id'))
+        db.session.commit()
+        return jsonify({'message': f'{label} order updated successfully', 'display_order': new_order}), 200
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 400
+    except DisplayOrderConflict as e:
+        db.session.rollback()
+        return jsonify({'message': f'{e} Reload and try again.'}), 409
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error moving {label.lower()}: {e}")
+        return jsonify({'message': 'An error occurred during reordering.', 'details': str(e)}), 500
+# --- END Display Order Helpers ---
+def api_login_required(func):
+    @wraps(func)
+    def decorated_view(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify(message="Authentication is required to access this API."), 401
+        return func(*args, **kwargs)
+    return decorated_view
@@ -0,0 +1,526 @@
+# hours.py
+import calendar # For getting day names
+from datetime import date, timedelta
+
+from flask import Blueprint, request, jsonify, render_template, url_for
+from flask_login import login_required, current_user
+
+from db_routing import replica_reads
+from extensions import db, metrics, dashboard_cache
+from helpers import api_login_required, calculate_dollars_per_hour
+from models import User, Employee, WorkArea, Position, CalendarDay, Notification, OverallProductionWeek, DailyEmployeeHours
+from partitions import ensure_partitions
+from shift import refresh_productivity_rollups
+from work_calendar import ensure_calendar, workday_map
+
+bp = Blueprint('hours', __name__)
+
+
+@bp.route('/production_weeks')
+@login_required
+def production_weeks_page():
+    return render_template('production_weeks.html')
+
+@bp.route('/daily-hours-entry')
+@login_required
+def daily_hours_entry_page():
+    return render_template('daily_hours_entry.html')
+
+@bp.route('/api/overall-production-weeks', methods=['GET'])
+@api_login_required
+@replica_reads
+def get_overall_production_weeks():
+    weeks = OverallProductionWeek.query.order_by(OverallProductionWeek.reporting_week_start_date.desc()).all()
+    return jsonify([week.to_dict() for week in weeks])
+
+@bp.route('/api/overall-production-weeks', methods=['POST'])
+@api_login_required
+def create_overall_production_week():
+    """
+    Creates a new overall production week and generates the corresponding daily
+    forecasted hours for all active employees, factoring in company holidays.
+    """
+    data = request.get_json()
+    if not data or 'reporting_week_start_date' not in data:
+        return jsonify({'message': 'Missing reporting_week_start_date parameter'}), 400
+
+    try:
+        reporting_start_date = date.fromisoformat(data['reporting_week_start_date'])
+        
+        # Ensure the start date is a Monday
+        if reporting_start_date.weekday() != 0:
+            return jsonify({'message': 'Reporting week start date must be a Monday.'}), 400
+
+        # Check if a week with this start date already exists
+        if OverallProductionWeek.query.filter_by(reporting_week_start_date=reporting_start_date).first():
+            return jsonify({'message': f'A production schedule starting on {reporting_start_date.isoformat()} already exists.'}), 409
+
+        # Create the new production week record
+        new_week = OverallProductionWeek(
+            reporting_week_start_date=reporting_start_date,
+            reporting_week_end_date=reporting_start_date + timedelta(days=6),
+            forecasted_product_value=None,
+            actual_product_value=None,
+            forecasted_dollars_per_hour=None,
+            actual_dollars_per_hour=None
+        )
+        db.session.add(new_week)
+        db.session.commit() # Commit here to get the new_week.overall_production_week_id
+
+        # Generated set-based: one INSERT ... SELECT per work area joins its employees to the
+        # calendar days they contribute to this week. Workdays (weekdays that are not holidays)
+        # get the position's default hours when the employee is employed that day, others 0.
+        week_id = new_week.overall_production_week_id
+        work_areas = WorkArea.query.all()
+        if work_areas:
+            ensure_partitions( # Before the INSERTs below; see ensure_partitions
+                min(reporting_start_date + timedelta(days=wa.reporting_week_start_offset_days) for wa in work_areas),
+                max(reporting_start_date + timedelta(days=wa.reporting_week_start_offset_days + wa.contributing_duration_days - 1) for wa in work_areas),
+            )
+        for work_area in work_areas:
+            contributing_start_date = reporting_start_date + timedelta(days=work_area.reporting_week_start_offset_days)
+            contributing_end_date = contributing_start_date + timedelta(days=work_area.contributing_duration_days - 1)
+            ensure_calendar(contributing_start_date, contributing_end_date)
+            is_employee_active_on_day = db.and_(
+                db.or_(Employee.employment_start_date.is_(None), Employee.employment_start_date <= CalendarDay.calendar_date),
+                db.or_(Employee.employment_end_date.is_(None), Employee.employment_end_date >= CalendarDay.calendar_date),
+            )
+            generated = db.select(
+                Employee.employee_id,
+                Employee.primary_work_area_id,
+                CalendarDay.calendar_date,
+                db.case((db.and_(CalendarDay.is_workday, is_employee_active_on_day), Position.default_hours), else_=0),
+                db.literal(week_id),
+            ).join(Position, Employee.position_id == Position.position_id).join(
+                CalendarDay, CalendarDay.calendar_date.between(contributing_start_date, contributing_end_date)
+            ).where(Employee.primary_work_area_id == work_area.work_area_id)
+            db.session.execute(db.insert(DailyEmployeeHours).from_select(
+                ['employee_id', 'work_area_id', 'work_date', 'forecasted_hours', 'overall_production_week_id'], generated
+            ))
+
+        forecasted_total_hours_for_week = db.session.query(db.func.sum(DailyEmployeeHours.forecasted_hours)).filter(
+            DailyEmployeeHours.overall_production_week_id == week_id
+        ).scalar() or 0
+
+        # Update the total forecasted hours on the parent week record
+        new_week.forecasted_total_production_hours = round(float(forecasted_total_hours_for_week), 2)
+        db.session.commit()
+        dashboard_cache.clear() # The bulk INSERTs bypass the mapper events that normally invalidate it
+        metrics.inc('production_weeks_generated_total')
+
+        return jsonify(new_week.to_dict()), 201
+
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use THAT-MM-DD.'}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error creating production schedule: {e}")
+        return jsonify({'message': 'An error occurred while creating the production schedule.', 'details': str(e)}), 500
+
+@bp.route('/api/overall-production-weeks/<int:id>', methods=['PUT'])
+@api_login_required
+def update_overall_production_week(id):
+    week = OverallProductionWeek.query.get_or_404(id)
+    data = request.get_json()
+
+    week.forecasted_product_value = data.get('forecasted_product_value', week.forecasted_product_value)
+    week.forecasted_boxes_built = data.get('forecasted_boxes_built', week.forecasted_boxes_built)
+
+    week.actual_product_value = data.get('actual_product_value', week.actual_product_value)
+    week.actual_boxes_built = data.get('actual_boxes_built', week.actual_boxes_built)
+
+    f_prod_val = float(week.forecasted_product_value) if week.forecasted_product_value is not None else None
+    f_total_hrs = float(week.forecasted_total_production_hours) if week.forecasted_total_production_hours is not None else None
+    
+    a_prod_val = float(week.actual_product_value) if week.actual_product_value is not None else None
+    a_total_hrs = float(week.actual_total_production_hours) if week.actual_total_production_hours is not None else None
+
+    week.forecasted_dollars_per_hour = calculate_dollars_per_hour(f_prod_val, f_total_hrs)
+    week.actual_dollars_per_hour = calculate_dollars_per_hour(a_prod_val, a_total_hrs)
+
+    db.session.commit()
+    return jsonify(week.to_dict())
+
+@bp.route('/api/overall-production-weeks/<int:id>', methods=['DELETE'])
+@api_login_required
+def delete_overall_production_week(id):
+    OverallProductionWeek.query.get_or_404(id)
+    try:
+        delete_production_weeks([id])
+    except ProductionWeekDeleteError as e:
+        print(f"Error deleting production schedule {id}: {e.__cause__}")
+        return jsonify({'message': 'An error occurred while deleting the production schedule; nothing was deleted.', 'details': str(e.__cause__)}), 500
+    return jsonify({'message': 'Production Schedule deleted successfully'}), 204
+
+@bp.route('/api/overall-production-weeks/bulk-delete', methods=['POST'])
+@api_login_required
+def bulk_delete_overall_production_weeks():
+    """
+    Deletes every production week starting between start_date and end_date (inclusive)
+    with its daily hours, one transaction per week, so a long range neither holds locks
+    for long nor loads the hours into memory. When a week fails, the response lists the
+    weeks already deleted; re-running the same range finishes the job.
+    """
+    data = request.get_json() or {}
+    try:
+        start_date = date.fromisoformat(data['start_date'])
+        end_date = date.fromisoformat(data['end_date'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'message': 'start_date and end_date are required (YYYY-MM-DD).'}), 400
+    if end_date < start_date:
+        return jsonify({'message': 'end_date must not be before start_date.'}), 400
+
+    week_ids = [week_id for (week_id,) in db.session.query(OverallProductionWeek.overall_production_week_id).filter(
+        OverallProductionWeek.reporting_week_start_date.between(start_date, end_date)
+    ).order_by(OverallProductionWeek.reporting_week_start_date)]
+    try:
+        hours_deleted = delete_production_weeks(week_ids)
+    except ProductionWeekDeleteError as e:
+        print(f"Error bulk deleting production schedules: {e}: {e.__cause__}")
+        return jsonify({
+            'message': f'{len(e.deleted_week_ids)} of {len(week_ids)} production schedules were deleted before an error; the rest are unchanged.',
+            'weeks_deleted': len(e.deleted_week_ids),
+            'deleted_week_ids': e.deleted_week_ids,
+            'failed_week_id': e.week_id,
+            'hours_deleted': e.hours_deleted,
+            'details': str(e.__cause__)
+        }), 500
+    return jsonify({'message': f'{len(week_ids)} production schedules deleted', 'weeks_deleted': len(week_ids), 'hours_deleted': hours_deleted}), 200
+
+class ProductionWeekDeleteError(Exception):
+    """delete_production_weeks() failed on week_id; the weeks in deleted_week_ids stay deleted."""
+    def __init__(self, week_id, deleted_week_ids, hours_deleted):
+        super().__init__(f"Deleting production week {week_id} failed after {len(deleted_week_ids)} weeks were deleted")
+        self.week_id = week_id
+        self.deleted_week_ids = deleted_week_ids
+        self.hours_deleted = hours_deleted
+
+def delete_production_weeks(week_ids):
+    """
+    Deletes the given weeks with their daily hours and refreshes the productivity
+    rollups of the affected days. Each week is one transaction: a single DELETE for its
+    hours (the ON DELETE CASCADE does the same on PostgreSQL; SQLite enforces it only with
+    PRAGMA foreign_keys=ON), then the week, so a failure never leaves a week half
+    deleted. Rows are never loaded into the session. Commits; returns the number of hours
+    rows deleted, or raises ProductionWeekDeleteError naming the weeks already deleted.
+    """
+    hours_deleted = 0
+    deleted_week_ids = []
+    try:
+        for week_id in week_ids:
+            affected_dates = sorted(row[0] for row in db.session.query(DailyEmployeeHours.work_date).filter_by(overall_production_week_id=week_id).distinct())
+            result = db.session.execute(
+                db.delete(DailyEmployeeHours).where(DailyEmployeeHours.overall_production_week_id == week_id)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                db.delete(OverallProductionWeek).where(OverallProductionWeek.overall_production_week_id == week_id)
+                .execution_options(synchronize_session=False)
+            )
+            for start in range(0, len(affected_dates), 31):
+                refresh_productivity_rollups(affected_dates[start:start + 31])
+            db.session.commit()
+            hours_deleted += result.rowcount
+            deleted_week_ids.append(week_id)
+    except Exception as e:
+        db.session.rollback()
+        raise ProductionWeekDeleteError(week_id, deleted_week_ids, hours_deleted) from e
+    finally:
+        db.session.expire_all() # Deleted weeks may still be in the identity map
+        dashboard_cache.clear() # Bulk DELETEs bypass the mapper events that normally invalidate it
+    return hours_deleted
+
+# Daily Employee Hours API
+@bp.route('/api/daily-hours-entry', methods=['GET'])
+@api_login_required
+def get_daily_hours_for_week():
+    reporting_week_start_date_str = request.args.get('reporting_week_start_date')
+    if not reporting_week_start_date_str:
+        return jsonify({'message': 'Missing reporting_week_start_date parameter'}), 400
+
+    try:
+        reporting_week_start_date = date.fromisoformat(reporting_week_start_date_str)
+    except ValueError:
+        return jsonify({'message': 'Invalid date format for reporting_week_start_date. Use THAT-MM-DD.'}), 400
+
+    if reporting_week_start_date.weekday() != 0:  # 0 is Monday
+        return jsonify({'message': 'reporting_week_start_date must be a Monday.'}), 400
+
+    calendar_week_start_date = reporting_week_start_date - timedelta(days=1)
+    calendar_week_end_date = calendar_week_start_date + timedelta(days=6)
+
+    overall_production_week = OverallProductionWeek.query.filter_by(
+        reporting_week_start_date=reporting_week_start_date
+    ).first()
+
+    if not overall_production_week:
+        return jsonify({
+            'employees_data': [],
+            'all_work_areas': [wa.to_dict() for wa in WorkArea.query.order_by(WorkArea.display_order).all()],
+            'current_overall_production_week_id': None,
+            'message_if_no_week': 'No Overall Production Schedule found for this period. Please create it first in "Manage Production Schedules".'
+        })
+
+    current_overall_production_week_id = overall_production_week.overall_production_week_id
+    workdays = workday_map(calendar_week_start_date, calendar_week_end_date) # Holidays get no default hours
+
+    all_entries_in_date_range = DailyEmployeeHours.query.filter(
+        DailyEmployeeHours.work_date.between(calendar_week_start_date, calendar_week_end_date)
+    ).all()
+    entries_map = {(entry.employee_id, entry.work_date): entry for entry in all_entries_in_date_range}
+
+    all_employees = Employee.query.order_by(Employee.display_order, Employee.employee_id).all()
+    
+    active_employees_for_week = []
+    for emp in all_employees:
+        emp_start = emp.employment_start_date
+        emp_end = emp.employment_end_date
+        employee_ends_before_week_starts = emp_end and emp_end < calendar_week_start_date
+        employee_starts_after_week_ends = emp_start and emp_start > calendar_week_end_date
+        if not employee_ends_before_week_starts and not employee_starts_after_week_ends:
+            active_employees_for_week.append(emp)
+    
+    employees_to_process = active_employees_for_week
+
+    ordered_work_areas = WorkArea.query.order_by(WorkArea.display_order, WorkArea.work_area_id).all()
+    
+    # --- THIS LINE IS NOW CORRECTED ---
+    all_work_areas_for_response = [wa.to_dict() for wa in ordered_work_areas]
+    # --- END CORRECTION ---
+
+    response_data = []
+    for employee in employees_to_process:
+        employee_data = {
+            'employee_id': employee.employee_id,
+            'first_name': employee.first_name,
+            'last_initial': employee.last_initial,
+            'position_title': employee.position_obj.title if employee.position_obj else None,
+            'position_id': employee.position_id,
+            'primary_work_area_id': employee.primary_work_area_id,
+            'primary_work_area_name': employee.primary_work_area.work_area_name if employee.primary_work_area else None,
+            'daily_entries': []
+        }
+
+        current_date = calendar_week_start_date
+        while current_date <= calendar_week_end_date:
+            daily_hour_entry = entries_map.get((employee.employee_id, current_date))
+
+            default_forecasted_hours_for_day = 0.0
+            if workdays.get(current_date):
+                if employee.position_obj:
+                    default_forecasted_hours_for_day = float(employee.position_obj.default_hours)
+
+            is_employee_active = not (
+                (employee.employment_start_date and current_date < employee.employment_start_date) or
+                (employee.employment_end_date and current_date > employee.employment_end_date)
+            )
+
+            if not is_employee_active:
+                default_forecasted_hours_for_day = 0.0
+
+            entry_data = {
+                'work_date': current_date.isoformat(),
+                'day_of_week': calendar.day_name[current_date.weekday()],
+                'daily_hour_id': daily_hour_entry.daily_hour_id if daily_hour_entry else None,
+                'forecasted_hours': str(daily_hour_entry.forecasted_hours) if daily_hour_entry else str(default_forecasted_hours_for_day),
+                'actual_hours': str(daily_hour_entry.actual_hours) if daily_hour_entry and daily_hour_entry.actual_hours is not None else None,
+                'work_area_id': daily_hour_entry.work_area_id if daily_hour_entry else employee.primary_work_area_id,
+                'overall_production_week_id': current_overall_production_week_id,
+                'status': 'existing' if daily_hour_entry else 'new_potential'
+            }
+            employee_data['daily_entries'].append(entry_data)
+            current_date += timedelta(days=1)
+        response_data.append(employee_data)
+
+    return jsonify({
+        'employees_data': response_data,
+        'all_work_areas': all_work_areas_for_response,
+        'current_overall_production_week_id': current_overall_production_week_id,
+        'message_if_no_week': None
+    })
+
+@bp.route('/api/daily-hours-entry/batch-update', methods=['POST'])
+@api_login_required
+def batch_update_daily_hours():
+    data = request.get_json()
+    if not isinstance(data, list):
+        return jsonify({'message': 'Expected a list of daily hour entries for batch update'}), 400
+
+    try:
+        new_entry_dates = [date.fromisoformat(entry['work_date']) for entry in data if not entry.get('daily_hour_id') and entry.get('work_date')]
+        workdays = workday_map(min(new_entry_dates), max(new_entry_dates)) if new_entry_dates else {} # Holidays get no default hours
+
+        for entry_data in data:
+            daily_hour_id = entry_data.get('daily_hour_id')
+            employee_id = entry_data.get('employee_id')
+            work_date_str = entry_data.get('work_date')
+            work_area_id = entry_data.get('work_area_id')
+            actual_hours_str = entry_data.get('actual_hours')
+            overall_production_week_id = entry_data.get('overall_production_week_id')
+
+            if not all([employee_id, work_date_str, work_area_id]):
+                return jsonify({'message': 'Missing required data (employee_id, work_date, work_area_id) in one or more entries.'}), 400
+            
+            if overall_production_week_id is None:
+                return jsonify({'message': f'Cannot save entry for employee {employee_id} on {work_date_str}: Missing associated Overall Production Schedule ID. Please create the schedule first.'}), 400
+
+
+            work_date = date.fromisoformat(work_date_str)
+            actual_hours = float(actual_hours_str) if actual_hours_str is not None and actual_hours_str != '' else None
+
+            if daily_hour_id:
+                entry = DailyEmployeeHours.query.get(daily_hour_id)
+                if not entry:
+                    print(f"Warning: DailyHour entry {daily_hour_id} not found, skipping update.")
+                    continue
+                entry.actual_hours = actual_hours
+                entry.work_area_id = work_area_id
+            else:
+                employee = Employee.query.get(employee_id)
+                if not employee:
+                    return jsonify({'message': f'Employee {employee_id} not found for new entry.'}), 400
+                
+                if workdays.get(work_date):
+                    forecasted_hours_for_day = 7.75 if employee.position_obj and employee.position_obj.title == "Team Leader" else 7.5
+                else:
+                    forecasted_hours_for_day = 0.0
+
+                new_entry = DailyEmployeeHours(
+                    employee_id=employee_id,
+                    work_area_id=work_area_id,
+                    work_date=work_date,
+                    forecasted_hours=forecasted_hours_for_day,
+                    actual_hours=actual_hours,
+                    overall_production_week_id=overall_production_week_id
+                )
+                db.session.add(new_entry)
+
+        affected_week_ids = {entry['overall_production_week_id'] for entry in data if entry.get('overall_production_week_id') is not None}
+        for week_id in affected_week_ids:
+            overall_week = OverallProductionWeek.query.get(week_id)
+            if overall_week:
+                total_actual_hours = db.session.query(db.func.sum(DailyEmployeeHours.actual_hours)).filter(
+                    DailyEmployeeHours.overall_production_week_id == week_id,
+                    DailyEmployeeHours.actual_hours.isnot(None)
+                ).scalar()
+                overall_week.actual_total_production_hours = round(float(total_actual_hours) if total_actual_hours else 0, 2)
+
+                actual_prod_val = float(overall_week.actual_product_value) if overall_week.actual_product_value is not None else None
+                actual_total_hrs = float(overall_week.actual_total_production_hours) if overall_week.actual_total_production_hours is not None else None
+                
+                overall_week.actual_dollars_per_hour = calculate_dollars_per_hour(actual_prod_val, actual_total_hrs)
+
+        refresh_productivity_rollups({date.fromisoformat(entry['work_date']) for entry in data})
+        db.session.commit()
+        metrics.inc('hours_cells_saved_total', len(data), kind='actual')
+
+        # --- BEGIN NOTIFICATION LOGIC ---
+        # This implementation notifies all other users. A future enhancement could be
+        # to implement user roles and notify only specific managers.
+        if affected_week_ids:
+            # Get all users who should be notified (everyone except the person making the change)
+            recipients = User.query.filter(User.id != current_user.id).all()
+            
+            for week_id in affected_week_ids:
+                week = OverallProductionWeek.query.get(week_id)
+                if week and recipients:
+                    message = f'{current_user.username} updated hours for the week of {week.reporting_week_start_date.strftime("%b %d, %Y")}.'
+                    
+                    # Create a link that will take the user directly to the correct week
+                    link = url_for('hours.daily_hours_entry_page', _external=True) + f'?reporting_week_start_date={week.reporting_week_start_date.isoformat()}'
+
+                    for recipient in recipients:
+                        notification = Notification(
+                            user_id=recipient.id,
+                            message=message,
+                            link=link
+                        )
+                        db.session.add(notification)
+                    metrics.inc('notifications_created_total', len(recipients))
+            
+            db.session.commit()
+        # --- END NOTIFICATION LOGIC ---
+
+        return jsonify({'message': 'Daily hours updated successfully'}), 200
+
+    except ValueError as ve:
+        db.session.rollback()
+        return jsonify({'message': f'Data format error: {str(ve)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error during batch update of daily hours: {e}")
+        return jsonify({'message': 'An unexpected error occurred during batch update.', 'details': str(e)}), 500
+
+@bp.route('/api/daily-hours/update-forecasts', methods=['PUT'])
+@api_login_required
+def update_daily_forecasts():
+    data = request.get_json() # Expected: list of {daily_hour_id, new_forecasted_hours, ...}
+    if not isinstance(data, list):
+        return jsonify({'message': 'Expected a list of daily forecast update objects'}), 400
+
+    try:
+        for entry in data:
+            daily_hour_id = entry.get('daily_hour_id')
+            new_forecasted_hours = entry.get('new_forecasted_hours')
+            employee_id = entry.get('employee_id')
+            work_date_str = entry.get('work_date')
+            work_area_id = entry.get('work_area_id')
+            overall_production_week_id = entry.get('overall_production_week_id')
+
+
+            if daily_hour_id is not None: # Update existing record
+                daily_entry = DailyEmployeeHours.query.get(daily_hour_id)
+                if daily_entry:
+                    daily_entry.forecasted_hours = new_forecasted_hours
+                else:
+                    print(f"Warning: DailyHour entry {daily_hour_id} not found for update, skipping.")
+            else: # Create new record if it doesn't exist (e.g., forecast for a manually added day)
+                  # This path might be hit if a user tries to set forecast for a day that was not auto-generated
+                  # and doesn't have an ID.
+                if not all([employee_id, work_date_str, work_area_id, overall_production_week_id is not None]):
+                    print(f"Warning: Missing data for new forecast entry: {entry}")
+                    continue # Skip this entry
+
+                work_date = date.fromisoformat(work_date_str)
+                # Check if this exact record already exists (composite unique constraint)
+                existing_entry = DailyEmployeeHours.query.filter_by(
+                    employee_id=employee_id,
+                    work_area_id=work_area_id,
+                    work_date=work_date,
+                    overall_production_week_id=overall_production_week_id
+                ).first()
+
+                if existing_entry:
+                    existing_entry.forecasted_hours = new_forecasted_hours
+                else:
+                    new_daily_entry = DailyEmployeeHours(
+                        employee_id=employee_id,
+                        work_area_id=work_area_id,
+                        work_date=work_date,
+                        forecasted_hours=new_forecasted_hours,
+                        actual_hours=None, # Actuals are handled by batch_update_daily_hours
+                        overall_production_week_id=overall_production_week_id
+                    )
+                    db.session.add(new_daily_entry)
+        
+        # Recalculate total forecasted hours for affected production weeks
+        affected_week_ids = {entry['overall_production_week_id'] for entry in data if entry.get('overall_production_week_id') is not None}
+        for week_id in affected_week_ids:
+            overall_week = OverallProductionWeek.query.get(week_id)
+            if overall_week:
+                total_forecasted_hours = db.session.query(db.func.sum(DailyEmployeeHours.forecasted_hours)).filter(
+                    DailyEmployeeHours.overall_production_week_id == week_id,
+                    DailyEmployeeHours.forecasted_hours.isnot(None)
+                ).scalar()
+                overall_week.forecasted_total_production_hours = round(float(total_forecasted_hours) if total_forecasted_hours else 0, 2)
+        
+        db.session.commit()
+        metrics.inc('hours_cells_saved_total', len(data), kind='forecast')
+        return jsonify({'message': 'Forecasted hours updated successfully!'}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error updating forecasted hours: {e}")
+        return jsonify({'message': 'An error occurred while updating forecasted hours.', 'details': str(e)}), 500
+
+
@@ -0,0 +1,126 @@
+# login_guard.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class VerifierBusy(Exception):
+    """Raised when the password verifier has no room for another check."""
+
+
+class PasswordVerifier:
+    """
+    Hashes and checks passwords with bcrypt. Checks run on a small dedicated thread pool so
+    a burst of logins can only occupy LOGIN_HASH_WORKERS cores, leaving the request threads
+    free to serve other endpoints. At most LOGIN_HASH_MAX_PENDING checks may be queued or
+    running; beyond that, and when a check waits longer than LOGIN_HASH_TIMEOUT seconds,
+    VerifierBusy is raised instead. bcrypt and the pool are only set up on first use.
+    """
+
+    def __init__(self, app=None):
+        self._bcrypt = None
+        self._executor = None
+        self._init_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('LOGIN_HASH_WORKERS', 2)
+        app.config.setdefault('LOGIN_HASH_MAX_PENDING', 32)
+        app.config.setdefault('LOGIN_HASH_TIMEOUT', 10)
+        self.app = app
+        self.timeout = app.config['LOGIN_HASH_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(app.config['LOGIN_HASH_MAX_PENDING'])
+        app.extensions['password_verifier'] = self
+
+    @property
+    def bcrypt(self):
+        if self._bcrypt is None:
+            with self._init_lock:
+                if self._bcrypt is None:
+                    from flask_bcrypt import Bcrypt
+                    self._bcrypt = Bcrypt(self.app)
+        return self._bcrypt
+
+    def hash(self, password):
+        return self.bcrypt.generate_password_hash(password).decode('utf-8')
+
+    def check(self, password_hash, password):
+        if not self._slots.acquire(blocking=False):
+            raise VerifierBusy()
+        try:
+            future = self._get_executor().submit(self.bcrypt.check_password_hash, password_hash, password)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise VerifierBusy()
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._init_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.app.config['LOGIN_HASH_WORKERS'], thread_name_prefix='bcrypt'
+                    )
+        return self._executor
+
+
+class RateLimiter:
+    """
+    Sliding-window counter keyed by arbitrary strings (e.g. a username or an address).
+    hit() records an attempt and returns the seconds to wait when the key is over its
+    limit, or 0 when the attempt is allowed. retry_after() answers the same question
+    without recording anything. Counts are per process.
+    """
+
+    def __init__(self, limit=10, window=60):
+        self.limit = limit
+        self.window = window
+        self._hits = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def hit(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            hits = self._hits.setdefault(key, deque())
+            wait = self._wait(hits, now)
+            if not wait:
+                hits.append(now)
+            return wait
+
+    def retry_after(self, key):
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            return self._wait(hits, now) if hits else 0
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def _wait(self, hits, now):
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        if len(hits) >= self.limit:
+            return hits[0] + self.window - now
+        return 0
+
+    def _sweep(self, now):
+        # Drop idle keys now and then so one-off usernames don't accumulate
+        if now - self._last_sweep < self.window:
+            return
+        self._last_sweep = now
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]:
+            del self._hits[key]
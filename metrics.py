@@ -0,0 +1,330 @@
+# metrics.py
+import contextlib
+import glob
+import json
+import os
+import threading
+import time
+
+from flask import Response, g, request, has_request_context
+from sqlalchemy import event
+
+from pool_stats import pool_monitor
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# name: (type, help, histogram buckets)
+METRICS = {
+    'http_requests_total': ('counter', 'Requests served, by route, method and status.', None),
+    'http_request_duration_seconds': ('histogram', 'Request latency by route.', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('histogram', 'Response body size by route.', SIZE_BUCKETS),
+    'http_requests_in_flight': ('gauge', 'Requests currently being served.', None),
+    'db_queries_total': ('counter', 'SQL statements executed, by route.', None),
+    'db_query_duration_seconds_total': ('counter', 'Time spent executing SQL, by route.', None),
+    'db_pool_size': ('gauge', 'Configured connection pool size.', None),
+    'db_pool_checked_out': ('gauge', 'Connections currently checked out of the pool.', None),
+    'db_pool_overflow': ('gauge', 'Connections open beyond the pool size.', None),
+    'db_pool_timeouts_total': ('counter', 'Requests that gave up waiting for a pooled connection.', None),
+    'hours_cells_saved_total': ('counter', 'Daily hours cells written, by kind (actual or forecast).', None),
+    'production_weeks_generated_total': ('counter', 'Production weeks created with generated daily hours.', None),
+    'notifications_created_total': ('counter', 'Notifications fanned out to users.', None),
+    'emails_sent_total': ('counter', 'Report emails sent, by outcome.', None),
+    'report_jobs_total': ('counter', 'Background reports by outcome: done, failed or stored (served from a stored result).', None),
+}
+
+
+class Metrics:
+    """
+    Low-overhead in-process metrics rendered in the Prometheus text format at /metrics.
+
+    Values live in plain dicts behind one lock. When METRICS_DIR is set (required under a
+    preforking server), a background thread in each worker writes its values to
+    METRICS_DIR/<pid>.json every METRICS_FLUSH_SECONDS when they changed, and /metrics
+    sums the files of every worker. When a worker exits its counters are folded into
+    METRICS_DIR/archive.json and its own file is deleted (see mark_process_dead).
+    """
+
+    def __init__(self, app=None, db=None):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._dirty = False
+        self._dead = False # Set once this process's values were archived; nothing is flushed after that
+        self._flusher_pid = None
+        self.app = None
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_DIR', None)
+        app.config.setdefault('METRICS_FLUSH_SECONDS', 1)
+        app.config.setdefault('METRICS_TOKEN', None)
+        self.app = app
+        self.db = db
+        app.extensions['metrics'] = self
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        if app.config['METRICS_DIR']:
+            os.makedirs(app.config['METRICS_DIR'], exist_ok=True)
+        with app.app_context():
+            for engine in db.engines.values(): # The read replica's queries count too
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+                event.listen(engine, 'handle_error', self._handle_error)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    # --- Recording ---
+    def inc(self, name, value=1, **labels):
+        if not value:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+            self._dirty = True
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(buckets) + 2) # bucket counts, then sum and count
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+            self._dirty = True
+
+    # --- Request hooks ---
+    def _start_request(self):
+        g._metrics_started = time.perf_counter()
+        g._metrics_sql = [0, 0.0]
+        self.inc('http_requests_in_flight')
+
+    def _finish_request(self, response):
+        started = g.pop('_metrics_started', None)
+        if started is None or request.endpoint == 'metrics':
+            return response
+        route = request.endpoint or 'unmatched'
+        self.inc('http_requests_total', route=route, method=request.method, status=str(response.status_code))
+        self.observe('http_request_duration_seconds', time.perf_counter() - started, route=route)
+        if response.content_length is not None:
+            self.observe('http_response_size_bytes', response.content_length, route=route)
+        query_count, sql_seconds = g.pop('_metrics_sql', (0, 0.0))
+        self.inc('db_queries_total', query_count, route=route)
+        self.inc('db_query_duration_seconds_total', sql_seconds, route=route)
+        return response
+
+    def _teardown_request(self, exc):
+        # Runs even when a view raised, so the gauge cannot drift upwards
+        self.inc('http_requests_in_flight', -1)
+        if self.app.config['METRICS_DIR'] and self._flusher_pid != os.getpid():
+            self._start_flusher()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_metrics_query_start', []).append(time.perf_counter())
+        if context is not None:
+            context._metrics_timed = True
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._record_query(conn.info['_metrics_query_start'].pop())
+
+    def _handle_error(self, exception_context):
+        # A failed statement never reaches after_cursor_execute; pop its start time here so
+        # the stack stays matched with the statements still running on this connection
+        context = exception_context.execution_context
+        if exception_context.connection is not None and getattr(context, '_metrics_timed', False):
+            context._metrics_timed = False
+            self._record_query(exception_context.connection.info['_metrics_query_start'].pop())
+
+    def _record_query(self, started):
+        sql = g.get('_metrics_sql') if has_request_context() else None
+        if sql is not None:
+            sql[0] += 1
+            sql[1] += time.perf_counter() - started
+
+    # --- Aggregation across worker processes ---
+    def _collect_pool(self):
+        stats = pool_monitor.stats()
+        self.set('db_pool_size', stats.get('size', 0))
+        self.set('db_pool_checked_out', stats.get('checked_out', 0))
+        self.set('db_pool_overflow', stats.get('overflow', 0))
+        self.set('db_pool_timeouts_total', stats['timeouts'])
+
+    def _snapshot(self, include_gauges=True):
+        with self._lock:
+            return [
+                [name, dict(labels), value]
+                for (name, labels), value in self._values.items()
+                if include_gauges or METRICS[name][0] != 'gauge'
+            ]
+
+    def flush(self):
+        directory = self.app.config['METRICS_DIR'] if self.app else None
+        if not directory or self._dead:
+            return
+        self._collect_pool()
+        with self._lock:
+            self._dirty = False
+        _write_entries(os.path.join(directory, f"{os.getpid()}.json"), self._snapshot())
+
+    def _start_flusher(self):
+        # One per worker process, started by its first request (so never in a preloading master)
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.app.config['METRICS_FLUSH_SECONDS'])
+            if self._dirty:
+                try:
+                    self.flush()
+                except OSError as e:
+                    print(f"Error writing metrics: {e}")
+
+    def reset(self):
+        """Drops values inherited from the master process after a fork."""
+        with self._lock:
+            self._values.clear()
+            self._dead = False
+
+    def mark_process_dead(self, pid=None):
+        """
+        Folds a finished worker's counters and histograms into METRICS_DIR/archive.json,
+        drops its gauges and deletes its <pid>.json, as prometheus_client's multiprocess
+        mode does, so recycled workers neither vanish from the totals nor leave files
+        behind. The worker calls it on exit (pid None: its live values are archived); the
+        master calls it for every exited worker, which covers workers killed before that.
+        """
+        directory = self.app.config['METRICS_DIR'] if self.app else None
+        if not directory:
+            return
+        if pid is None or pid == os.getpid():
+            pid = os.getpid()
+            self._collect_pool()
+            with self._lock:
+                self._dead = True # The flush thread must not write the file back
+            entries = self._snapshot(include_gauges=False)
+        else:
+            entries = _read_entries(os.path.join(directory, f"{pid}.json"))
+            if entries is None:
+                return # Already archived by the worker itself
+            entries = [entry for entry in entries if METRICS[entry[0]][0] != 'gauge']
+        archive_path = os.path.join(directory, ARCHIVE_FILE)
+        with _directory_lock(directory, exclusive=True):
+            _write_entries(archive_path, _sum_entries([_read_entries(archive_path) or [], entries]))
+            try:
+                os.remove(os.path.join(directory, f"{pid}.json"))
+            except FileNotFoundError:
+                pass
+
+    def clear_directory(self):
+        directory = self.app.config['METRICS_DIR']
+        if directory:
+            for path in glob.glob(os.path.join(directory, '*.json')):
+                os.remove(path)
+
+    def _aggregate(self):
+        directory = self.app.config['METRICS_DIR']
+        if not directory:
+            return self._snapshot()
+        # Shared lock: a worker being archived is counted once, in its own file or in the archive
+        with _directory_lock(directory, exclusive=False):
+            return _sum_entries(_read_entries(path) or [] for path in glob.glob(os.path.join(directory, '*.json')))
+
+    # --- Exposition ---
+    def render(self):
+        self._collect_pool()
+        self.flush()
+        by_name = {}
+        for name, labels, value in self._aggregate():
+            by_name.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            samples = by_name.get(name)
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples, key=lambda s: sorted(s[0].items())):
+                if kind == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(buckets, value):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels, le=_number(bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels, le='+Inf')} {value[-1]}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(value[-2])}")
+                    lines.append(f"{name}_count{_labels(labels)} {value[-1]}")
+                else:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        token = self.app.config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+ARCHIVE_FILE = 'archive.json' # Counters of exited workers, in METRICS_DIR
+
+def _read_entries(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None # Missing, or a worker is mid-write
+
+def _write_entries(path, entries):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(entries, f)
+    os.replace(path + '.tmp', path)
+
+def _sum_entries(entry_lists):
+    totals = {}
+    for entries in entry_lists:
+        for name, labels, value in entries:
+            key = (name, tuple(sorted(labels.items())))
+            if isinstance(value, list):
+                current = totals.get(key) or [0] * len(value)
+                totals[key] = [a + b for a, b in zip(current, value)]
+            else:
+                totals[key] = totals.get(key, 0) + value
+    return [[name, dict(labels), value] for (name, labels), value in totals.items()]
+
+@contextlib.contextmanager
+def _directory_lock(directory, exclusive):
+    """flock on METRICS_DIR/archive.lock between archiving a worker and reading the files."""
+    import fcntl # Unix only, like the preforking server that needs METRICS_DIR
+
+    with open(os.path.join(directory, 'archive.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _labels(labels, **extra):
+    items = {**labels, **extra}
+    if not items:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in items.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(items.keys(), escaped)) + '}'
@@ -0,0 +1,51 @@
+"""Respace display_order with gaps for single-row moves
+
+Revision ID: 5d1e7a9c2b40
+Revises: 10a57d96ff98
+Create Date: 2026-10-19 09:12:31.408215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text # Import text for raw SQL
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1e7a9c2b40'
+down_revision = '10a57d96ff98'
+branch_labels = None
+depends_on = None
+
+ORDER_GAP = 1024 # Must match ORDER_GAP in app.py
+
+ORDERED_TABLES = [
+    ('work_areas', 'work_area_id'),
+    ('positions', 'position_id'),
+    ('employees', 'employee_id'),
+]
+
+
+def upgrade():
+    # Renumber every row ORDER_GAP apart, keeping the existing order
+    for table, pk in ORDERED_TABLES:
+        op.execute(text(f"""
+            UPDATE {table} SET display_order = ranked.rn * {ORDER_GAP}
+            FROM (
+                SELECT {pk} AS ranked_id, ROW_NUMBER() OVER (ORDER BY display_order, {pk}) AS rn
+                FROM {table}
+            ) AS ranked
+            WHERE {table}.{pk} = ranked.ranked_id
+        """))
+
+
+def downgrade():
+    # Back to dense 0-based positions, as the old full-list reorder wrote them
+    for table, pk in ORDERED_TABLES:
+        op.execute(text(f"""
+            UPDATE {table} SET display_order = ranked.rn - 1
+            FROM (
+                SELECT {pk} AS ranked_id, ROW_NUMBER() OVER (ORDER BY display_order, {pk}) AS rn
+                FROM {table}
+            ) AS ranked
+            WHERE {table}.{pk} = ranked.ranked_id
+        """))
@@ -0,0 +1,99 @@
+"""Collapse legacy per-stage finishing_work rows into one row per item
+
+Revision ID: a3f9c2e71b64
+Revises: e6b1a4d7c952
+Create Date: 2026-10-19 20:06:14.730285
+
+"""
+from datetime import datetime, time
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f9c2e71b64'
+down_revision = 'e6b1a4d7c952'
+branch_labels = None
+depends_on = None
+
+# The stage sequences at the time of this migration (models.FINISH_STAGES)
+FINISH_STAGES = {
+    'PAINT': ['Picked', 'Sanded', 'Prime1', 'Scuff1', 'Prime2', 'Scuff2', 'Top Coat'],
+    'STAIN': ['Picked', 'Sanded', 'Stain', 'Sealer', 'Scuff1', 'Top Coat'],
+    'NATURAL': ['Picked', 'Sanded', 'Sealer', 'Scuff1', 'Top Coat'],
+    'GLAZE': ['Picked', 'Sanded', 'Prime1', 'Scuff1', 'Prime2', 'Scuff2', 'Top Coat1', 'Glaze', 'Top Coat2']
+}
+
+finishing_work = sa.table('finishing_work',
+    sa.column('finishing_id', sa.Integer), sa.column('job_id', sa.Integer), sa.column('finish_type', sa.String),
+    sa.column('stage', sa.String), sa.column('status', sa.String), sa.column('stage_completed_date', sa.Date),
+    sa.column('employee_id', sa.Integer), sa.column('stage_entered_at', sa.DateTime))
+finishing_stage_events = sa.table('finishing_stage_events',
+    sa.column('finishing_id', sa.Integer), sa.column('finish_type', sa.String), sa.column('from_stage', sa.String),
+    sa.column('from_status', sa.String), sa.column('to_stage', sa.String), sa.column('to_status', sa.String),
+    sa.column('employee_id', sa.Integer), sa.column('seconds_in_stage', sa.Float), sa.column('occurred_at', sa.DateTime))
+
+
+def _stage_index(row):
+    stages = FINISH_STAGES.get(row.finish_type, [])
+    return stages.index(row.stage) if row.stage in stages else -1
+
+
+def upgrade():
+    """
+    The WIP board used to create one finishing_work row per job x finish type x stage
+    cell; a row is now one item that moves through the stages, and it stays open until
+    its final stage is Complete. Legacy rows (stage_entered_at was never set) of the same
+    job and finish type are collapsed into the most advanced one. Each merged row that
+    was Complete becomes a stage event on the kept row, dated by its stage_completed_date,
+    so the history stays readable through /api/finishing_work/<id>/events. Manual parts
+    had no per-stage rows and are left alone.
+    """
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(finishing_work).where(
+        finishing_work.c.stage_entered_at.is_(None),
+        finishing_work.c.job_id.isnot(None)
+    ).order_by(finishing_work.c.finishing_id)).all()
+
+    groups = {}
+    for row in rows:
+        groups.setdefault((row.job_id, row.finish_type), []).append(row)
+
+    for items in groups.values():
+        if len(items) < 2:
+            continue
+        keep = max(items, key=lambda row: (_stage_index(row), row.finishing_id))
+        merged = [row for row in items if row.finishing_id != keep.finishing_id]
+        stages = FINISH_STAGES.get(keep.finish_type, [])
+
+        history = []
+        for row in sorted(merged, key=_stage_index):
+            if row.status != 'Complete':
+                continue
+            index = _stage_index(row)
+            history.append({
+                'finishing_id': keep.finishing_id,
+                'finish_type': row.finish_type,
+                'from_stage': row.stage,
+                'from_status': row.status,
+                'to_stage': stages[index + 1] if 0 <= index < len(stages) - 1 else row.stage,
+                'to_status': 'In Progress',
+                'employee_id': row.employee_id,
+                'seconds_in_stage': None,
+                'occurred_at': datetime.combine(row.stage_completed_date, time()) if row.stage_completed_date else datetime.utcnow(),
+            })
+        if history:
+            op.bulk_insert(finishing_stage_events, history)
+
+        merged_ids = [row.finishing_id for row in merged]
+        # Changes already logged against a merged row now belong to the item
+        bind.execute(sa.update(finishing_stage_events).where(
+            finishing_stage_events.c.finishing_id.in_(merged_ids)
+        ).values(finishing_id=keep.finishing_id))
+        bind.execute(sa.delete(finishing_work).where(finishing_work.c.finishing_id.in_(merged_ids)))
+
+
+def downgrade():
+    # Merged rows cannot be recreated; the collapsed data stays valid under the old code
+    pass
@@ -0,0 +1,35 @@
+"""Add job_tag search indexes
+
+Revision ID: a7c3e51f9d12
+Revises: 5d1e7a9c2b40
+Create Date: 2026-10-19 10:04:52.771930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text # Import text for raw SQL
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e51f9d12'
+down_revision = '5d1e7a9c2b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # Prefix matches: btree with text_pattern_ops so LIKE 'abc%' can use it regardless of collation
+        op.create_index('ix_jobs_job_tag_lower', 'jobs', [text('lower(job_tag) text_pattern_ops')])
+        # Substring matches: trigram GIN index for LIKE '%abc%'
+        op.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        op.create_index('ix_jobs_job_tag_trgm', 'jobs', [text('lower(job_tag) gin_trgm_ops')], postgresql_using='gin')
+    else:
+        # SQLite fallback: plain expression index
+        op.create_index('ix_jobs_job_tag_lower', 'jobs', [text('lower(job_tag)')])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_jobs_job_tag_trgm', table_name='jobs')
+    op.drop_index('ix_jobs_job_tag_lower', table_name='jobs')
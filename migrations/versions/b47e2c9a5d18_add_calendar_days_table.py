@@ -0,0 +1,71 @@
+"""Add calendar_days table
+
+Revision ID: b47e2c9a5d18
+Revises: f2a6d9e47b35
+Create Date: 2026-10-19 16:41:08.517293
+
+"""
+from datetime import date, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b47e2c9a5d18'
+down_revision = 'f2a6d9e47b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    calendar_days = op.create_table('calendar_days',
+    sa.Column('calendar_date', sa.Date(), nullable=False),
+    sa.Column('weekday', sa.Integer(), nullable=False),
+    sa.Column('is_holiday', sa.Boolean(), nullable=False),
+    sa.Column('is_workday', sa.Boolean(), nullable=False),
+    sa.Column('reporting_week_start', sa.Date(), nullable=False),
+    sa.Column('fiscal_month', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('calendar_date')
+    )
+    with op.batch_alter_table('calendar_days', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_calendar_days_fiscal_month'), ['fiscal_month'], unique=False)
+        batch_op.create_index(batch_op.f('ix_calendar_days_reporting_week_start'), ['reporting_week_start'], unique=False)
+
+    # Cover all existing hours and weeks, plus the current and next year; later dates are added as weeks are created
+    bind = op.get_bind()
+    today = date.today()
+    bounds = [_as_date(d) for row in (
+        bind.execute(sa.text("SELECT MIN(work_date), MAX(work_date) FROM daily_employee_hours")).one(),
+        bind.execute(sa.text("SELECT MIN(reporting_week_start_date), MAX(reporting_week_end_date) FROM overall_production_weeks")).one(),
+    ) for d in row if d is not None]
+    start = min(bounds + [date(today.year, 1, 1)]) - timedelta(days=7)
+    end = max(bounds + [date(today.year + 1, 12, 31)]) + timedelta(days=7)
+    holiday_dates = {_as_date(d) for (d,) in bind.execute(sa.text("SELECT holiday_date FROM holidays"))}
+    rows = []
+    day = start
+    while day <= end:
+        is_holiday = day in holiday_dates
+        rows.append({
+            'calendar_date': day,
+            'weekday': day.weekday(),
+            'is_holiday': is_holiday,
+            'is_workday': day.weekday() < 5 and not is_holiday,
+            'reporting_week_start': day + timedelta(days=1) if day.weekday() == 6 else day - timedelta(days=day.weekday()), # Sunday starts the next reporting week
+            'fiscal_month': day.replace(day=1),
+        })
+        day += timedelta(days=1)
+    op.bulk_insert(calendar_days, rows)
+
+
+def _as_date(value):
+    # SQLite returns dates from raw SQL as strings
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_days', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_calendar_days_reporting_week_start'))
+        batch_op.drop_index(batch_op.f('ix_calendar_days_fiscal_month'))
+
+    op.drop_table('calendar_days')
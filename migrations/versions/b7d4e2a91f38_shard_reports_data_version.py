@@ -0,0 +1,33 @@
+"""Spread the reports data version over several data_versions rows
+
+Revision ID: b7d4e2a91f38
+Revises: a3f9c2e71b64
+Create Date: 2026-10-19 21:42:08.516903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d4e2a91f38'
+down_revision = 'a3f9c2e71b64'
+branch_labels = None
+depends_on = None
+
+# models.REPORT_VERSION_SHARDS at the time of this migration
+REPORT_VERSION_SHARDS = 8
+
+data_versions = sa.table('data_versions', sa.column('name', sa.String), sa.column('version', sa.Integer))
+
+
+def upgrade():
+    # 'reports' becomes the first row, so the summed version (and stored report keys) stay the same
+    op.execute(data_versions.update().where(data_versions.c.name == 'reports').values(name='reports:0'))
+    op.bulk_insert(data_versions, [{'name': f'reports:{shard}', 'version': 0} for shard in range(1, REPORT_VERSION_SHARDS)])
+
+
+def downgrade():
+    total = sa.select(sa.func.coalesce(sa.func.sum(data_versions.c.version), 0)).where(data_versions.c.name.like('reports:%')).scalar_subquery()
+    op.execute(data_versions.update().where(data_versions.c.name == 'reports:0').values(version=total, name='reports'))
+    op.execute(data_versions.delete().where(data_versions.c.name.like('reports:%')))
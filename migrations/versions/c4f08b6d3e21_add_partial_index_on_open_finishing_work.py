@@ -0,0 +1,32 @@
+"""Add partial index on open finishing_work items
+
+Revision ID: c4f08b6d3e21
+Revises: a7c3e51f9d12
+Create Date: 2026-10-19 11:22:07.193584
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f08b6d3e21'
+down_revision = 'a7c3e51f9d12'
+branch_labels = None
+depends_on = None
+
+# Final stage of each finish type (see FINISH_STAGES in app.py)
+OPEN_ITEMS_WHERE = sa.text(
+    "status IS NULL OR status <> 'Complete' OR stage NOT IN ('Top Coat', 'Top Coat2')"
+)
+
+
+def upgrade():
+    with op.batch_alter_table('finishing_work', schema=None) as batch_op:
+        batch_op.create_index('ix_finishing_work_open', ['finish_type', 'stage', 'status'], unique=False,
+                              postgresql_where=OPEN_ITEMS_WHERE, sqlite_where=OPEN_ITEMS_WHERE)
+
+
+def downgrade():
+    with op.batch_alter_table('finishing_work', schema=None) as batch_op:
+        batch_op.drop_index('ix_finishing_work_open')
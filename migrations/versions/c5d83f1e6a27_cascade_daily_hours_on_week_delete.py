@@ -0,0 +1,42 @@
+"""Cascade daily_employee_hours deletes from overall_production_weeks
+
+Revision ID: c5d83f1e6a27
+Revises: b47e2c9a5d18
+Create Date: 2026-10-19 17:12:44.093815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d83f1e6a27'
+down_revision = 'b47e2c9a5d18'
+branch_labels = None
+depends_on = None
+
+# The original foreign key was created without a name: PostgreSQL named it itself, and
+# on SQLite the batch copy needs a naming convention to find it
+POSTGRES_FK_NAME = 'daily_employee_hours_overall_production_week_id_fkey'
+SQLITE_NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+SQLITE_FK_NAME = 'fk_daily_employee_hours_overall_production_week_id_overall_production_weeks'
+
+
+def _replace_week_fk(ondelete):
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('daily_employee_hours', schema=None, naming_convention=SQLITE_NAMING) as batch_op:
+            batch_op.drop_constraint(SQLITE_FK_NAME, type_='foreignkey')
+            batch_op.create_foreign_key(SQLITE_FK_NAME, 'overall_production_weeks',
+                                        ['overall_production_week_id'], ['overall_production_week_id'], ondelete=ondelete)
+    else:
+        op.drop_constraint(POSTGRES_FK_NAME, 'daily_employee_hours', type_='foreignkey')
+        op.create_foreign_key(POSTGRES_FK_NAME, 'daily_employee_hours', 'overall_production_weeks',
+                              ['overall_production_week_id'], ['overall_production_week_id'], ondelete=ondelete)
+
+
+def upgrade():
+    _replace_week_fk('CASCADE')
+
+
+def downgrade():
+    _replace_week_fk(None)
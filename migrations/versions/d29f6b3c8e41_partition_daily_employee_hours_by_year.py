@@ -0,0 +1,81 @@
+"""Partition daily_employee_hours by year on PostgreSQL
+
+Revision ID: d29f6b3c8e41
+Revises: c5d83f1e6a27
+Create Date: 2026-10-19 18:05:31.640127
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd29f6b3c8e41'
+down_revision = 'c5d83f1e6a27'
+branch_labels = None
+depends_on = None
+
+WEEK_INDEX = 'ix_daily_employee_hours_overall_production_week_id'
+YEARS_AHEAD = 1 # Matches partitions.PARTITION_YEARS_AHEAD; the app adds later years itself
+
+# Recreated on the rebuilt table with the names PostgreSQL gave the originals
+FOREIGN_KEYS = (
+    "ADD CONSTRAINT daily_employee_hours_employee_id_fkey FOREIGN KEY (employee_id) REFERENCES employees (employee_id)",
+    "ADD CONSTRAINT daily_employee_hours_work_area_id_fkey FOREIGN KEY (work_area_id) REFERENCES work_areas (work_area_id)",
+    "ADD CONSTRAINT daily_employee_hours_overall_production_week_id_fkey FOREIGN KEY (overall_production_week_id) "
+    "REFERENCES overall_production_weeks (overall_production_week_id) ON DELETE CASCADE",
+)
+
+
+def _rebuild(partitioned):
+    """
+    Copies daily_employee_hours into a new table, partitioned by year on work_date or
+    plain, then swaps it in. A partitioned table's primary key must include the
+    partition column, so there it is (daily_hour_id, work_date); ids still come from the
+    same sequence, so daily_hour_id stays unique.
+    """
+    bind = op.get_bind()
+    op.execute(
+        "CREATE TABLE daily_employee_hours_new (LIKE daily_employee_hours INCLUDING DEFAULTS)"
+        + (" PARTITION BY RANGE (work_date)" if partitioned else "")
+    )
+    if partitioned:
+        first, last = bind.execute(sa.text("SELECT MIN(work_date), MAX(work_date) FROM daily_employee_hours")).one()
+        this_year = date.today().year
+        for year in range(min(first.year if first else this_year, this_year), max(last.year if last else this_year, this_year) + YEARS_AHEAD + 1):
+            op.execute(
+                f"CREATE TABLE daily_employee_hours_y{year} PARTITION OF daily_employee_hours_new "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+    op.execute("INSERT INTO daily_employee_hours_new SELECT * FROM daily_employee_hours")
+    op.execute("ALTER SEQUENCE daily_employee_hours_daily_hour_id_seq OWNED BY daily_employee_hours_new.daily_hour_id")
+    op.execute("DROP TABLE daily_employee_hours")
+    op.execute("ALTER TABLE daily_employee_hours_new RENAME TO daily_employee_hours")
+
+    primary_key = "daily_hour_id, work_date" if partitioned else "daily_hour_id"
+    op.execute(f"ALTER TABLE daily_employee_hours ADD CONSTRAINT daily_employee_hours_pkey PRIMARY KEY ({primary_key})")
+    op.execute("ALTER TABLE daily_employee_hours ADD CONSTRAINT _employee_area_date_week_uc "
+               "UNIQUE (employee_id, work_area_id, work_date, overall_production_week_id)")
+    for foreign_key in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE daily_employee_hours {foreign_key}")
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        _rebuild(partitioned=True)
+        op.execute(f"CREATE INDEX {WEEK_INDEX} ON daily_employee_hours (overall_production_week_id)") # Created on every partition
+    else:
+        # SQLite has no partitioning; it only gets the week index the partitioned table has
+        with op.batch_alter_table('daily_employee_hours', schema=None) as batch_op:
+            batch_op.create_index(WEEK_INDEX, ['overall_production_week_id'], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # Partitions moved to the archive schema by `flask archive-hours` are left there
+        _rebuild(partitioned=False)
+    else:
+        with op.batch_alter_table('daily_employee_hours', schema=None) as batch_op:
+            batch_op.drop_index(WEEK_INDEX)
@@ -0,0 +1,638 @@
+# models.py
+import json
+import random
+from datetime import datetime
+
+from flask_login import UserMixin
+from sqlalchemy import TextClause, func
+
+from db_routing import RoutingSession
+from extensions import db, user_cache, dashboard_cache
+
+
+class User(db.Model, UserMixin):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(20), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(60), nullable=False)
+
+    def get_id(self):
+       return str(self.id)
+
+
+class SessionUser(UserMixin):
+    """
+    Detached snapshot of a User for current_user. Cached by load_user so most
+    requests need no user query; it carries only what requests read from current_user.
+    """
+    def __init__(self, user):
+        self.id = user.id
+        self.username = user.username
+        self.email = user.email
+
+    def get_id(self):
+        return str(self.id)
+
+# Cached users are invalidated on any User change in this process; the TTL bounds staleness across worker processes
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    user_cache.invalidate(target.id)
+
+
+class WorkArea(db.Model):
+    __tablename__ = 'work_areas'
+    work_area_id = db.Column(db.Integer, primary_key=True)
+    work_area_name = db.Column(db.String(100), unique=True, nullable=False)
+    reporting_week_start_offset_days = db.Column(db.Integer, nullable=False)
+    contributing_duration_days = db.Column(db.Integer, default=7, nullable=False)
+    display_order = db.Column(db.Integer, nullable=True)
+
+    employees = db.relationship('Employee', backref='primary_work_area', lazy=True)
+    daily_hours_entries = db.relationship('DailyEmployeeHours', backref='work_area', lazy=True)
+
+    def __repr__(self):
+        return f"<WorkArea {self.work_area_name}>"
+
+    def to_dict(self):
+        return {
+            'work_area_id': self.work_area_id,
+            'work_area_name': self.work_area_name,
+            'reporting_week_start_offset_days': self.reporting_week_start_offset_days,
+            'contributing_duration_days': self.contributing_duration_days,
+            'display_order': self.display_order
+        }
+
+class Employee(db.Model):
+    __tablename__ = 'employees'
+    employee_id = db.Column(db.Integer, primary_key=True)
+    first_name = db.Column(db.String(50), nullable=False)
+    last_initial = db.Column(db.String(5), nullable=False)
+    position_id = db.Column(db.Integer, db.ForeignKey('positions.position_id'), nullable=False)
+    primary_work_area_id = db.Column(db.Integer, db.ForeignKey('work_areas.work_area_id'), nullable=False)
+    display_order = db.Column(db.Integer, nullable=False, server_default='999999')
+
+    employment_start_date = db.Column(db.Date, nullable=False)
+    employment_end_date = db.Column(db.Date, nullable=True)
+
+    daily_hours_entries = db.relationship('DailyEmployeeHours', backref='employee', lazy=True)
+
+    def __repr__(self):
+        return f"<Employee {self.first_name} {self.last_initial}>"
+
+    @property
+    def name(self):
+        return f"{self.first_name} {self.last_initial}"
+
+    def to_dict(self):
+        return {
+            'employee_id': self.employee_id,
+            'first_name': self.first_name,
+            'last_initial': self.last_initial,
+            'position_id': self.position_id,
+            'position_title': self.position_obj.title if self.position_obj else None,
+            'primary_work_area_id': self.primary_work_area_id,
+            'primary_work_area_name': self.primary_work_area.work_area_name if self.primary_work_area else None,
+            'default_forecasted_daily_hours': str(self.position_obj.default_hours) if self.position_obj else None,
+            'display_order': self.display_order,
+            'employment_start_date': self.employment_start_date.isoformat(),
+            'employment_end_date': self.employment_end_date.isoformat() if self.employment_end_date else None
+        }
+
+class OverallProductionWeek(db.Model):
+    __tablename__ = 'overall_production_weeks'
+    overall_production_week_id = db.Column(db.Integer, primary_key=True)
+    reporting_week_start_date = db.Column(db.Date, nullable=False, unique=True)
+    reporting_week_end_date = db.Column(db.Date, nullable=False)
+    forecasted_product_value = db.Column(db.Numeric(12, 2), nullable=True)
+    actual_product_value = db.Column(db.Numeric(12, 2), nullable=True)
+    forecasted_dollars_per_hour = db.Column(db.Numeric(10, 2), nullable=True)
+    actual_dollars_per_hour = db.Column(db.Numeric(10, 2), nullable=True)
+    forecasted_boxes_built = db.Column(db.Integer, nullable=True)
+    actual_boxes_built = db.Column(db.Integer, nullable=True)
+    forecasted_total_production_hours = db.Column(db.Numeric(10, 2), nullable=True)
+    actual_total_production_hours = db.Column(db.Numeric(10, 2), nullable=True)
+    # The database deletes a week's hours (ON DELETE CASCADE), so deleting a week never loads them
+    daily_hours = db.relationship('DailyEmployeeHours', backref='production_week', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+
+    def __repr__(self):
+        return f"<OverallProductionWeek {self.reporting_week_start_date}>"
+
+    def to_dict(self):
+        return {
+            'overall_production_week_id': self.overall_production_week_id,
+            'reporting_week_start_date': self.reporting_week_start_date.isoformat(),
+            'reporting_week_end_date': self.reporting_week_end_date.isoformat(),
+            'forecasted_product_value': str(self.forecasted_product_value) if self.forecasted_product_value is not None else None,
+            'actual_product_value': str(self.actual_product_value) if self.actual_product_value is not None else None,
+            'forecasted_dollars_per_hour': str(self.forecasted_dollars_per_hour) if self.forecasted_dollars_per_hour is not None else None,
+            'actual_dollars_per_hour': str(self.actual_dollars_per_hour) if self.actual_dollars_per_hour is not None else None,
+            'forecasted_boxes_built': self.forecasted_boxes_built,
+            'actual_boxes_built': self.actual_boxes_built,
+            'forecasted_total_production_hours': str(self.forecasted_total_production_hours) if self.forecasted_total_production_hours is not None else None,
+            'actual_total_production_hours': str(self.actual_total_production_hours) if self.actual_total_production_hours is not None else None,
+        }
+
+class DailyEmployeeHours(db.Model):
+    __tablename__ = 'daily_employee_hours'
+    # Partitioned by year on work_date on PostgreSQL (see partitions.py), where the table's
+    # primary key is (daily_hour_id, work_date); ids come from one sequence and stay unique
+    daily_hour_id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False)
+    work_area_id = db.Column(db.Integer, db.ForeignKey('work_areas.work_area_id'), nullable=False)
+    work_date = db.Column(db.Date, nullable=False)
+    forecasted_hours = db.Column(db.Numeric(4, 2), nullable=False)
+    actual_hours = db.Column(db.Numeric(4, 2), nullable=True)
+    overall_production_week_id = db.Column(db.Integer, db.ForeignKey('overall_production_weeks.overall_production_week_id', ondelete='CASCADE'), nullable=False, index=True)
+
+    __table_args__ = (db.UniqueConstraint('employee_id', 'work_area_id', 'work_date', 'overall_production_week_id', name='_employee_area_date_week_uc'),)
+
+    def __repr__(self):
+        return f"<DailyHours Employee:{self.employee_id} Date:{self.work_date} Hours:{self.actual_hours}>"
+
+    def to_dict(self):
+        return {
+            'daily_hour_id': self.daily_hour_id,
+            'employee_id': self.employee_id,
+            'work_area_id': self.work_area_id,
+            'work_date': self.work_date.isoformat(),
+            'forecasted_hours': str(self.forecasted_hours),
+            'actual_hours': str(self.actual_hours) if self.actual_hours is not None else None,
+            'overall_production_week_id': self.overall_production_week_id
+        }
+
+class Position(db.Model):
+    __tablename__ = 'positions'
+    position_id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(50), unique=True, nullable=False)
+    default_hours = db.Column(db.Numeric(4, 2), nullable=False)
+    display_order = db.Column(db.Integer, nullable=False, server_default='999999')
+    employees = db.relationship('Employee', backref='position_obj', lazy=True)
+
+    def __repr__(self):
+        return f"<Position {self.title} ({self.default_hours} hrs)>"
+
+    def to_dict(self):
+        return {
+            'position_id': self.position_id,
+            'title': self.title,
+            'default_hours': str(self.default_hours),
+            'display_order': self.display_order
+        }
+
+class Notification(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    message = db.Column(db.String(255), nullable=False)
+    is_read = db.Column(db.Boolean, default=False, nullable=False)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    link = db.Column(db.String(255), nullable=True)
+    user = db.relationship('User', backref=db.backref('notifications', lazy=True))
+
+    def __repr__(self):
+        return f'<Notification {self.message}>'
+
+class Holiday(db.Model):
+    __tablename__ = 'holidays'
+    id = db.Column(db.Integer, primary_key=True)
+    holiday_date = db.Column(db.Date, unique=True, nullable=False)
+    description = db.Column(db.String(100), nullable=False)
+
+    def __repr__(self):
+        return f"<Holiday {self.description} on {self.holiday_date}>"
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'holiday_date': self.holiday_date.isoformat(),
+            'description': self.description
+        }
+
+class CalendarDay(db.Model):
+    """
+    One row per date with its working-day facts precomputed, so week generation and
+    reports can join against it instead of re-deriving weekday and holiday rules.
+    Rows are added on demand by work_calendar.ensure_calendar(); holiday flags follow
+    the holidays table through sync_calendar_holidays below.
+    """
+    __tablename__ = 'calendar_days'
+    calendar_date = db.Column(db.Date, primary_key=True)
+    weekday = db.Column(db.Integer, nullable=False) # 0 = Monday
+    is_holiday = db.Column(db.Boolean, nullable=False, default=False)
+    is_workday = db.Column(db.Boolean, nullable=False, default=False) # Monday to Friday and not a holiday
+    reporting_week_start = db.Column(db.Date, nullable=False, index=True) # Monday of the Sunday-to-Saturday week
+    fiscal_month = db.Column(db.Date, nullable=False, index=True) # First day of the month the date reports in
+
+    def __repr__(self):
+        return f"<CalendarDay {self.calendar_date}>"
+
+@db.event.listens_for(Holiday, 'after_insert')
+@db.event.listens_for(Holiday, 'after_update')
+@db.event.listens_for(Holiday, 'after_delete')
+def sync_calendar_holidays(mapper, connection, target):
+    # Runs inside the flush, so the calendar changes commit (or roll back) with the holiday. Days
+    # currently flagged are rechecked too, which covers a holiday moved to another date.
+    holiday_exists = db.exists().where(Holiday.holiday_date == CalendarDay.calendar_date)
+    connection.execute(
+        db.update(CalendarDay).where(db.or_(CalendarDay.calendar_date == target.holiday_date, CalendarDay.is_holiday))
+        .values(is_holiday=holiday_exists, is_workday=db.and_(CalendarDay.weekday < 5, ~holiday_exists))
+    )
+
+# --- NEW MODELS FOR SHIFT SUMMARIES ---
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    job_id = db.Column(db.Integer, primary_key=True)
+    job_tag = db.Column(db.String(100), unique=True, nullable=False)
+    num_sheets = db.Column(db.Integer, nullable=True)
+    num_mdf_doors = db.Column(db.Integer, nullable=True)
+    linear_meters_edgebanding = db.Column(db.Float, nullable=True)
+    num_drawer_boxes = db.Column(db.Integer, nullable=True)
+    boxes_mcp = db.Column(db.Integer, nullable=True)
+    boxes_pvc = db.Column(db.Integer, nullable=True)
+    boxes_paint = db.Column(db.Integer, nullable=True)
+    boxes_stain = db.Column(db.Integer, nullable=True)
+    boxes_natural = db.Column(db.Integer, nullable=True)
+    boxes_glaze = db.Column(db.Integer, nullable=True)
+
+    __table_args__ = (
+        # Prefix search on job_tag (LIKE 'abc%'); text_pattern_ops lets PostgreSQL use it under any collation
+        db.Index('ix_jobs_job_tag_lower', func.lower(job_tag).label('job_tag_lower'),
+                 postgresql_ops={'job_tag_lower': 'text_pattern_ops'}),
+        # Substring search (LIKE '%abc%'); needs the pg_trgm extension
+        db.Index('ix_jobs_job_tag_trgm', func.lower(job_tag).label('job_tag_lower'),
+                 postgresql_using='gin', postgresql_ops={'job_tag_lower': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'job_tag': self.job_tag,
+            'num_sheets': self.num_sheets,
+            'num_mdf_doors': self.num_mdf_doors,
+            'linear_meters_edgebanding': self.linear_meters_edgebanding,
+            'num_drawer_boxes': self.num_drawer_boxes,
+            'boxes_mcp': self.boxes_mcp,
+            'boxes_pvc': self.boxes_pvc,
+            'boxes_paint': self.boxes_paint,
+            'boxes_stain': self.boxes_stain,
+            'boxes_natural': self.boxes_natural,
+            'boxes_glaze': self.boxes_glaze
+        }
+
+# create_all() builds ix_jobs_job_tag_trgm on PostgreSQL, so it must create pg_trgm first as the migration does
+db.event.listen(Job.__table__, 'before_create', db.DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+
+class DailyShiftSummary(db.Model):
+    __tablename__ = 'daily_shift_summaries'
+    summary_id = db.Column(db.Integer, primary_key=True)
+    summary_date = db.Column(db.Date, nullable=False)
+    department = db.Column(db.String(100), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.job_id'), nullable=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False)
+    station = db.Column(db.String(100), nullable=True)
+    sheets_cut_mtr = db.Column(db.Integer, nullable=True)
+    sheets_cut_cs43 = db.Column(db.Integer, nullable=True)
+    mdf_doors_cut_mtr = db.Column(db.Integer, nullable=True)
+    mdf_doors_cut_cs43 = db.Column(db.Integer, nullable=True)
+    edgebanding_ran = db.Column(db.Float, nullable=True)
+    edgebanding_changeovers = db.Column(db.Integer, nullable=True)
+    manual_edgebanding = db.Column(db.Integer, nullable=True)
+    drawer_boxes_built = db.Column(db.Integer, nullable=True)
+    boxes_prepped = db.Column(db.Integer, nullable=True)
+    boxes_built = db.Column(db.Integer, nullable=True)
+    boxes_hung = db.Column(db.Integer, nullable=True)
+    team_leader = db.Column(db.String(100))
+    shift = db.Column(db.String(50))
+    notes = db.Column(db.Text)
+    job = db.relationship('Job', backref='daily_shift_summaries')
+    employee = db.relationship('Employee', backref='daily_shift_summaries')
+
+    def to_dict(self):
+        return {
+            'summary_id': self.summary_id,
+            'summary_date': self.summary_date.isoformat(),
+            'department': self.department,
+            'job_id': self.job_id,
+            'job_tag': self.job.job_tag if self.job else None,
+            'employee_id': self.employee_id,
+            'employee_name': self.employee.name if self.employee else None,
+            'station': self.station,
+            'sheets_cut_mtr': self.sheets_cut_mtr,
+            'sheets_cut_cs43': self.sheets_cut_cs43,
+            'mdf_doors_cut_mtr': self.mdf_doors_cut_mtr,
+            'mdf_doors_cut_cs43': self.mdf_doors_cut_cs43,
+            'edgebanding_ran': self.edgebanding_ran,
+            'edgebanding_changeovers': self.edgebanding_changeovers,
+            'manual_edgebanding': self.manual_edgebanding,
+            'drawer_boxes_built': self.drawer_boxes_built,
+            'boxes_prepped': self.boxes_prepped,
+            'boxes_built': self.boxes_built,
+            'boxes_hung': self.boxes_hung,
+            'team_leader': self.team_leader,
+            'shift': self.shift,
+            'notes': self.notes
+        }
+
+# Job progress metrics: progress column -> (planned Job columns, completed DailyShiftSummary columns)
+JOB_PROGRESS_METRICS = {
+    'sheets_cut': (['num_sheets'], ['sheets_cut_mtr', 'sheets_cut_cs43']),
+    'mdf_doors_cut': (['num_mdf_doors'], ['mdf_doors_cut_mtr', 'mdf_doors_cut_cs43']),
+    'edgebanding_ran': (['linear_meters_edgebanding'], ['edgebanding_ran']),
+    'drawer_boxes_built': (['num_drawer_boxes'], ['drawer_boxes_built']),
+    'boxes_built': (['boxes_mcp', 'boxes_pvc', 'boxes_paint', 'boxes_stain', 'boxes_natural', 'boxes_glaze'], ['boxes_built']),
+}
+
+class JobProgress(db.Model):
+    """
+    Running totals of completed work per job, updated in the same transaction as each
+    shift summary insert so progress never needs a scan of summary history.
+    """
+    __tablename__ = 'job_progress'
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.job_id', ondelete='CASCADE'), primary_key=True)
+    sheets_cut = db.Column(db.Integer, nullable=False, default=0)
+    mdf_doors_cut = db.Column(db.Integer, nullable=False, default=0)
+    edgebanding_ran = db.Column(db.Float, nullable=False, default=0)
+    drawer_boxes_built = db.Column(db.Integer, nullable=False, default=0)
+    boxes_built = db.Column(db.Integer, nullable=False, default=0)
+    summary_count = db.Column(db.Integer, nullable=False, default=0)
+    last_summary_date = db.Column(db.Date, nullable=True)
+    completion_pct = db.Column(db.Numeric(5, 2), nullable=False, default=0, index=True)
+    job = db.relationship('Job', backref=db.backref('progress', uselist=False, cascade='all, delete-orphan'))
+
+    def planned(self, metric):
+        planned_columns = JOB_PROGRESS_METRICS[metric][0]
+        return sum(getattr(self.job, col) or 0 for col in planned_columns)
+
+    def recalculate(self):
+        """Average completion across the metrics the job has a plan for, each capped at 100%."""
+        ratios = []
+        for metric in JOB_PROGRESS_METRICS:
+            planned = self.planned(metric)
+            if planned:
+                ratios.append(min(float(getattr(self, metric) or 0) / planned, 1.0))
+        self.completion_pct = round(sum(ratios) / len(ratios) * 100, 2) if ratios else 0
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'job_tag': self.job.job_tag,
+            'completion_pct': str(self.completion_pct),
+            'summary_count': self.summary_count,
+            'last_summary_date': self.last_summary_date.isoformat() if self.last_summary_date else None,
+            'metrics': {
+                metric: {'completed': getattr(self, metric), 'planned': self.planned(metric)}
+                for metric in JOB_PROGRESS_METRICS
+            }
+        }
+
+# Output columns of DailyShiftSummary that are summed into productivity rollups
+PRODUCTIVITY_METRICS = [
+    'sheets_cut_mtr', 'sheets_cut_cs43', 'mdf_doors_cut_mtr', 'mdf_doors_cut_cs43',
+    'edgebanding_ran', 'edgebanding_changeovers', 'manual_edgebanding',
+    'drawer_boxes_built', 'boxes_prepped', 'boxes_built', 'boxes_hung'
+]
+
+class ProductivityDailyRollup(db.Model):
+    """
+    Output and labor hours per department x station x day, kept up to date as shift
+    summaries and actual hours are saved (see refresh_productivity_rollups).
+    """
+    __tablename__ = 'productivity_daily_rollups'
+    rollup_date = db.Column(db.Date, primary_key=True)
+    department = db.Column(db.String(100), primary_key=True)
+    station = db.Column(db.String(100), primary_key=True) # '' when the summaries had no station
+    summary_count = db.Column(db.Integer, nullable=False, default=0)
+    labor_hours = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    sheets_cut_mtr = db.Column(db.Integer, nullable=False, default=0)
+    sheets_cut_cs43 = db.Column(db.Integer, nullable=False, default=0)
+    mdf_doors_cut_mtr = db.Column(db.Integer, nullable=False, default=0)
+    mdf_doors_cut_cs43 = db.Column(db.Integer, nullable=False, default=0)
+    edgebanding_ran = db.Column(db.Float, nullable=False, default=0)
+    edgebanding_changeovers = db.Column(db.Integer, nullable=False, default=0)
+    manual_edgebanding = db.Column(db.Integer, nullable=False, default=0)
+    drawer_boxes_built = db.Column(db.Integer, nullable=False, default=0)
+    boxes_prepped = db.Column(db.Integer, nullable=False, default=0)
+    boxes_built = db.Column(db.Integer, nullable=False, default=0)
+    boxes_hung = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ProductivityDailyRollup {self.rollup_date} {self.department}/{self.station}>"
+
+# Stage sequence per finish type; the WIP board reads it from /api/finishing_work/board
+FINISH_STAGES = {
+    'PAINT': ['Picked', 'Sanded', 'Prime1', 'Scuff1', 'Prime2', 'Scuff2', 'Top Coat'],
+    'STAIN': ['Picked', 'Sanded', 'Stain', 'Sealer', 'Scuff1', 'Top Coat'],
+    'NATURAL': ['Picked', 'Sanded', 'Sealer', 'Scuff1', 'Top Coat'],
+    'GLAZE': ['Picked', 'Sanded', 'Prime1', 'Scuff1', 'Prime2', 'Scuff2', 'Top Coat1', 'Glaze', 'Top Coat2']
+}
+FINAL_FINISH_STAGES = sorted({stages[-1] for stages in FINISH_STAGES.values()})
+FINISHING_STATUS_COMPLETE = 'Complete'
+
+def finishing_open_clause(stage, status):
+    """An item stays open until its final stage is marked Complete."""
+    return db.or_(
+        status.is_(None),
+        status != FINISHING_STATUS_COMPLETE,
+        stage.notin_(FINAL_FINISH_STAGES)
+    )
+
+class FinishingWork(db.Model):
+    """
+    One finishing item (a job's parts of one finish type, or a manual part) moving
+    through its finish type's stages: stage is where it is now, and status whether that
+    stage is In Progress or Complete. It stays open until its final stage is Complete.
+    """
+    __tablename__ = 'finishing_work'
+    finishing_id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.job_id'), nullable=True)
+    manual_part_name = db.Column(db.String(100), nullable=True)
+    finish_type = db.Column(db.String(50), nullable=False)
+    stage = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(50), nullable=True)
+    stage_completed_date = db.Column(db.Date, nullable=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=True)
+    batch_number = db.Column(db.String(50))
+    stage_entered_at = db.Column(db.DateTime, nullable=True) # When the item moved into its current stage
+    job = db.relationship('Job', backref='finishing_work')
+    employee = db.relationship('Employee', backref='finishing_work')
+
+    __table_args__ = (
+        # Partial index over open items only, so the WIP board ignores finished history
+        db.Index('ix_finishing_work_open', finish_type, stage, status,
+                 postgresql_where=finishing_open_clause(stage, status),
+                 sqlite_where=finishing_open_clause(stage, status)),
+    )
+
+    def to_dict(self):
+        return {
+            'finishing_id': self.finishing_id,
+            'job_id': self.job_id,
+            'job_tag': self.job.job_tag if self.job else None,
+            'manual_part_name': self.manual_part_name,
+            'finish_type': self.finish_type,
+            'stage': self.stage,
+            'status': self.status,
+            'stage_completed_date': self.stage_completed_date.isoformat() if self.stage_completed_date else None,
+            'employee_id': self.employee_id,
+            'employee_name': self.employee.name if self.employee else None,
+            'batch_number': self.batch_number
+        }
+
+class FinishingStageEvent(db.Model):
+    """Append-only log of every stage/status change on a finishing item."""
+    __tablename__ = 'finishing_stage_events'
+    event_id = db.Column(db.Integer, primary_key=True)
+    finishing_id = db.Column(db.Integer, db.ForeignKey('finishing_work.finishing_id'), nullable=False)
+    finish_type = db.Column(db.String(50), nullable=False)
+    from_stage = db.Column(db.String(50), nullable=True) # None when the item was created
+    from_status = db.Column(db.String(50), nullable=True)
+    to_stage = db.Column(db.String(50), nullable=False)
+    to_status = db.Column(db.String(50), nullable=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=True)
+    seconds_in_stage = db.Column(db.Float, nullable=True) # Time spent in from_stage, when the item left or finished it
+    occurred_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_finishing_stage_events_item', 'finishing_id', 'occurred_at'),
+        db.Index('ix_finishing_stage_events_occurred_at', 'occurred_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'event_id': self.event_id,
+            'finishing_id': self.finishing_id,
+            'finish_type': self.finish_type,
+            'from_stage': self.from_stage,
+            'from_status': self.from_status,
+            'to_stage': self.to_stage,
+            'to_status': self.to_status,
+            'employee_id': self.employee_id,
+            'seconds_in_stage': self.seconds_in_stage,
+            'occurred_at': self.occurred_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+class FinishingStageDailyStat(db.Model):
+    """
+    Per day x finish type x stage counters maintained as events are written, so
+    cycle-time and throughput reports never re-read the event log.
+    """
+    __tablename__ = 'finishing_stage_daily_stats'
+    stat_date = db.Column(db.Date, primary_key=True)
+    finish_type = db.Column(db.String(50), primary_key=True)
+    stage = db.Column(db.String(50), primary_key=True)
+    entered_count = db.Column(db.Integer, nullable=False, default=0)
+    exited_count = db.Column(db.Integer, nullable=False, default=0) # Left the stage, or completed it if final
+    timed_exit_count = db.Column(db.Integer, nullable=False, default=0) # Exits with a known entry time
+    total_seconds_in_stage = db.Column(db.Float, nullable=False, default=0)
+
+REPORT_VERSION_SHARDS = 8 # data_versions rows the reports version is spread over
+
+class DataVersion(db.Model):
+    """
+    Counters bumped in the committing transaction whenever the data they cover changes
+    (see bump_report_data_version below). The reports version covers everything reports
+    read, so stored report results keyed by it can never be stale. It is the sum of the
+    rows 'reports:0' to 'reports:<REPORT_VERSION_SHARDS - 1>': each commit adds one to a
+    random row, so concurrent writers seldom wait on each other's row lock, and the sum
+    still grows with every commit.
+    """
+    __tablename__ = 'data_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+db.event.listen(DataVersion.__table__, 'after_create', db.DDL("INSERT INTO data_versions (name, version) VALUES "
+    + ', '.join(f"('reports:{shard}', 0)" for shard in range(REPORT_VERSION_SHARDS))))
+
+class ReportJob(db.Model):
+    """
+    One report run in the background (see report_jobs.py), and its stored result.
+    cache_key hashes the report, its normalized parameters, the day and the 'reports'
+    data version, so an identical later request finds the finished row.
+    """
+    __tablename__ = 'report_jobs'
+    report_job_id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False)
+    report = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.Text, nullable=False) # Normalized JSON
+    data_version = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='queued') # queued, running, done or failed
+    result = db.Column(db.Text, nullable=True) # The report's JSON response body
+    error = db.Column(db.Text, nullable=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'job_id': self.report_job_id,
+            'report': self.report,
+            'params': json.loads(self.params),
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+# --- END NEW MODELS ---
+
+
+# The landing page totals (see admin.get_dashboard_stats) are cleared on any change they count
+@db.event.listens_for(DailyEmployeeHours, 'after_insert')
+@db.event.listens_for(DailyEmployeeHours, 'after_update')
+@db.event.listens_for(DailyEmployeeHours, 'after_delete')
+@db.event.listens_for(Employee, 'after_insert')
+@db.event.listens_for(Employee, 'after_update')
+@db.event.listens_for(Employee, 'after_delete')
+@db.event.listens_for(WorkArea, 'after_insert')
+@db.event.listens_for(WorkArea, 'after_delete')
+@db.event.listens_for(Position, 'after_insert')
+@db.event.listens_for(Position, 'after_delete')
+@db.event.listens_for(Holiday, 'after_insert')
+@db.event.listens_for(Holiday, 'after_update')
+@db.event.listens_for(Holiday, 'after_delete')
+def invalidate_dashboard_stats(mapper, connection, target):
+    dashboard_cache.clear()
+
+
+# Any committed change outside these tables moves the reports data version on. ORM flushes,
+# bulk statements and raw text() writes run through the session are all seen; the bump is the
+# transaction's last statement and lands on one of REPORT_VERSION_SHARDS rows, so its row lock
+# is only held while committing and rarely contended.
+REPORT_VERSION_IGNORED_TABLES = {'user', 'notification', 'report_jobs', 'data_versions'}
+
+def increment_report_data_version(connection):
+    """
+    Adds one to the reports version inside the caller's transaction. `connection` is a
+    session or a Connection; writers that bypass the session (db.engine.begin()) must
+    call it themselves.
+    """
+    connection.execute(db.update(DataVersion).where(
+        DataVersion.name == f"reports:{random.randrange(REPORT_VERSION_SHARDS)}"
+    ).values(version=DataVersion.version + 1))
+
+@db.event.listens_for(RoutingSession, 'after_flush')
+def track_flushed_report_data(session, flush_context):
+    for obj in session.new | session.dirty | session.deleted:
+        if obj.__table__.name not in REPORT_VERSION_IGNORED_TABLES:
+            session.info['report_data_changed'] = True
+            return
+
+@db.event.listens_for(RoutingSession, 'do_orm_execute')
+def track_bulk_report_data(orm_execute_state):
+    statement = orm_execute_state.statement
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        if statement.table.name not in REPORT_VERSION_IGNORED_TABLES:
+            orm_execute_state.session.info['report_data_changed'] = True
+    elif isinstance(statement, TextClause) and not statement.text.lstrip().upper().startswith('SELECT'):
+        orm_execute_state.session.info['report_data_changed'] = True # Raw SQL may write anywhere
+
+@db.event.listens_for(RoutingSession, 'before_commit')
+def bump_report_data_version(session):
+    session.flush() # Commit would flush pending changes only after this hook
+    if session.info.pop('report_data_changed', False):
+        increment_report_data_version(session)
+
+@db.event.listens_for(RoutingSession, 'after_rollback')
+def forget_report_data_changes(session):
+    session.info.pop('report_data_changed', None)
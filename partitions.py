@@ -0,0 +1,154 @@
+# partitions.py
+import re
+from datetime import date
+
+import click
+from sqlalchemy import column, table, text, union_all
+from sqlalchemy.orm import aliased
+
+from extensions import db
+from models import DailyEmployeeHours, increment_report_data_version
+
+HOURS_TABLE = 'daily_employee_hours'
+ARCHIVE_SCHEMA = 'archive' # Where `flask archive-hours` moves detached partitions
+PARTITION_YEARS_AHEAD = 1 # Empty yearly partitions kept ready past the latest date written
+_PARTITION_NAME = re.compile(r'^daily_employee_hours_y(\d{4})$')
+
+# Per process: engine URL -> years known to have an attached partition, or False when the table is not partitioned
+_attached_years = {}
+
+
+def partition_name(year):
+    return f"{HOURS_TABLE}_y{year}"
+
+def _is_partitioned(connection):
+    return connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"
+    ), {'name': HOURS_TABLE}).scalar()
+
+def _attached_partition_years(connection):
+    names = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(:name)"
+    ), {'name': HOURS_TABLE}).scalars()
+    return {int(match.group(1)) for match in map(_PARTITION_NAME.match, names) if match}
+
+def is_partitioned():
+    """True when daily_employee_hours is a partitioned PostgreSQL table; False on SQLite or before the migration."""
+    if db.engine.dialect.name != 'postgresql':
+        return False
+    with db.engine.connect() as connection:
+        return _is_partitioned(connection)
+
+def ensure_partitions(start, end):
+    """
+    Creates any missing yearly partitions from start's year through PARTITION_YEARS_AHEAD
+    years past end's. Runs on its own connection and commits straight away, so call it
+    before the session writes hours in that range (creating a partition locks the parent
+    table). A no-op on SQLite or an unpartitioned table, and after the first call per
+    process usually without a query. Returns the partitions created.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return []
+    key = str(db.engine.url)
+    years = range(start.year, end.year + PARTITION_YEARS_AHEAD + 1)
+    known = _attached_years.get(key)
+    if known is False or (known and all(year in known for year in years)):
+        return []
+
+    created = []
+    with db.engine.begin() as connection:
+        if not _is_partitioned(connection):
+            _attached_years[key] = False
+            return []
+        known = _attached_partition_years(connection)
+        for year in years:
+            if year in known:
+                continue
+            connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(year)} PARTITION OF {HOURS_TABLE} "
+                f"FOR VALUES FROM ('{date(year, 1, 1).isoformat()}') TO ('{date(year + 1, 1, 1).isoformat()}')"
+            ))
+            known.add(year)
+            created.append(partition_name(year))
+    _attached_years[key] = known
+    return created
+
+def archived_partitions():
+    """Names of the daily_employee_hours partitions in ARCHIVE_SCHEMA, oldest first; always empty on SQLite."""
+    if db.engine.dialect.name != 'postgresql':
+        return []
+    names = db.session.execute(text(
+        "SELECT table_name FROM information_schema.tables WHERE table_schema = :schema"
+    ), {'schema': ARCHIVE_SCHEMA}).scalars()
+    return sorted(name for name in names if _PARTITION_NAME.match(name))
+
+def hours_source(include_archive=False):
+    """
+    What reports aggregate daily hours from: DailyEmployeeHours, or with include_archive
+    (and something archived) an alias of it over daily_employee_hours UNION ALL every
+    archived partition. Either way columns are reached as attributes, e.g. source.work_date.
+    """
+    archived = archived_partitions() if include_archive else []
+    if not archived:
+        return DailyEmployeeHours
+    hours_table = DailyEmployeeHours.__table__
+    selects = [db.select(*hours_table.columns)]
+    for name in archived:
+        archived_table = table(name, *[column(c.name) for c in hours_table.columns], schema=ARCHIVE_SCHEMA)
+        selects.append(db.select(*archived_table.columns))
+    return aliased(DailyEmployeeHours, union_all(*selects).subquery('all_daily_employee_hours'))
+
+
+@click.command('create-partitions')
+@click.option('--through', type=click.DateTime(formats=['%Y-%m-%d']), help='Last date to cover (default: today).')
+def create_partitions_command(through):
+    """
+    Creates the yearly daily_employee_hours partitions up to PARTITION_YEARS_AHEAD years
+    past --through. Week creation does this on demand; run it from a yearly job or after
+    a deploy so no save has to.
+    """
+    if not is_partitioned():
+        raise click.ClickException('daily_employee_hours is not partitioned (needs PostgreSQL and `flask db upgrade`); nothing to do.')
+    through = through.date() if through else date.today()
+    created = ensure_partitions(through, through)
+    print(f"Created {', '.join(created)}." if created else 'All partitions already exist.')
+
+@click.command('archive-hours')
+@click.option('--before', required=True, type=click.DateTime(formats=['%Y-%m-%d']),
+              help='Archive partitions holding only dates before this one.')
+def archive_hours_command(before):
+    """
+    Detaches every yearly daily_employee_hours partition that ends on or before --before
+    and moves it to the archive schema. Archived hours no longer appear in the hours grid
+    or in week totals recalculated afterwards; reports include them when called with
+    include_archive=true. To bring a year back:
+    ALTER TABLE archive.daily_employee_hours_yYYYY SET SCHEMA public, then
+    ALTER TABLE daily_employee_hours ATTACH PARTITION daily_employee_hours_yYYYY
+    FOR VALUES FROM ('YYYY-01-01') TO ('YYYY+1-01-01').
+    """
+    if not is_partitioned():
+        raise click.ClickException('daily_employee_hours is not partitioned (needs PostgreSQL and `flask db upgrade`); nothing to archive.')
+    before = before.date()
+    if before > date(date.today().year, 1, 1):
+        raise click.ClickException('--before must not be later than 1 January of the current year.')
+
+    with db.engine.connect() as connection:
+        years = sorted(year for year in _attached_partition_years(connection) if date(year + 1, 1, 1) <= before)
+    if not years:
+        print(f"No partitions end before {before}.")
+        return
+
+    for year in years:
+        name = partition_name(year)
+        with db.engine.begin() as connection: # One short transaction per partition
+            if connection.execute(text("SELECT to_regclass(:name)"), {'name': f"{ARCHIVE_SCHEMA}.{name}"}).scalar():
+                print(f"Skipped {name}: {ARCHIVE_SCHEMA}.{name} already exists.")
+                continue
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            connection.execute(text(f"ALTER TABLE {HOURS_TABLE} DETACH PARTITION {name}"))
+            connection.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            # Reports without include_archive change, so stored results must not be reused
+            increment_report_data_version(connection)
+        print(f"Archived {name} to {ARCHIVE_SCHEMA}.{name}.")
+    _attached_years.pop(str(db.engine.url), None)
@@ -0,0 +1,94 @@
+# pool_stats.py
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMonitor:
+    """
+    Counts connection pool activity for one engine: checkouts, new connections,
+    invalidations (e.g. pre-ping finding a connection the database dropped), how long
+    requests waited for a connection and how often the pool timed out. Per process.
+    """
+
+    def __init__(self):
+        self.engine = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def attach(self, engine):
+        # Pool events registered on the engine carry over to the new pool after engine.dispose()
+        self.engine = engine
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+        event.listen(engine, 'soft_invalidate', self._on_invalidate)
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.waits += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def stats(self):
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            result = {
+                'pool_class': type(pool).__name__ if pool is not None else None,
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'wait_ms_avg': round(self.total_wait / self.waits * 1000, 2) if self.waits else None,
+                'wait_ms_max': round(self.max_wait * 1000, 2) if self.waits else None,
+            }
+        if isinstance(pool, QueuePool):
+            result.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'max_overflow': pool._max_overflow,
+                'timeout_seconds': pool.timeout(),
+            })
+        return result
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+
+pool_monitor = PoolMonitor()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a free connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_monitor.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_monitor.record_wait(time.perf_counter() - start)
+        return connection
@@ -0,0 +1,154 @@
+# replay.py
+import glob
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from extensions import db
+from models import User
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def load_capture(patterns):
+    """Entries from capture files (globs allowed, rotated files included), oldest first."""
+    entries = []
+    for pattern in patterns:
+        paths = sorted(glob.glob(pattern)) or [pattern]
+        for path in paths:
+            with open(path) as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+    entries.sort(key=lambda entry: entry['ts'])
+    return entries
+
+def summarize(samples):
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 50), 1),
+        'p95_ms': round(percentile(samples, 95), 1),
+        'p99_ms': round(percentile(samples, 99), 1),
+    }
+
+def replay_entries(app, entries, user_id, speed, concurrency):
+    """
+    Sends each captured request through a test client logged in as user_id, at the
+    captured pace divided by speed (0 sends as fast as the pool allows). Returns
+    {endpoint: {'replayed': [ms...], 'captured': [ms...], 'status_mismatches': n}}.
+    """
+    local = threading.local()
+    results = {}
+    lock = threading.Lock()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+            with local.client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+        return local.client
+
+    def send(entry):
+        start = time.perf_counter()
+        response = client().open(entry['path'], method=entry['method'], query_string=entry['args'],
+                                 json=entry['json'] if entry['json'] is not None else None)
+        elapsed = (time.perf_counter() - start) * 1000
+        response.close()
+        with lock:
+            stats = results.setdefault(entry['endpoint'] or entry['path'], {'replayed': [], 'captured': [], 'status_mismatches': 0})
+            stats['replayed'].append(elapsed)
+            stats['captured'].append(entry['duration_ms'])
+            stats['status_mismatches'] += response.status_code != entry['status']
+
+    started = time.perf_counter()
+    first_ts = entries[0]['ts'] if entries else 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = []
+        for entry in entries:
+            if speed:
+                delay = (entry['ts'] - first_ts) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(pool.submit(send, entry))
+        for future in futures:
+            future.result()
+    return results
+
+def compare_runs(current, baseline, threshold):
+    """Prints the change per endpoint; returns how many endpoints regressed beyond threshold percent at p95."""
+    regressions = 0
+    for endpoint, stats in sorted(current.items()):
+        before = baseline.get(endpoint)
+        if not before:
+            click.echo(f"{endpoint:<50} (not in baseline)")
+            continue
+        changes = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            change = (stats[key] - before[key]) / before[key] * 100 if before[key] else 0
+            changes.append(f"{key[:3]} {before[key]:.1f}->{stats[key]:.1f}ms ({change:+.0f}%)")
+            if key == 'p95_ms' and change > threshold:
+                regressions += 1
+                changes.append('REGRESSION')
+        click.echo(f"{endpoint:<50} " + '  '.join(changes))
+    return regressions
+
+
+@click.command('replay')
+@click.argument('capture', nargs=-1, required=True)
+@click.option('--speed', default=1.0, show_default=True, help='Pace multiplier; 1 keeps the captured gaps, 0 sends as fast as possible.')
+@click.option('--concurrency', default=8, show_default=True, help='Requests in flight at once.')
+@click.option('--username', help='User to replay as (default: the first user).')
+@click.option('--skip-writes', is_flag=True, help='Only replay GET requests.')
+@click.option('--output', help='Write the latency summary to this JSON file.')
+@click.option('--compare', help='Summary JSON from another build to compare against.')
+@click.option('--threshold', default=20.0, show_default=True, help='Percent p95 slowdown counted as a regression.')
+@with_appcontext
+def replay_command(capture, speed, concurrency, username, skip_writes, output, compare, threshold):
+    """
+    Replays captured traffic (TRAFFIC_CAPTURE_FILE) against this build and database.
+
+    Captured ids are sent unchanged, so replay against a copy of the captured database
+    or one seeded identically (`flask seed-synthetic` with the same options on an empty
+    database). Saves are replayed too unless --skip-writes is given. To compare two
+    builds, replay the same capture with each and pass the first --output to --compare.
+    """
+    entries = load_capture(capture)
+    if skip_writes:
+        entries = [entry for entry in entries if entry['method'] == 'GET']
+    if not entries:
+        raise click.ClickException('The capture has no requests to replay.')
+    user = User.query.filter_by(username=username).first() if username else User.query.order_by(User.id).first()
+    if user is None:
+        raise click.ClickException('No user to replay as; create one with `flask create-user`.')
+    user_id = user.id
+    db.session.remove() # Replayed requests use their own sessions
+
+    click.echo(f"Replaying {len(entries)} requests at {'full' if not speed else f'{speed:g}x'} speed as {user.username}...")
+    started = time.perf_counter()
+    results = replay_entries(current_app._get_current_object(), entries, user_id, speed, concurrency)
+    click.echo(f"Done in {time.perf_counter() - started:.1f}s")
+
+    summary = {}
+    for endpoint, stats in sorted(results.items()):
+        summary[endpoint] = dict(summarize(stats['replayed']), status_mismatches=stats['status_mismatches'])
+        captured = summarize(stats['captured'])
+        click.echo(f"{endpoint:<50} n={summary[endpoint]['count']:<5} p50={summary[endpoint]['p50_ms']:.1f}ms "
+                   f"p95={summary[endpoint]['p95_ms']:.1f}ms p99={summary[endpoint]['p99_ms']:.1f}ms "
+                   f"(captured p95={captured['p95_ms']:.1f}ms) status mismatches={stats['status_mismatches']}")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(summary, f, indent=2)
+        click.echo(f"Wrote {output}")
+    if compare:
+        with open(compare) as f:
+            regressions = compare_runs(summary, json.load(f), threshold)
+        if regressions:
+            raise click.ClickException(f"{regressions} endpoint(s) regressed by more than {threshold:g}% at p95.")
@@ -0,0 +1,279 @@
+# report_jobs.py
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from flask import Blueprint, Response, current_app, g, jsonify, request, stream_with_context, url_for
+from flask_login import current_user, login_user
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from db_routing import replica_route
+from extensions import db, metrics
+from helpers import api_login_required
+from models import User, DataVersion, ReportJob
+
+bp = Blueprint('report_jobs', __name__)
+
+# Reports that can run as jobs: name -> (view endpoint, query parameters that change its output)
+JOB_REPORTS = {
+    'weekly-overview': ('reports.get_weekly_performance_overview', ()),
+    'monthly-work-area-hours': ('reports.get_monthly_work_area_hours_report', ('year', 'last_12_months', 'include_archive')),
+    'monthly-employee-hours': ('reports.get_monthly_employee_hours_report', ('year', 'last_12_months', 'include_archive')),
+    'monthly-company-actuals': ('reports.get_monthly_company_actuals_report', ('year', 'last_12_months')),
+    'productivity': ('reports.get_productivity_report', ('start_date', 'end_date', 'group_by', 'department', 'station')),
+    'finishing/cycle-times': ('reports.get_finishing_cycle_times_report', ('start_date', 'end_date', 'group_by', 'finish_type')),
+}
+_REPORT_BY_ENDPOINT = {endpoint: name for name, (endpoint, _) in JOB_REPORTS.items()}
+_FLAGS = ('last_12_months', 'include_archive') # Only 'true' means anything
+
+
+class ReportJobsBusy(Exception):
+    """Raised when REPORT_JOB_MAX_PENDING jobs are already queued or running in this process."""
+
+
+def normalize_params(report, params):
+    """The parameters the report reads, as strings without blanks, so equivalent requests compare equal."""
+    normalized = {
+        name: str(params[name]).strip() for name in JOB_REPORTS[report][1]
+        if params.get(name) is not None and str(params[name]).strip()
+    }
+    for flag in _FLAGS:
+        if flag in normalized and normalized.pop(flag).lower() == 'true':
+            normalized[flag] = 'true'
+    if 'last_12_months' in normalized:
+        normalized.pop('year', None) # Ignored by the reports then
+    return normalized
+
+def report_data_version():
+    return db.session.query(func.sum(DataVersion.version)).filter(DataVersion.name.like('reports:%')).scalar() or 0
+
+def cache_key(report, normalized, data_version):
+    # The day is part of the key: several reports default to windows ending today
+    payload = json.dumps([report, normalized, date.today().isoformat(), data_version], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def serve_stored_report():
+    """
+    before_request hook for the reports blueprint: answers a GET for a job-capable report
+    straight from a finished job with the same parameters and data version, if there is
+    one. Anything else falls through to the view.
+    """
+    report = _REPORT_BY_ENDPOINT.get(request.endpoint)
+    if report is None or request.method != 'GET' or not current_user.is_authenticated:
+        return None
+    key = cache_key(report, normalize_params(report, request.args), report_data_version())
+    stored = db.session.query(ReportJob.result).filter_by(cache_key=key, status='done').scalar()
+    if stored is None:
+        return None
+    metrics.inc('report_jobs_total', outcome='stored')
+    return Response(stored, mimetype='application/json')
+
+
+class ReportJobRunner:
+    """
+    Runs reports on a bounded thread pool of their own (REPORT_JOB_WORKERS per process),
+    so long reports never hold a request thread or hit the worker timeout (status
+    streams do hold one; see stream_report_job). Jobs and results live in report_jobs,
+    so any process can answer a status poll. At most
+    REPORT_JOB_MAX_PENDING jobs may be queued or running; beyond that ReportJobsBusy is
+    raised. A job left unfinished for REPORT_JOB_STALE_SECONDS (its process died) is
+    run again when requested again. The pool is only started on first use.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._init_lock = threading.Lock()
+
+    def _start(self, app):
+        with self._init_lock:
+            if self._executor is None:
+                self._slots = threading.BoundedSemaphore(app.config['REPORT_JOB_MAX_PENDING'])
+                self._executor = ThreadPoolExecutor(max_workers=app.config['REPORT_JOB_WORKERS'], thread_name_prefix='report-job')
+
+    def submit(self, report, params, user_id):
+        """
+        Returns the job for this report and these parameters at the current data version:
+        a finished one when stored, the one already queued or running, or a new one
+        queued for the pool. Reads go where GET reports would for this client.
+        """
+        app = current_app._get_current_object()
+        if self._executor is None:
+            self._start(app)
+        route = g._db_route = replica_route()
+        data_version = report_data_version() # Read where the job's report queries will read
+        g._db_route = None # The jobs themselves are looked up and written on the primary
+        normalized = normalize_params(report, params)
+        key = cache_key(report, normalized, data_version)
+
+        job = ReportJob.query.filter_by(cache_key=key).first()
+        stale_before = datetime.utcnow() - timedelta(seconds=app.config['REPORT_JOB_STALE_SECONDS'])
+        if job is not None and (job.status == 'done' or (job.status != 'failed' and (job.started_at or job.created_at) > stale_before)):
+            if job.status == 'done':
+                metrics.inc('report_jobs_total', outcome='stored')
+            return job
+
+        if not self._slots.acquire(blocking=False):
+            raise ReportJobsBusy()
+        try:
+            if job is None:
+                job = ReportJob(cache_key=key, report=report, params=json.dumps(normalized, sort_keys=True), data_version=data_version)
+                db.session.add(job)
+            job.status, job.result, job.error = 'queued', None, None
+            job.requested_by = user_id
+            job.created_at, job.started_at, job.finished_at = datetime.utcnow(), None, None
+            db.session.commit()
+        except IntegrityError:
+            # An identical request created the job a moment ago
+            db.session.rollback()
+            self._slots.release()
+            return ReportJob.query.filter_by(cache_key=key).one()
+        except Exception:
+            self._slots.release()
+            raise
+        self._executor.submit(self._run, app, job.report_job_id, route)
+        return job
+
+    def _run(self, app, job_id, route):
+        try:
+            with app.app_context():
+                job = db.session.get(ReportJob, job_id)
+                job.status, job.started_at = 'running', datetime.utcnow()
+                db.session.commit()
+                report, params, user_id = job.report, json.loads(job.params), job.requested_by
+            try:
+                status_code, body = self._execute(app, report, params, user_id, route)
+                error = None if status_code < 400 else (json.loads(body).get('message') or f"HTTP {status_code}")
+            except Exception as e:
+                print(f"Error running report job {job_id}: {e}")
+                body, error = None, str(e)
+            with app.app_context():
+                job = db.session.get(ReportJob, job_id)
+                job.status = 'failed' if error else 'done'
+                job.result, job.error, job.finished_at = (None if error else body), error, datetime.utcnow()
+                retention = timedelta(hours=app.config['REPORT_RESULT_RETENTION_HOURS'])
+                ReportJob.query.filter(ReportJob.finished_at < datetime.utcnow() - retention).delete(synchronize_session=False)
+                db.session.commit()
+                metrics.inc('report_jobs_total', outcome=job.status)
+        except Exception as e:
+            print(f"Error recording report job {job_id}: {e}")
+        finally:
+            self._slots.release()
+
+    def _execute(self, app, report, params, user_id, route):
+        """Calls the report's view as the requesting user, outside any request thread; returns (status, body)."""
+        with app.test_request_context(query_string=params):
+            g._db_route = route
+            user = db.session.get(User, user_id) if user_id else None
+            if user is not None:
+                login_user(user)
+            response = app.make_response(app.view_functions[JOB_REPORTS[report][0]]())
+            return response.status_code, response.get_data(as_text=True)
+
+
+job_runner = ReportJobRunner()
+
+
+def job_status(job):
+    status = job.to_dict()
+    status['status_url'] = url_for('report_jobs.get_report_job', job_id=job.report_job_id)
+    if job.status == 'done':
+        status['result_url'] = url_for('report_jobs.get_report_job_result', job_id=job.report_job_id)
+    return status
+
+
+@bp.route('/api/reports/jobs', methods=['POST'])
+@api_login_required
+def submit_report_job():
+    """
+    Starts a report in the background: {report, params}, params being the report's usual
+    query parameters. Answers 200 when an identical request is already stored (fetch
+    result_url), otherwise 202; then poll status_url or stream its /events.
+    """
+    data = request.get_json() or {}
+    report = data.get('report')
+    if report not in JOB_REPORTS:
+        return jsonify({'message': f"Unknown report. Choose one of: {', '.join(JOB_REPORTS)}."}), 400
+    if not isinstance(data.get('params', {}), dict):
+        return jsonify({'message': 'params must be an object.'}), 400
+    try:
+        job = job_runner.submit(report, data.get('params') or {}, current_user.id)
+    except ReportJobsBusy:
+        response = jsonify({'message': 'Too many reports are running. Please try again in a moment.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error submitting report job: {e}")
+        return jsonify({'message': 'An error occurred while starting the report.', 'details': str(e)}), 500
+    return jsonify(job_status(job)), 200 if job.status == 'done' else 202
+
+@bp.route('/api/reports/jobs/<int:job_id>', methods=['GET'])
+@api_login_required
+def get_report_job(job_id):
+    return jsonify(job_status(ReportJob.query.get_or_404(job_id)))
+
+@bp.route('/api/reports/jobs/<int:job_id>/result', methods=['GET'])
+@api_login_required
+def get_report_job_result(job_id):
+    job = ReportJob.query.get_or_404(job_id)
+    if job.status != 'done':
+        return jsonify({'message': f'The report is not ready (status: {job.status}).', 'status': job.status}), 409
+    return Response(job.result, mimetype='application/json')
+
+_stream_slots = None
+_stream_slots_lock = threading.Lock()
+
+def _stream_slot_semaphore(app):
+    """Per process: open status streams allowed, never all of the WEB_THREADS request threads."""
+    global _stream_slots
+    with _stream_slots_lock:
+        if _stream_slots is None:
+            _stream_slots = threading.BoundedSemaphore(max(0, min(app.config['REPORT_JOB_MAX_STREAMS'], app.config['WEB_THREADS'] - 1)))
+    return _stream_slots
+
+@bp.route('/api/reports/jobs/<int:job_id>/events', methods=['GET'])
+@api_login_required
+def stream_report_job(job_id):
+    """
+    Server-sent events with the job's status each time it changes, ending once it is done
+    or failed, or after REPORT_JOB_STREAM_SECONDS (EventSource then reconnects). A job
+    removed meanwhile ends the stream with an `event: gone`. Every open stream holds a
+    request thread, so at most REPORT_JOB_MAX_STREAMS are open per process; beyond that
+    the answer is 503 and clients should poll status_url instead.
+    """
+    ReportJob.query.get_or_404(job_id)
+    slots = _stream_slot_semaphore(current_app)
+    if not slots.acquire(blocking=False):
+        response = jsonify({'message': 'Too many status streams are open. Poll status_url instead.',
+                            'status_url': url_for('report_jobs.get_report_job', job_id=job_id)})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+    deadline = time.monotonic() + current_app.config['REPORT_JOB_STREAM_SECONDS']
+
+    def events():
+        last = None
+        while True:
+            job = db.session.get(ReportJob, job_id)
+            status = job_status(job) if job is not None else None
+            db.session.close() # Hand the connection back between checks
+            if status is None:
+                # Removed by another job's retention cleanup since the stream started
+                yield f"event: gone\ndata: {json.dumps({'job_id': job_id})}\n\n"
+                return
+            if status != last:
+                yield f"event: status\ndata: {json.dumps(status)}\n\n"
+                last = status
+            if status['status'] in ('done', 'failed') or time.monotonic() > deadline:
+                return
+            time.sleep(1)
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+    response.call_on_close(slots.release) # Also when the client goes away or the stream never started
+    return response
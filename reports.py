@@ -0,0 +1,598 @@
+# reports.py
+from datetime import date, datetime, timedelta
+
+from flask import Blueprint, request, jsonify, render_template, current_app
+from flask_login import login_required, current_user
+from sqlalchemy import func, extract
+
+from db_routing import route_reads_to_replica
+from extensions import db, metrics
+from helpers import api_login_required
+from models import (Employee, WorkArea, OverallProductionWeek, CalendarDay, ProductivityDailyRollup,
+                    FinishingWork, FinishingStageDailyStat, PRODUCTIVITY_METRICS, FINISH_STAGES, finishing_open_clause)
+from partitions import hours_source
+from report_jobs import serve_stored_report
+
+bp = Blueprint('reports', __name__)
+bp.before_request(route_reads_to_replica) # Report reads go to the read replica when one is configured
+bp.before_request(serve_stored_report) # Then answer from a stored background run when one matches
+
+
+@bp.route('/reports')
+@login_required
+def reports_page():
+    return render_template('reports.html')
+
+@bp.route('/monthly-work-area-hours-report')
+@login_required
+def monthly_work_area_hours_report_page():
+    return render_template('monthly_work_area_hours_report.html')
+
+def _hours_period_filters(hours, selected_year, last_12_months):
+    """
+    work_date conditions for the monthly hours reports: the last 12 full months, or one
+    calendar year. Filtering work_date itself (not the joined calendar day) lets
+    PostgreSQL skip the yearly partitions outside the period.
+    """
+    if last_12_months:
+        today = date.today()
+        start_date_12_months_ago = today.replace(day=1) - timedelta(days=365)
+        start_date_12_months_ago = start_date_12_months_ago.replace(day=1)
+        end_date_last_month = today.replace(day=1) - timedelta(days=1)
+        return [hours.work_date >= start_date_12_months_ago, hours.work_date <= end_date_last_month]
+    if selected_year:
+        return [hours.work_date.between(date(int(selected_year), 1, 1), date(int(selected_year), 12, 31))]
+    return []
+
+def _report_month_columns(date_column):
+    """
+    (year, month) a date reports in, from the calendar_days row outer-joined on it. Dates
+    calendar_days does not cover yet report in their own calendar month instead of
+    dropping out of the totals.
+    """
+    return (func.coalesce(extract('year', CalendarDay.fiscal_month), extract('year', date_column)).label('report_year'),
+            func.coalesce(extract('month', CalendarDay.fiscal_month), extract('month', date_column)).label('report_month'))
+
+# Reports API
+@bp.route('/api/reports/weekly-overview', methods=['GET'])
+@api_login_required
+def get_weekly_performance_overview():
+    weeks = OverallProductionWeek.query.order_by(OverallProductionWeek.reporting_week_start_date.desc()).all()
+
+    report_data = []
+    for week in weeks:
+        forecasted_dph = float(week.forecasted_dollars_per_hour) if week.forecasted_dollars_per_hour is not None else 0
+        actual_dph = float(week.actual_dollars_per_hour) if week.actual_dollars_per_hour is not None else 0
+        dph_variance = actual_dph - forecasted_dph
+        dph_variance_pct = (dph_variance / forecasted_dph * 100) if forecasted_dph != 0 else 0
+
+        forecasted_boxes = week.forecasted_boxes_built if week.forecasted_boxes_built is not None else 0
+        actual_boxes = week.actual_boxes_built if week.actual_boxes_built is not None else 0
+        boxes_variance = actual_boxes - forecasted_boxes
+        boxes_variance_pct = (boxes_variance / forecasted_boxes * 100) if forecasted_boxes != 0 else 0
+
+        forecasted_total_hrs = float(week.forecasted_total_production_hours) if week.forecasted_total_production_hours is not None else 0
+        actual_total_hrs = float(week.actual_total_production_hours) if week.actual_total_production_hours is not None else 0
+        total_hrs_variance = actual_total_hrs - forecasted_total_hrs
+        total_hrs_variance_pct = (total_hrs_variance / forecasted_total_hrs * 100) if forecasted_total_hrs != 0 else 0
+
+        report_data.append({
+            'overall_production_week_id': week.overall_production_week_id,
+            'reporting_week_start_date': week.reporting_week_start_date.isoformat(),
+            'reporting_week_end_date': week.reporting_week_end_date.isoformat(),
+
+            'forecasted_product_value': str(week.forecasted_product_value) if week.forecasted_product_value is not None else None,
+            'actual_product_value': str(week.actual_product_value) if week.actual_product_value is not None else None,
+
+            'forecasted_dollars_per_hour': str(week.forecasted_dollars_per_hour) if week.forecasted_dollars_per_hour is not None else None,
+            'actual_dollars_per_hour': str(week.actual_dollars_per_hour) if week.actual_dollars_per_hour is not None else None,
+            'dph_variance': f"{dph_variance:.2f}",
+            'dph_variance_pct': f"{dph_variance_pct:.2f}%",
+
+            'forecasted_boxes_built': week.forecasted_boxes_built,
+            'actual_boxes_built': week.actual_boxes_built,
+            'boxes_variance': boxes_variance,
+            'boxes_variance_pct': f"{boxes_variance_pct:.2f}%",
+
+            'forecasted_total_production_hours': str(week.forecasted_total_production_hours) if week.forecasted_total_production_hours is not None else None,
+            'actual_total_production_hours': str(week.actual_total_production_hours) if week.actual_total_production_hours is not None else None,
+            'total_hrs_variance': f"{total_hrs_variance:.2f}",
+            'total_hrs_variance_pct': f"{total_hrs_variance_pct:.2f}%",
+        })
+
+    return jsonify(report_data)
+
+@bp.route('/api/reports/monthly-work-area-hours', methods=['GET'])
+@api_login_required
+def get_monthly_work_area_hours_report():
+    selected_year = request.args.get('year')
+    last_12_months = request.args.get('last_12_months') == 'true'
+
+    try:
+        hours = hours_source(request.args.get('include_archive') == 'true')
+        report_year, report_month = _report_month_columns(hours.work_date)
+        query = db.session.query(
+            report_year,
+            report_month,
+            WorkArea.work_area_name,
+            func.sum(hours.forecasted_hours).label('total_forecasted_hours'),
+            func.sum(hours.actual_hours).label('total_actual_hours')
+        ).select_from(hours).join(WorkArea, WorkArea.work_area_id == hours.work_area_id).outerjoin(CalendarDay, CalendarDay.calendar_date == hours.work_date)
+        query = query.filter(*_hours_period_filters(hours, selected_year, last_12_months))
+
+        report_data = query.group_by(
+            report_year,
+            report_month,
+            WorkArea.work_area_name,
+            WorkArea.work_area_id
+        ).order_by(
+            WorkArea.display_order.asc(),
+            report_year.asc(),
+            report_month.asc()
+        ).all()
+
+        formatted_report = []
+        for row in report_data:
+            total_forecasted = float(row.total_forecasted_hours) if row.total_forecasted_hours is not None else 0.0
+            total_actual = float(row.total_actual_hours) if row.total_actual_hours is not None else 0.0
+
+            formatted_report.append({
+                'year': int(row.report_year),
+                'month': int(row.report_month),
+                'work_area_name': row.work_area_name,
+                'total_forecasted_hours': f"{total_forecasted:.2f}",
+                'total_actual_hours': f"{total_actual:.2f}",
+            })
+        
+        return jsonify(formatted_report), 200
+
+    except Exception as e:
+        print(f"Error generating monthly work area report: {e}")
+        return jsonify({'message': 'An error occurred while generating the report.', 'details': str(e)}), 500
+
+@bp.route('/api/reports/monthly-employee-hours', methods=['GET'])
+@api_login_required
+def get_monthly_employee_hours_report():
+    sort_by = request.args.get('sort_by', 'display_order') # Default sort by display_order
+    sort_direction = request.args.get('sort_direction', 'asc') # Default sort direction ascending
+    selected_year = request.args.get('year')
+    last_12_months = request.args.get('last_12_months') == 'true'
+
+    try:
+        hours = hours_source(request.args.get('include_archive') == 'true')
+
+        # Define base aggregations (forecasted_sum, actual_sum, etc. remain the same)
+        forecasted_sum = func.sum(hours.forecasted_hours)
+        actual_sum = func.sum(hours.actual_hours)
+        
+        # Explicitly cast sums to Float for calculations, handling potential NULLs
+        forecasted_sum_float = db.case((forecasted_sum.is_(None), 0.0), else_=forecasted_sum).cast(db.Float)
+        actual_sum_float = db.case((actual_sum.is_(None), 0.0), else_=actual_sum).cast(db.Float)
+        
+        variance_hours_sum = actual_sum_float - forecasted_sum_float
+        
+        # Safely calculate variance_pct_val for sorting, ensuring float type
+        variance_pct_val = db.case(
+            (forecasted_sum_float != 0, (variance_hours_sum * 100.0) / forecasted_sum_float),
+            (db.and_(forecasted_sum_float == 0, actual_sum_float == 0), 0.0),
+            (actual_sum_float > 0, 999999999.0), # Use large float literal for effectively +infinity
+            (actual_sum_float < 0, -999999999.0), # Use large float literal for effectively -infinity
+            else_=0.0
+        ).cast(db.Float)
+
+        # Select the aggregate expressions as labeled columns
+        report_year, report_month = _report_month_columns(hours.work_date)
+        query = db.session.query(
+            report_year,
+            report_month,
+            Employee.first_name,
+            Employee.last_initial,
+            Employee.display_order,
+            forecasted_sum.label('total_forecasted_hours'),
+            actual_sum.label('total_actual_hours'),
+            variance_hours_sum.label('total_variance_hours'),
+            variance_pct_val.label('total_variance_pct')
+        ).select_from(hours).join(Employee, Employee.employee_id == hours.employee_id).outerjoin(CalendarDay, CalendarDay.calendar_date == hours.work_date)
+        query = query.filter(*_hours_period_filters(hours, selected_year, last_12_months))
+
+
+        # Define sorting columns based on sort_by parameter
+        if sort_by == 'employee_name':
+            primary_order_exp = Employee.first_name
+            secondary_order_exp = Employee.last_initial
+        elif sort_by == 'forecasted_hours':
+            primary_order_exp = forecasted_sum_float
+            secondary_order_exp = Employee.display_order # Tie-breaker
+        elif sort_by == 'actual_hours':
+            primary_order_exp = actual_sum_float
+            secondary_order_exp = Employee.display_order # Tie-breaker
+        elif sort_by == 'variance':
+            primary_order_exp = variance_hours_sum
+            secondary_order_exp = Employee.display_order # Tie-breaker
+        elif sort_by == 'variance_pct':
+            primary_order_exp = variance_pct_val
+            secondary_order_exp = Employee.display_order # Tie-breaker
+        elif sort_by == 'display_order':
+            primary_order_exp = Employee.display_order
+            secondary_order_exp = Employee.employee_id # Tie-breaker for display_order itself
+        else: # Fallback for unknown sort_by, typically display_order
+            primary_order_exp = Employee.display_order
+            secondary_order_exp = Employee.employee_id
+            
+        # Apply sort direction and explicit NULL handling for numerical columns
+        ordering_columns = []
+        
+        # Primary Sort
+        if sort_direction == 'desc':
+            if sort_by in ['employee_name']: # Text sorting (employee_name)
+                ordering_columns.append(primary_order_exp.desc())
+            else: # Numerical sorts (forecasted_hours, actual_hours, variance, variance_pct, display_order)
+                # Nulls should typically go last in descending order for numerical sorts
+                ordering_columns.append(primary_order_exp.desc().nullslast())
+            
+            # Secondary Sort (Tie-breaker for Primary)
+            if secondary_order_exp is not None:
+                ordering_columns.append(secondary_order_exp.desc())
+            
+            # Month/Year sorting (descending for newest first, within employee)
+            ordering_columns.extend([report_year.desc(), report_month.desc()])
+
+        else: # asc
+            if sort_by in ['employee_name']: # Text sorting (employee_name)
+                ordering_columns.append(primary_order_exp.asc())
+            else: # Numerical sorts
+                # Nulls should typically go first in ascending order for numerical sorts
+                ordering_columns.append(primary_order_exp.asc().nullsfirst())
+            
+            # Secondary Sort (Tie-breaker for Primary)
+            if secondary_order_exp is not None:
+                ordering_columns.append(secondary_order_exp.asc())
+            
+            # Month/Year sorting (ascending for oldest first, within employee)
+            ordering_columns.extend([report_year.asc(), report_month.asc()])
+            
+        # --- CRITICAL FIX: Simplify backend ordering to a base order ---
+        report_data = query.group_by(
+            report_year,
+            report_month,
+            Employee.employee_id,
+            Employee.first_name,
+            Employee.last_initial,
+            Employee.display_order
+        ).order_by(
+            # Base order: Employee display order, then by year and month
+            Employee.display_order.asc(),
+            report_year.desc(), # Newest month first
+            report_month.desc()
+        ).all()
+        # --- END CRITICAL FIX ---
+
+        formatted_report = []
+        for row in report_data:
+            # Use the selected labels from the query
+            total_forecasted = float(row.total_forecasted_hours) if row.total_forecasted_hours is not None else 0.0
+            total_actual = float(row.total_actual_hours) if row.total_actual_hours is not None else 0.0
+            # Get variance values from the new selected labels
+            variance = float(row.total_variance_hours) if row.total_variance_hours is not None else 0.0
+            variance_pct = float(row.total_variance_pct) if row.total_variance_pct is not None else 0.0
+            
+            formatted_report.append({
+                'year': int(row.report_year),
+                'month': int(row.report_month),
+                'employee_name': f"{row.first_name} {row.last_initial}",
+                'total_forecasted_hours': f"{total_forecasted:.2f}",
+                'total_actual_hours': f"{total_actual:.2f}",
+                'variance': f"{variance:.2f}",
+                'variance_pct': f"{variance_pct:.2f}%",
+            })
+        
+        return jsonify(formatted_report), 200
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error generating monthly employee report: {e}")
+        return jsonify({'message': 'An error occurred while generating the report.', 'details': str(e)}), 500
+
+@bp.route('/api/reports/monthly-company-actuals', methods=['GET'])
+@api_login_required
+def get_monthly_company_actuals_report():
+    selected_year = request.args.get('year')
+    last_12_months = request.args.get('last_12_months') == 'true'
+
+    try:
+        report_year, report_month = _report_month_columns(OverallProductionWeek.reporting_week_start_date)
+        query = db.session.query(
+            report_year,
+            report_month,
+            func.sum(OverallProductionWeek.actual_product_value).label('total_actual_product_value'),
+            func.sum(OverallProductionWeek.actual_total_production_hours).label('total_actual_hours_sum'),
+            func.sum(OverallProductionWeek.actual_boxes_built).label('total_actual_boxes')
+        ).select_from(OverallProductionWeek).outerjoin(CalendarDay, CalendarDay.calendar_date == OverallProductionWeek.reporting_week_start_date)
+
+        if last_12_months:
+            today = date.today()
+            start_date_12_months_ago = today.replace(day=1) - timedelta(days=365)
+            start_date_12_months_ago = start_date_12_months_ago.replace(day=1)
+            end_date_last_month = today.replace(day=1) - timedelta(days=1)
+            query = query.filter(
+                OverallProductionWeek.reporting_week_start_date >= start_date_12_months_ago,
+                OverallProductionWeek.reporting_week_start_date <= end_date_last_month
+            )
+        elif selected_year:
+            query = query.filter(report_year == int(selected_year))
+
+        report_data = query.group_by(
+            report_year,
+            report_month
+        ).order_by(
+            report_year.asc(),
+            report_month.asc()
+        ).all()
+
+        formatted_report = []
+        for row in report_data:
+            total_product_value_sum = float(row.total_actual_product_value) if row.total_actual_product_value is not None else 0.0
+            total_hours_sum = float(row.total_actual_hours_sum) if row.total_actual_hours_sum is not None else 0.0
+            total_boxes = int(row.total_actual_boxes) if row.total_actual_boxes is not None else 0
+
+            calculated_dph = 0.0
+            if total_hours_sum > 0:
+                calculated_dph = round(total_product_value_sum / total_hours_sum, 2)
+
+            formatted_report.append({
+                'year': int(row.report_year),
+                'month': int(row.report_month),
+                'total_actual_dph': f"{calculated_dph:.2f}",
+                'total_actual_boxes': total_boxes,
+            })
+        
+        return jsonify(formatted_report), 200
+
+    except Exception as e:
+        print(f"Error generating monthly company actuals report: {e}")
+        return jsonify({'message': 'An error occurred while generating the company actuals report.', 'details': str(e)}), 500
+@bp.route('/api/reports/productivity', methods=['GET'])
+@api_login_required
+def get_productivity_report():
+    """
+    Units per labor hour by department and station over a date range, read from the
+    productivity_daily_rollups table. group_by=day (default) or month.
+    """
+    try:
+        end_date = date.fromisoformat(request.args['end_date']) if request.args.get('end_date') else date.today()
+        start_date = date.fromisoformat(request.args['start_date']) if request.args.get('start_date') else end_date - timedelta(days=365)
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use THAT-MM-DD.'}), 400
+    group_by = request.args.get('group_by', 'day')
+    if group_by not in ('day', 'month'):
+        return jsonify({'message': 'group_by must be day or month'}), 400
+    department = request.args.get('department')
+    station = request.args.get('station')
+
+    R = ProductivityDailyRollup
+    if group_by == 'month':
+        period_columns = [extract('year', R.rollup_date).label('year'), extract('month', R.rollup_date).label('month')]
+    else:
+        period_columns = [R.rollup_date.label('period')]
+
+    query = db.session.query(
+        *period_columns,
+        R.department,
+        R.station,
+        func.sum(R.summary_count).label('summary_count'),
+        func.sum(R.labor_hours).label('labor_hours'),
+        *[func.sum(getattr(R, metric)).label(metric) for metric in PRODUCTIVITY_METRICS]
+    ).filter(R.rollup_date.between(start_date, end_date))
+    if department:
+        query = query.filter(R.department == department)
+    if station is not None:
+        query = query.filter(R.station == station)
+
+    rows = query.group_by(*period_columns, R.department, R.station).order_by(*period_columns, R.department, R.station).all()
+
+    report = []
+    for row in rows:
+        labor_hours = float(row.labor_hours or 0)
+        outputs = {metric: getattr(row, metric) or 0 for metric in PRODUCTIVITY_METRICS}
+        report.append({
+            'period': f"{int(row.year)}-{int(row.month):02d}" if group_by == 'month' else row.period.isoformat(),
+            'department': row.department,
+            'station': row.station or None,
+            'summary_count': int(row.summary_count or 0),
+            'labor_hours': f"{labor_hours:.2f}",
+            'outputs': outputs,
+            'per_labor_hour': {
+                metric: round(float(value) / labor_hours, 2) if labor_hours else None
+                for metric, value in outputs.items()
+            }
+        })
+    return jsonify(report), 200
+
+@bp.route('/api/reports/finishing/cycle-times', methods=['GET'])
+@api_login_required
+def get_finishing_cycle_times_report():
+    """
+    Average time in stage and daily throughput per finish type and stage, summed from
+    the finishing_stage_daily_stats counters. group_by=stage (default) or day.
+    """
+    try:
+        end_date = date.fromisoformat(request.args['end_date']) if request.args.get('end_date') else date.today()
+        start_date = date.fromisoformat(request.args['start_date']) if request.args.get('start_date') else end_date - timedelta(days=90)
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use THAT-MM-DD.'}), 400
+    group_by = request.args.get('group_by', 'stage')
+    if group_by not in ('stage', 'day'):
+        return jsonify({'message': 'group_by must be stage or day'}), 400
+
+    S = FinishingStageDailyStat
+    group_columns = [S.finish_type, S.stage] if group_by == 'stage' else [S.stat_date, S.finish_type, S.stage]
+    query = db.session.query(
+        *group_columns,
+        func.sum(S.entered_count).label('entered'),
+        func.sum(S.exited_count).label('exited'),
+        func.sum(S.timed_exit_count).label('timed_exits'),
+        func.sum(S.total_seconds_in_stage).label('total_seconds')
+    ).filter(S.stat_date.between(start_date, end_date))
+    if request.args.get('finish_type'):
+        query = query.filter(S.finish_type == request.args['finish_type'])
+    rows = query.group_by(*group_columns).order_by(*group_columns).all()
+
+    stage_positions = {(ft, stage): index for ft, stages in FINISH_STAGES.items() for index, stage in enumerate(stages)}
+    days = (end_date - start_date).days + 1
+    report = []
+    for row in rows:
+        timed_exits = int(row.timed_exits or 0)
+        entry = {
+            'finish_type': row.finish_type,
+            'stage': row.stage,
+            'entered': int(row.entered or 0),
+            'exited': int(row.exited or 0),
+            'avg_hours_in_stage': round(float(row.total_seconds) / timed_exits / 3600, 2) if timed_exits else None
+        }
+        if group_by == 'day':
+            entry['date'] = row.stat_date.isoformat()
+        else:
+            entry['throughput_per_day'] = round(entry['exited'] / days, 2)
+        report.append(entry)
+    if group_by == 'stage':
+        report.sort(key=lambda r: (r['finish_type'], stage_positions.get((r['finish_type'], r['stage']), 99)))
+    return jsonify(report), 200
+
+@bp.route('/api/reports/finishing/wip-aging', methods=['GET'])
+@api_login_required
+def get_finishing_wip_aging_report():
+    """Open items per finish type and stage, bucketed by how long they have sat in their current stage."""
+    now = datetime.utcnow()
+    rows = db.session.query(
+        FinishingWork.finish_type, FinishingWork.stage, FinishingWork.stage_entered_at
+    ).filter(
+        finishing_open_clause(FinishingWork.stage, FinishingWork.status)
+    ).all()
+
+    buckets = [('under_1_day', 1), ('1_to_3_days', 3), ('3_to_7_days', 7), ('over_7_days', None)]
+    report = {}
+    for row in rows:
+        entry = report.setdefault((row.finish_type, row.stage), dict(
+            {name: 0 for name, _ in buckets},
+            finish_type=row.finish_type, stage=row.stage, open_items=0, unknown_age=0, oldest_days=None
+        ))
+        entry['open_items'] += 1
+        if row.stage_entered_at is None:
+            entry['unknown_age'] += 1 # Items that predate the event log
+            continue
+        age_days = (now - row.stage_entered_at).total_seconds() / 86400
+        for name, limit in buckets:
+            if limit is None or age_days < limit:
+                entry[name] += 1
+                break
+        entry['oldest_days'] = round(max(entry['oldest_days'] or 0, age_days), 1)
+
+    stage_positions = {(ft, stage): index for ft, stages in FINISH_STAGES.items() for index, stage in enumerate(stages)}
+    return jsonify(sorted(report.values(), key=lambda r: (r['finish_type'], stage_positions.get((r['finish_type'], r['stage']), 99)))), 200
+
+@bp.route('/api/reports/email-monthly-report', methods=['POST'])
+@api_login_required
+def email_chart_report():
+    data = request.get_json()
+    # OLD Way: recipient = data.get('recipient')
+    recipient = current_user.email
+
+    image_data_base64 = data.get('image_data') # Base64 string of the chart image
+    subject = data.get('subject', 'Monthly Report')
+    # --- NEW: Receive report summaries from frontend ---
+    work_area_summary_html = data.get('work_area_summary_html', '') # HTML string of the work area table
+    employee_summary_html = data.get('employee_summary_html', '') # HTML string of the employee table
+    # --- END NEW ---
+    # Add checks for missing data
+    if not recipient:
+        return jsonify({'message': 'Your account does not have an email address.'}), 400
+    if not image_data_base64:
+        return jsonify({'message': 'Missing image data'}), 400
+
+    # Mail modules are only loaded when a report is actually emailed
+    import base64
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.mime.image import MIMEImage
+    from email.utils import formataddr
+    config = current_app.config
+
+    try:
+        # Decode Base64 image data
+        header, encoded = image_data_base64.split(",", 1)
+        image_binary_data = base64.b64decode(encoded)
+
+        # --- NEW: Construct the email message (MIMEMultipart('related')) ---
+        # MIMEMultipart('related') allows embedding images in HTML
+        msg = MIMEMultipart('related')
+        msg['From'] = formataddr((config['SENDER_NAME'], config['SENDER_EMAIL']))
+        msg['To'] = recipient
+        msg['Subject'] = subject
+
+        # Create the HTML part of the email
+        html_body = f"""
+        <html>
+        <head></head>
+        <body style="font-family: 'Century Gothic', Arial, sans-serif;">
+            <p>Please find your Monthly Performance Report below.</p>
+            
+            <h3>Monthly Actual Hours by Work Area (Graph)</h3>
+            <img src="cid:chart_image" alt="Monthly Work Area Report Chart" style="max-width: 100%; height: auto; display: block; margin-bottom: 20px;">
+            
+            <h3>Report Details:</h3>
+            <div style="font-size: 14px; color: #333;">
+                <h4>Work Area Performance:</h4>
+                <div style="margin-bottom: 20px;">{work_area_summary_html}</div>
+                
+                <h4>Employee Performance:</h4>
+                <div>{employee_summary_html}</div>
+            </div>
+
+            <p>Regards,</p>
+            <p>Your Production App</p>
+        </body>
+        </html>
+        """
+        # Create a plain text fallback part
+        plain_text_body = """
+        Dear recipient,
+
+        Please find your Monthly Performance Report attached as an image.
+
+        --- Monthly Work Area Performance ---
+        (Table content could go here in plain text, but is complex to format)
+        --- Monthly Employee Performance ---
+        (Table content could go here in plain text)
+
+        Please view the email in an HTML-compatible client to see the full report.
+
+        Regards,
+        Your Production App
+        """
+
+        # Attach alternative content (plain text and HTML)
+        alt_msg = MIMEMultipart('alternative')
+        alt_msg.attach(MIMEText(plain_text_body, 'plain'))
+        alt_msg.attach(MIMEText(html_body, 'html'))
+        msg.attach(alt_msg)
+
+        # Attach the image (referenced by cid:chart_image in HTML)
+        image = MIMEImage(image_binary_data, name='monthly_report_chart.png')
+        image.add_header('Content-ID', '<chart_image>') # Link to cid:chart_image in HTML
+        msg.attach(image)
+        # --- END NEW EMAIL CONSTRUCTION ---
+
+        # Connect to SMTP server and send email
+        with smtplib.SMTP_SSL(config['SMTP_SERVER'], config['SMTP_PORT']) as server:
+            server.login(config['SMTP_USERNAME'], config['SMTP_PASSWORD'])
+            server.send_message(msg)
+
+        metrics.inc('emails_sent_total', outcome='sent')
+        return jsonify({'message': 'Email sent successfully!'}), 200
+
+    except Exception as e:
+        metrics.inc('emails_sent_total', outcome='failed')
+        print(f"Error sending email: {e}")
+        return jsonify({'message': f'Failed to send email: {str(e)}', 'details': str(e)}), 500
+
@@ -0,0 +1,196 @@
+# seed.py
+import random
+from datetime import date, timedelta
+
+import click
+from sqlalchemy import insert
+
+from extensions import db, dashboard_cache
+from helpers import get_monday_of_week, calculate_dollars_per_hour
+from models import (Employee, Position, WorkArea, Holiday, OverallProductionWeek, DailyEmployeeHours, Job,
+                    DailyShiftSummary)
+from partitions import ensure_partitions
+from shift import apply_job_progress, refresh_productivity_rollups
+from work_calendar import ensure_calendar
+
+INSERT_CHUNK = 1000 # Rows per executemany batch
+
+SYNTHETIC_POSITIONS = [('Operator', 7.5), ('Team Leader', 7.75), ('Assembler', 8.0), ('Finisher', 8.0), ('Material Handler', 8.0)]
+# name: (reporting_week_start_offset_days, contributing_duration_days, shift summary department, stations)
+SYNTHETIC_WORK_AREAS = {
+    'Cutting': (-1, 7, 'Cutting', ['MTR', 'CS43']),
+    'Edgebanding': (0, 7, 'Edgebanding', ['EB1', 'EB2']),
+    'Assembly': (0, 7, 'Assembly', ['Line 1', 'Line 2', 'Drawer Boxes']),
+    'Finishing': (0, 7, 'Finishing', ['Prep', 'Booth']),
+    'Shipping': (1, 7, 'Shipping', [None]),
+}
+SYNTHETIC_HOLIDAYS = [((1, 1), "New Year's Day"), ((7, 1), 'Canada Day'), ((12, 25), 'Christmas Day'), ((12, 26), 'Boxing Day')]
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn',
+               'Drew', 'Reese', 'Parker', 'Rowan', 'Emerson', 'Hayden', 'Kendall', 'Logan', 'Sawyer', 'Blake']
+
+
+def _insert_rows(model, rows):
+    for start in range(0, len(rows), INSERT_CHUNK):
+        db.session.execute(insert(model), rows[start:start + INSERT_CHUNK])
+
+def _summary_for(area_name, employee_id, job_id, day, rng):
+    department, stations = SYNTHETIC_WORK_AREAS[area_name][2:]
+    row = {column.key: None for column in DailyShiftSummary.__table__.columns if not column.primary_key}
+    row.update(summary_date=day, department=department, employee_id=employee_id, job_id=job_id,
+               station=rng.choice(stations), shift='Day')
+    if area_name == 'Cutting':
+        row['sheets_cut_mtr'] = rng.randint(10, 40)
+        row['mdf_doors_cut_cs43'] = rng.randint(0, 30)
+    elif area_name == 'Edgebanding':
+        row['edgebanding_ran'] = round(rng.uniform(200, 900), 1)
+        row['edgebanding_changeovers'] = rng.randint(0, 6)
+    elif area_name == 'Assembly':
+        row['boxes_built'] = rng.randint(5, 25)
+        row['drawer_boxes_built'] = rng.randint(0, 20)
+    elif area_name == 'Finishing':
+        row['boxes_prepped'] = rng.randint(5, 30)
+    else:
+        row['boxes_hung'] = rng.randint(0, 15)
+    return row
+
+def generate(employees=50, weeks=12, jobs=200, seed=1, today=None):
+    """
+    Adds a synthetic but internally consistent data set: positions, work areas, holidays,
+    `employees` employees, the last `weeks` production weeks with generated daily hours
+    (actuals filled in up to today) and shift summaries spread over `jobs` jobs. Weeks,
+    holidays and reference rows that already exist are left alone, so it can be run on
+    top of real data. The large tables are written with executemany INSERTs rather than
+    the ORM. Commits, and returns the number of rows added per table.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    counts = {}
+    first_monday = get_monday_of_week(today) - timedelta(weeks=weeks - 1)
+    ensure_partitions(first_monday - timedelta(weeks=1), today + timedelta(weeks=1)) # Before any write; see ensure_partitions
+
+    positions = {p.title: p for p in Position.query.all()}
+    for index, (title, default_hours) in enumerate(SYNTHETIC_POSITIONS):
+        if title not in positions:
+            positions[title] = Position(title=title, default_hours=default_hours, display_order=(index + 1) * 1000)
+            db.session.add(positions[title])
+    work_areas = {w.work_area_name: w for w in WorkArea.query.all()}
+    for index, (name, (offset, duration, _, _)) in enumerate(SYNTHETIC_WORK_AREAS.items()):
+        if name not in work_areas:
+            work_areas[name] = WorkArea(work_area_name=name, reporting_week_start_offset_days=offset,
+                                        contributing_duration_days=duration, display_order=(index + 1) * 1000)
+            db.session.add(work_areas[name])
+    db.session.flush()
+
+    existing_holidays = {h.holiday_date for h in Holiday.query.all()}
+    new_holidays = [
+        {'holiday_date': date(year, month, day), 'description': description}
+        for year in range(first_monday.year - 1, today.year + 2)
+        for (month, day), description in SYNTHETIC_HOLIDAYS
+        if date(year, month, day) not in existing_holidays
+    ]
+    _insert_rows(Holiday, new_holidays)
+    holiday_dates = existing_holidays | {h['holiday_date'] for h in new_holidays}
+    counts['holidays'] = len(new_holidays)
+
+    position_list = list(positions.values())
+    area_names = list(SYNTHETIC_WORK_AREAS)
+    next_order = (db.session.query(db.func.max(Employee.display_order)).filter(Employee.display_order < 999999).scalar() or 0) + 1000
+    employee_rows = []
+    for index in range(employees):
+        start = first_monday - timedelta(days=rng.randint(0, 3 * 365))
+        if rng.random() < 0.1: # Some hires start part-way through the range
+            start = first_monday + timedelta(days=rng.randint(0, max(weeks * 7 - 1, 0)))
+        end = start + timedelta(days=rng.randint(30, 3 * 365)) if rng.random() < 0.1 else None
+        employee_rows.append({
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_initial': chr(ord('A') + rng.randrange(26)),
+            'position_id': rng.choice(position_list).position_id,
+            'primary_work_area_id': work_areas[rng.choice(area_names)].work_area_id,
+            'display_order': next_order + index * 1000,
+            'employment_start_date': start,
+            'employment_end_date': end,
+        })
+    _insert_rows(Employee, employee_rows)
+    counts['employees'] = len(employee_rows)
+
+    tag_prefix = f"SYN-{seed}-{rng.randrange(16 ** 6):06x}"
+    job_rows = [{
+        'job_tag': f"{tag_prefix}-{index:05d}",
+        'num_sheets': rng.randint(20, 200),
+        'num_mdf_doors': rng.randint(0, 120),
+        'linear_meters_edgebanding': float(rng.randint(500, 4000)),
+        'num_drawer_boxes': rng.randint(0, 60),
+        'boxes_mcp': rng.randint(0, 40),
+        'boxes_pvc': rng.randint(0, 20),
+        'boxes_paint': rng.randint(0, 30),
+        'boxes_stain': rng.randint(0, 10),
+        'boxes_natural': 0,
+        'boxes_glaze': 0,
+    } for index in range(jobs)]
+    _insert_rows(Job, job_rows)
+    job_ids = [job_id for (job_id,) in db.session.query(Job.job_id).filter(Job.job_tag.like(f"{tag_prefix}-%"))]
+    counts['jobs'] = len(job_ids)
+
+    existing_weeks = {d for (d,) in db.session.query(OverallProductionWeek.reporting_week_start_date)}
+    week_starts = [first_monday + timedelta(weeks=i) for i in range(weeks)]
+    week_starts = [start for start in week_starts if start not in existing_weeks]
+    all_employees = Employee.query.options(db.joinedload(Employee.position_obj), db.joinedload(Employee.primary_work_area)).all()
+    area_by_id = {w.work_area_id: name for name, w in work_areas.items()}
+    hour_rows, summary_rows = [], []
+    counts['weeks'] = len(week_starts)
+    for week_start in week_starts:
+        week = OverallProductionWeek(reporting_week_start_date=week_start, reporting_week_end_date=week_start + timedelta(days=6),
+                                     forecasted_boxes_built=rng.randint(300, 600))
+        db.session.add(week)
+        db.session.flush()
+        forecast_total = actual_total = 0.0
+        for employee in all_employees:
+            work_area = employee.primary_work_area
+            contributing_start = week_start + timedelta(days=work_area.reporting_week_start_offset_days)
+            for offset in range(work_area.contributing_duration_days):
+                day = contributing_start + timedelta(days=offset)
+                active = employee.employment_start_date <= day and (employee.employment_end_date is None or day <= employee.employment_end_date)
+                forecast = float(employee.position_obj.default_hours) if active and day.weekday() < 5 and day not in holiday_dates else 0.0
+                actual = None
+                if day < today:
+                    actual = 0.0 if not forecast else max(0.0, round(forecast + rng.choice([0, 0, 0, -0.5, 0.5, 1.0, -forecast]), 2))
+                    actual_total += actual
+                hour_rows.append({'employee_id': employee.employee_id, 'work_area_id': work_area.work_area_id, 'work_date': day,
+                                  'forecasted_hours': forecast, 'actual_hours': actual,
+                                  'overall_production_week_id': week.overall_production_week_id})
+                forecast_total += forecast
+                area_name = area_by_id.get(work_area.work_area_id)
+                if actual and area_name and job_ids:
+                    summary_rows.append(_summary_for(area_name, employee.employee_id, rng.choice(job_ids), day, rng))
+        week.forecasted_total_production_hours = round(forecast_total, 2)
+        week.forecasted_product_value = round(forecast_total * rng.uniform(55, 75), 2)
+        if week_start + timedelta(days=6) < today:
+            week.actual_total_production_hours = round(actual_total, 2)
+            week.actual_product_value = round(actual_total * rng.uniform(50, 80), 2)
+            week.actual_boxes_built = rng.randint(250, 650)
+            week.actual_dollars_per_hour = calculate_dollars_per_hour(week.actual_product_value, actual_total)
+        week.forecasted_dollars_per_hour = calculate_dollars_per_hour(week.forecasted_product_value, forecast_total)
+    ensure_calendar(first_monday - timedelta(weeks=1), get_monday_of_week(today) + timedelta(weeks=1))
+    _insert_rows(DailyEmployeeHours, hour_rows)
+    _insert_rows(DailyShiftSummary, summary_rows)
+    counts['daily_hours'] = len(hour_rows)
+    counts['shift_summaries'] = len(summary_rows)
+
+    apply_job_progress(summary_rows)
+    summary_dates = sorted({row['summary_date'] for row in summary_rows})
+    for start in range(0, len(summary_dates), 31):
+        refresh_productivity_rollups(summary_dates[start:start + 31])
+    db.session.commit()
+    dashboard_cache.clear() # Core INSERTs bypass the mapper events that normally invalidate it
+    return counts
+
+
+@click.command('seed-synthetic')
+@click.option('--employees', default=50, show_default=True, help='Employees to add.')
+@click.option('--weeks', default=12, show_default=True, help='Production weeks to generate, ending with the current week.')
+@click.option('--jobs', default=200, show_default=True, help='Jobs to spread shift summaries over.')
+@click.option('--seed', default=1, show_default=True, help='Random seed; the same seed gives the same data.')
+def seed_synthetic_command(employees, weeks, jobs, seed):
+    """Fills the database with synthetic employees, weeks, hours and shift summaries for load testing."""
+    counts = generate(employees=employees, weeks=weeks, jobs=jobs, seed=seed)
+    print("Added " + ', '.join(f"{count} {table.replace('_', ' ')}" for table, count in counts.items()) + '.')
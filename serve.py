@@ -0,0 +1,93 @@
+# serve.py
+import signal
+
+import click
+from flask.cli import pass_script_info
+
+from extensions import db, password_verifier, metrics
+from health import server_state
+
+
+def gunicorn_options(config):
+    """Gunicorn settings derived from Config (see the WEB_* entries)."""
+    return {
+        'bind': config['WEB_BIND'],
+        'workers': config['WEB_WORKERS'],
+        'worker_class': 'gthread',
+        'threads': config['WEB_THREADS'],
+        'preload_app': True, # Import and build the app once in the master; workers fork from it
+        'timeout': config['WEB_TIMEOUT'],
+        'graceful_timeout': config['WEB_GRACEFUL_TIMEOUT'],
+        'keepalive': config['WEB_KEEPALIVE'],
+        'max_requests': config['WEB_MAX_REQUESTS'],
+        'max_requests_jitter': config['WEB_MAX_REQUESTS_JITTER'],
+        'accesslog': '-' if config['WEB_ACCESS_LOG'] else None,
+        'on_starting': on_starting,
+        'post_fork': post_fork,
+        'post_worker_init': post_worker_init,
+        'worker_exit': worker_exit,
+        'child_exit': child_exit,
+    }
+
+def on_starting(server):
+    # Metrics files from a previous run would otherwise be added to this run's totals
+    metrics.clear_directory()
+
+def post_fork(server, worker):
+    # Connections opened while preloading in the master must not be shared between workers
+    with server.app.flask_app.app_context():
+        db.engine.dispose(close=False)
+    metrics.reset()
+
+def post_worker_init(worker):
+    # Report not-ready as soon as shutdown starts, then let gunicorn stop accepting connections
+    stop_worker = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        server_state.start_draining()
+        stop_worker(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+def worker_exit(server, worker):
+    server_state.start_draining()
+    remaining = server_state.wait_for_writes(timeout=server.cfg.graceful_timeout)
+    if remaining:
+        print(f"Worker {worker.pid} exiting with {remaining} save(s) still in flight")
+    password_verifier.shutdown(wait=False)
+    metrics.mark_process_dead()
+
+def child_exit(server, worker):
+    # In the master: archives the metrics of a worker that died without running worker_exit
+    metrics.mark_process_dead(worker.pid)
+
+
+@click.command('serve')
+@click.option('--bind', help='Address to listen on, e.g. 0.0.0.0:8000 (default: WEB_BIND).')
+@click.option('--workers', type=int, help='Worker processes (default: WEB_WORKERS).')
+@click.option('--threads', type=int, help='Threads per worker (default: WEB_THREADS).')
+@pass_script_info
+def serve_command(info, bind, workers, threads):
+    """Runs the production server (gunicorn, preloaded, multi-worker and multi-thread)."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise click.ClickException("gunicorn is not installed. Run: pip install gunicorn")
+
+    app = info.load_app()
+    options = gunicorn_options(app.config)
+    for key, value in (('bind', bind), ('workers', workers), ('threads', threads)):
+        if value:
+            options[key] = value
+
+    class ProductionServer(BaseApplication):
+        flask_app = app
+
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    ProductionServer().run()
@@ -0,0 +1,744 @@
+# shift.py
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from flask import Blueprint, request, jsonify, render_template
+from flask_login import login_required
+from sqlalchemy import func, case, update, insert
+
+from db_routing import replica_reads
+from extensions import db
+from helpers import api_login_required, upsert_insert
+from models import (Employee, DailyEmployeeHours, Job, JobProgress, DailyShiftSummary, ProductivityDailyRollup,
+                    FinishingWork, FinishingStageEvent, FinishingStageDailyStat, JOB_PROGRESS_METRICS,
+                    PRODUCTIVITY_METRICS, FINISH_STAGES, FINISHING_STATUS_COMPLETE, finishing_open_clause)
+
+# cli_group=None keeps commands at the top level, e.g. `flask rebuild-job-progress`
+bp = Blueprint('shift', __name__, cli_group=None)
+
+
+@bp.cli.command("rebuild-job-progress")
+def rebuild_job_progress():
+    """Rebuilds job_progress for every job from shift summary history (run once after upgrading)."""
+    totals = {
+        row.job_id: row for row in db.session.query(
+            DailyShiftSummary.job_id,
+            func.count(DailyShiftSummary.summary_id).label('summary_count'),
+            func.max(DailyShiftSummary.summary_date).label('last_summary_date'),
+            *[func.sum(getattr(DailyShiftSummary, col)).label(col)
+              for _, summary_columns in JOB_PROGRESS_METRICS.values() for col in summary_columns]
+        ).filter(DailyShiftSummary.job_id.isnot(None)).group_by(DailyShiftSummary.job_id)
+    }
+    for job in Job.query.options(db.joinedload(Job.progress)).all():
+        progress = job.progress or JobProgress(job=job)
+        row = totals.get(job.job_id)
+        for metric, (_, summary_columns) in JOB_PROGRESS_METRICS.items():
+            setattr(progress, metric, sum((getattr(row, col) or 0) for col in summary_columns) if row else 0)
+        progress.summary_count = row.summary_count if row else 0
+        progress.last_summary_date = row.last_summary_date if row else None
+        progress.recalculate()
+        db.session.add(progress)
+    db.session.commit()
+    print(f"Rebuilt job progress for {Job.query.count()} jobs.")
+
+@bp.cli.command("rebuild-productivity-rollups")
+def rebuild_productivity_rollups():
+    """Rebuilds every productivity rollup from shift summary history (run once after upgrading)."""
+    summary_dates = {row[0] for row in db.session.query(DailyShiftSummary.summary_date).distinct()}
+    rollup_dates = {row[0] for row in db.session.query(ProductivityDailyRollup.rollup_date).distinct()}
+    all_dates = sorted(summary_dates | rollup_dates)
+    rebuilt = 0
+    for start in range(0, len(all_dates), 31):
+        rebuilt += refresh_productivity_rollups(all_dates[start:start + 31])
+        db.session.commit()
+    print(f"Rebuilt {rebuilt} productivity rollups across {len(all_dates)} days.")
+
+@bp.route('/jobs')
+@login_required
+def jobs_page():
+    return render_template('jobs.html')
+
+@bp.route('/daily-summary')
+@login_required
+def daily_summary_page():
+    return render_template('daily_summary.html')
+
+@bp.route('/finishing-wip')
+@login_required
+def finishing_wip_page():
+    return render_template('finishing_wip.html')
+
+# --- NEW API ENDPOINTS FOR SHIFT SUMMARIES ---
+JOBS_PAGE_SIZE = 100
+JOBS_MAX_PAGE_SIZE = 500
+JOBS_SEARCH_LIMIT = 20
+JOBS_SUBSTRING_MIN_LENGTH = 3 # Trigram matching needs at least 3 characters to use the index
+
+def page_limit(default):
+    """?limit= clamped to 1..JOBS_MAX_PAGE_SIZE."""
+    return max(1, min(request.args.get('limit', default, type=int), JOBS_MAX_PAGE_SIZE))
+
+@bp.route('/api/jobs', methods=['GET', 'POST'])
+@api_login_required
+def handle_jobs():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_job = Job(**data)
+        new_job.progress = JobProgress(sheets_cut=0, mdf_doors_cut=0, edgebanding_ran=0, drawer_boxes_built=0,
+                                       boxes_built=0, summary_count=0, completion_pct=0)
+        db.session.add(new_job)
+        db.session.commit()
+        return jsonify({'message': 'Job created successfully'}), 201
+    else:
+        # Keyset pagination, newest jobs first: pass the returned next_cursor back as ?cursor=
+        limit = page_limit(JOBS_PAGE_SIZE)
+        cursor = request.args.get('cursor', type=int)
+        query = Job.query
+        if cursor is not None:
+            query = query.filter(Job.job_id < cursor)
+        jobs = query.order_by(Job.job_id.desc()).limit(limit + 1).all()
+        next_cursor = jobs[limit - 1].job_id if len(jobs) > limit else None
+        return jsonify({
+            'jobs': [job.to_dict() for job in jobs[:limit]],
+            'next_cursor': next_cursor
+        })
+
+@bp.route('/api/jobs/search', methods=['GET'])
+@api_login_required
+@replica_reads
+def search_jobs():
+    """
+    Typeahead lookup on job_tag. Prefix matches come first (served by the
+    lower(job_tag) text_pattern_ops index on PostgreSQL), then substring matches
+    (served by the trigram index) fill the remaining slots. An empty query
+    returns the most recent jobs.
+    """
+    q = request.args.get('q', '').strip().lower()
+    limit = page_limit(JOBS_SEARCH_LIMIT)
+    lower_tag = func.lower(Job.job_tag)
+
+    if not q:
+        jobs = Job.query.order_by(Job.job_id.desc()).limit(limit).all()
+    else:
+        jobs = Job.query.filter(
+            lower_tag.startswith(q, autoescape=True)
+        ).order_by(lower_tag).limit(limit).all()
+        if len(jobs) < limit and len(q) >= JOBS_SUBSTRING_MIN_LENGTH:
+            jobs += Job.query.filter(
+                lower_tag.contains(q, autoescape=True),
+                ~lower_tag.startswith(q, autoescape=True)
+            ).order_by(lower_tag).limit(limit - len(jobs)).all()
+
+    return jsonify([{'job_id': job.job_id, 'job_tag': job.job_tag} for job in jobs])
+
+@bp.route('/api/jobs/progress', methods=['GET'])
+@api_login_required
+@replica_reads
+def get_jobs_progress():
+    """
+    Completed-vs-planned per job from the job_progress table, least complete first.
+    Finished jobs (100%) are left out unless include_complete=true.
+    """
+    include_complete = request.args.get('include_complete') == 'true'
+    limit = page_limit(JOBS_PAGE_SIZE)
+    query = JobProgress.query.options(db.joinedload(JobProgress.job))
+    if not include_complete:
+        query = query.filter(JobProgress.completion_pct < 100)
+    progress_rows = query.order_by(JobProgress.completion_pct.asc(), JobProgress.job_id.asc()).limit(limit).all()
+    return jsonify([progress.to_dict() for progress in progress_rows])
+
+@bp.route('/api/jobs/<int:job_id>', methods=['GET', 'PUT', 'DELETE'])
+@api_login_required
+def handle_job(job_id):
+    job = Job.query.get_or_404(job_id)
+    if request.method == 'GET':
+        return jsonify(job.to_dict())
+    elif request.method == 'PUT':
+        data = request.get_json()
+        for key, value in data.items():
+            setattr(job, key, value)
+        if job.progress:
+            job.progress.recalculate() # Planned quantities may have changed
+        db.session.commit()
+        return jsonify({'message': 'Job updated successfully'})
+    elif request.method == 'DELETE':
+        db.session.delete(job)
+        db.session.commit()
+        return jsonify({'message': 'Job deleted successfully'})
+
+# --- Shift summary validation and ingestion ---
+SHIFT_SUMMARY_REQUIRED_FIELDS = ['summary_date', 'department', 'employee_id']
+SHIFT_SUMMARY_INSERT_CHUNK = 500 # Rows per multi-row INSERT; keeps bind parameters under driver limits
+
+def shift_summary_columns():
+    return {col.key: col for col in DailyShiftSummary.__table__.columns if not col.primary_key}
+
+def coerce_shift_summary_value(col, value):
+    if value is None or (isinstance(value, str) and value.strip() == ''):
+        return None
+    if isinstance(col.type, db.Date):
+        return value if isinstance(value, date) else date.fromisoformat(str(value).strip())
+    if isinstance(col.type, db.Integer):
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError(f'{value!r} is not a whole number')
+        return int(number)
+    if isinstance(col.type, db.Float):
+        return float(value)
+    return str(value)
+
+def validate_shift_summary_rows(rows):
+    """
+    Validates raw shift summary dicts in one pass. Unknown columns, missing required
+    fields and bad values are reported per row; employee and job ids are checked with
+    one IN query each. Returns (valid_rows, errors) where errors is a list of
+    {'row': index, 'errors': [...]} for the rejected rows.
+    """
+    columns = shift_summary_columns()
+    coerced = []
+    errors = {}
+
+    for index, raw in enumerate(rows):
+        row_errors = []
+        if not isinstance(raw, dict):
+            errors[index] = ['Row must be an object']
+            coerced.append(None)
+            continue
+        unknown = sorted(set(raw) - set(columns))
+        if unknown:
+            row_errors.append(f"Unknown columns: {', '.join(unknown)}")
+        row = {}
+        for key, col in columns.items():
+            try:
+                row[key] = coerce_shift_summary_value(col, raw.get(key))
+            except (ValueError, TypeError) as e:
+                row_errors.append(f'{key}: {e}')
+        for field in SHIFT_SUMMARY_REQUIRED_FIELDS:
+            if row.get(field) is None and not any(err.startswith(f'{field}:') for err in row_errors):
+                row_errors.append(f'{field} is required')
+        if row_errors:
+            errors[index] = row_errors
+            coerced.append(None)
+        else:
+            coerced.append(row)
+
+    employee_ids = {row['employee_id'] for row in coerced if row}
+    job_ids = {row['job_id'] for row in coerced if row and row['job_id'] is not None}
+    known_employees = {emp_id for (emp_id,) in db.session.query(Employee.employee_id).filter(Employee.employee_id.in_(employee_ids))} if employee_ids else set()
+    known_jobs = {job_id for (job_id,) in db.session.query(Job.job_id).filter(Job.job_id.in_(job_ids))} if job_ids else set()
+
+    valid_rows = []
+    for index, row in enumerate(coerced):
+        if row is None:
+            continue
+        row_errors = []
+        if row['employee_id'] not in known_employees:
+            row_errors.append(f"Employee {row['employee_id']} not found")
+        if row['job_id'] is not None and row['job_id'] not in known_jobs:
+            row_errors.append(f"Job {row['job_id']} not found")
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            valid_rows.append(row)
+
+    return valid_rows, [{'row': index, 'errors': errors[index]} for index in sorted(errors)]
+
+def insert_shift_summaries(valid_rows):
+    """
+    Inserts validated rows with multi-row INSERT statements and refreshes the
+    derived tables for the affected days. The caller commits.
+    """
+    for start in range(0, len(valid_rows), SHIFT_SUMMARY_INSERT_CHUNK):
+        db.session.execute(insert(DailyShiftSummary.__table__).values(valid_rows[start:start + SHIFT_SUMMARY_INSERT_CHUNK]))
+    apply_job_progress(valid_rows)
+    refresh_productivity_rollups({row['summary_date'] for row in valid_rows})
+    return len(valid_rows)
+
+def apply_job_progress(valid_rows):
+    """
+    Adds freshly inserted shift summary rows to the job_progress totals. Progress
+    rows are locked (SELECT ... FOR UPDATE) so concurrent uploads for the same job
+    add up instead of overwriting each other. Missing rows are created first with
+    INSERT ... ON CONFLICT DO NOTHING, since there is nothing to lock until they
+    exist. The caller commits.
+    """
+    deltas = {}
+    for row in valid_rows:
+        if row.get('job_id') is None:
+            continue
+        delta = deltas.setdefault(row['job_id'], dict({metric: 0 for metric in JOB_PROGRESS_METRICS}, summary_count=0, last_summary_date=None))
+        for metric, (_, summary_columns) in JOB_PROGRESS_METRICS.items():
+            delta[metric] += sum(row.get(col) or 0 for col in summary_columns)
+        delta['summary_count'] += 1
+        if delta['last_summary_date'] is None or row['summary_date'] > delta['last_summary_date']:
+            delta['last_summary_date'] = row['summary_date']
+    if not deltas:
+        return 0
+
+    missing_ids = [job_id for (job_id,) in db.session.query(Job.job_id).outerjoin(JobProgress).filter(
+        Job.job_id.in_(list(deltas)), JobProgress.job_id.is_(None)
+    )]
+    if missing_ids: # Jobs created before job_progress existed; a concurrent upload may be creating the same rows
+        db.session.execute(upsert_insert(JobProgress.__table__).values([
+            dict(job_id=job_id, sheets_cut=0, mdf_doors_cut=0, edgebanding_ran=0, drawer_boxes_built=0,
+                 boxes_built=0, summary_count=0, completion_pct=0) for job_id in missing_ids
+        ]).on_conflict_do_nothing(index_elements=['job_id']))
+
+    progress_rows = {p.job_id: p for p in JobProgress.query.filter(JobProgress.job_id.in_(list(deltas))).with_for_update()}
+    for job_id, delta in deltas.items():
+        progress = progress_rows.get(job_id)
+        if progress is None: # No such job
+            continue
+        for metric in JOB_PROGRESS_METRICS:
+            setattr(progress, metric, getattr(progress, metric) + delta[metric])
+        progress.summary_count += delta['summary_count']
+        if progress.last_summary_date is None or delta['last_summary_date'] > progress.last_summary_date:
+            progress.last_summary_date = delta['last_summary_date']
+        progress.recalculate()
+    return len(deltas)
+
+def refresh_productivity_rollups(dates):
+    """
+    Recomputes the productivity rollup rows for the given dates from that day's shift
+    summaries and actual hours. Each employee's actual hours for a day are split evenly
+    across the department/station slots they reported output for; hours of employees
+    with no summary that day are not attributed. The caller commits.
+    """
+    dates = sorted({d for d in dates if d is not None})
+    if not dates:
+        return 0
+
+    summaries = db.session.query(
+        DailyShiftSummary.summary_date,
+        DailyShiftSummary.employee_id,
+        DailyShiftSummary.department,
+        DailyShiftSummary.station,
+        *[getattr(DailyShiftSummary, metric) for metric in PRODUCTIVITY_METRICS]
+    ).filter(DailyShiftSummary.summary_date.in_(dates)).all()
+
+    employee_hours = {
+        (row.work_date, row.employee_id): float(row.hours or 0)
+        for row in db.session.query(
+            DailyEmployeeHours.work_date,
+            DailyEmployeeHours.employee_id,
+            func.sum(DailyEmployeeHours.actual_hours).label('hours')
+        ).filter(
+            DailyEmployeeHours.work_date.in_(dates),
+            DailyEmployeeHours.actual_hours.isnot(None)
+        ).group_by(DailyEmployeeHours.work_date, DailyEmployeeHours.employee_id)
+    }
+
+    rollups = {}
+    employee_slots = {}
+    for row in summaries:
+        key = (row.summary_date, row.department, row.station or '')
+        rollup = rollups.setdefault(key, dict(
+            {metric: 0 for metric in PRODUCTIVITY_METRICS},
+            rollup_date=key[0], department=key[1], station=key[2], summary_count=0, labor_hours=0.0
+        ))
+        rollup['summary_count'] += 1
+        for metric in PRODUCTIVITY_METRICS:
+            rollup[metric] += getattr(row, metric) or 0
+        employee_slots.setdefault((row.summary_date, row.employee_id), set()).add(key)
+
+    for (work_date, employee_id), slots in employee_slots.items():
+        hours = employee_hours.get((work_date, employee_id), 0.0)
+        for key in slots:
+            rollups[key]['labor_hours'] += hours / len(slots)
+    for rollup in rollups.values():
+        rollup['labor_hours'] = round(rollup['labor_hours'], 2)
+
+    db.session.execute(db.delete(ProductivityDailyRollup).where(ProductivityDailyRollup.rollup_date.in_(dates)))
+    if rollups:
+        db.session.execute(insert(ProductivityDailyRollup.__table__).values(list(rollups.values())))
+    return len(rollups)
+
+def parse_shift_summary_upload():
+    """Reads rows from a JSON array, NDJSON or CSV request body (or a CSV/NDJSON file upload)."""
+    upload = request.files.get('file')
+    if upload:
+        text = upload.read().decode('utf-8-sig')
+        fmt = 'ndjson' if upload.filename.lower().endswith(('.ndjson', '.jsonl')) else 'csv'
+    else:
+        text = request.get_data(as_text=True)
+        mimetype = request.mimetype
+        fmt = 'csv' if mimetype == 'text/csv' else 'ndjson' if mimetype in ('application/x-ndjson', 'application/ndjson') else 'json'
+
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(text)))
+    if fmt == 'ndjson':
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    rows = json.loads(text)
+    if not isinstance(rows, list):
+        raise ValueError('Expected a JSON array of shift summaries')
+    return rows
+
+@bp.route('/api/daily_shift_summary', methods=['POST'])
+@api_login_required
+def add_daily_shift_summary():
+    data = request.get_json()
+    valid_rows, errors = validate_shift_summary_rows([data])
+    if errors:
+        return jsonify({'message': 'Invalid shift summary', 'errors': errors[0]['errors']}), 400
+    try:
+        insert_shift_summaries(valid_rows)
+        db.session.commit()
+        return jsonify({'message': 'Daily shift summary added successfully'}), 201
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error adding daily shift summary: {e}")
+        return jsonify({'message': 'Failed to add shift summary.', 'details': str(e)}), 500
+
+@bp.route('/api/daily_shift_summary/bulk', methods=['POST'])
+@api_login_required
+def bulk_add_daily_shift_summaries():
+    """
+    End-of-shift upload: a JSON array, NDJSON or CSV of shift summaries.
+    Valid rows are inserted even when others are rejected; rejected rows are
+    returned with their index and errors.
+    """
+    try:
+        rows = parse_shift_summary_upload()
+    except (ValueError, csv.Error) as e:
+        return jsonify({'message': f'Could not parse upload: {e}'}), 400
+    if not rows:
+        return jsonify({'message': 'No shift summaries provided'}), 400
+
+    valid_rows, errors = validate_shift_summary_rows(rows)
+    try:
+        inserted = insert_shift_summaries(valid_rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error during bulk shift summary insert: {e}")
+        return jsonify({'message': 'An error occurred while saving shift summaries.', 'details': str(e)}), 500
+
+    if not inserted:
+        status_code = 400
+    elif errors:
+        status_code = 207 # Partial success
+    else:
+        status_code = 201
+    return jsonify({
+        'message': f'{inserted} of {len(rows)} shift summaries added',
+        'inserted': inserted,
+        'rejected': len(errors),
+        'errors': errors
+    }), status_code
+
+# --- Finishing stage event log ---
+def record_finishing_events(changes, now):
+    """
+    Appends one FinishingStageEvent per change and folds it into the daily stage
+    counters. Each change is a dict with finishing_id, finish_type, from_stage,
+    from_status, to_stage, to_status, employee_id and stage_entered_at (the entry
+    time of from_stage, before the change). The caller commits.
+    """
+    events = []
+    stat_deltas = {}
+
+    def bump(stage_key, field, amount=1):
+        delta = stat_deltas.setdefault(stage_key, {'entered_count': 0, 'exited_count': 0, 'timed_exit_count': 0, 'total_seconds_in_stage': 0.0})
+        delta[field] += amount
+
+    for change in changes:
+        stages = FINISH_STAGES.get(change['finish_type'], [])
+        from_stage, to_stage = change['from_stage'], change['to_stage']
+        finished_final_stage = (
+            to_stage == from_stage and stages and to_stage == stages[-1] and
+            change['to_status'] == FINISHING_STATUS_COMPLETE and change['from_status'] != FINISHING_STATUS_COMPLETE
+        )
+        left_stage = from_stage is not None and (from_stage != to_stage or finished_final_stage)
+        seconds = None
+        if left_stage and change['stage_entered_at'] is not None:
+            seconds = max((now - change['stage_entered_at']).total_seconds(), 0.0)
+
+        events.append({
+            'finishing_id': change['finishing_id'],
+            'finish_type': change['finish_type'],
+            'from_stage': from_stage,
+            'from_status': change['from_status'],
+            'to_stage': to_stage,
+            'to_status': change['to_status'],
+            'employee_id': change['employee_id'],
+            'seconds_in_stage': seconds,
+            'occurred_at': now
+        })
+        if left_stage:
+            bump((now.date(), change['finish_type'], from_stage), 'exited_count')
+            if seconds is not None:
+                bump((now.date(), change['finish_type'], from_stage), 'timed_exit_count')
+                bump((now.date(), change['finish_type'], from_stage), 'total_seconds_in_stage', seconds)
+        if from_stage != to_stage:
+            bump((now.date(), change['finish_type'], to_stage), 'entered_count')
+
+    if not events:
+        return 0
+    db.session.execute(insert(FinishingStageEvent.__table__).values(events))
+
+    if stat_deltas:
+        # One upsert adds to the day's counters, creating them if needed; concurrent changes add up
+        stats = FinishingStageDailyStat.__table__
+        stmt = upsert_insert(stats).values([
+            dict(delta, stat_date=key[0], finish_type=key[1], stage=key[2]) for key, delta in stat_deltas.items()
+        ])
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[stats.c.stat_date, stats.c.finish_type, stats.c.stage],
+            set_={field: stats.c[field] + stmt.excluded[field]
+                  for field in ('entered_count', 'exited_count', 'timed_exit_count', 'total_seconds_in_stage')}
+        ))
+    return len(events)
+
+def finishing_change(item, from_stage, from_status, stage_entered_at):
+    return {
+        'finishing_id': item.finishing_id,
+        'finish_type': item.finish_type,
+        'from_stage': from_stage,
+        'from_status': from_status,
+        'to_stage': item.stage,
+        'to_status': item.status,
+        'employee_id': item.employee_id,
+        'stage_entered_at': stage_entered_at
+    }
+
+@bp.route('/api/finishing_work', methods=['GET', 'POST'])
+@api_login_required
+def handle_finishing_work():
+    if request.method == 'POST':
+        data = request.get_json()
+        now = datetime.utcnow()
+        new_work = FinishingWork(**data)
+        new_work.stage_entered_at = now
+        db.session.add(new_work)
+        db.session.flush() # Assigns finishing_id for the event log
+        record_finishing_events([finishing_change(new_work, None, None, None)], now)
+        db.session.commit()
+        return jsonify({'message': 'Finishing work created successfully'}), 201
+    else:
+        work_items = FinishingWork.query.all()
+        return jsonify([item.to_dict() for item in work_items])
+
+@bp.route('/api/finishing_work/board', methods=['GET'])
+@api_login_required
+def get_finishing_board():
+    """
+    Open finishing items grouped by finish_type x stage x status, with counts.
+    Built from one joined query over the ix_finishing_work_open partial index, so
+    its cost depends on work in progress rather than on finished history.
+    """
+    rows = db.session.query(
+        FinishingWork.finishing_id,
+        FinishingWork.job_id,
+        Job.job_tag,
+        FinishingWork.manual_part_name,
+        FinishingWork.finish_type,
+        FinishingWork.stage,
+        FinishingWork.status,
+        FinishingWork.employee_id,
+        Employee.first_name,
+        Employee.last_initial,
+        FinishingWork.batch_number
+    ).outerjoin(Job, FinishingWork.job_id == Job.job_id
+    ).outerjoin(Employee, FinishingWork.employee_id == Employee.employee_id
+    ).filter(
+        finishing_open_clause(FinishingWork.stage, FinishingWork.status)
+    ).order_by(
+        FinishingWork.finish_type, FinishingWork.stage, FinishingWork.status, Job.job_tag, FinishingWork.finishing_id
+    ).all()
+
+    groups = {}
+    for row in rows:
+        key = (row.finish_type, row.stage, row.status)
+        group = groups.setdefault(key, {
+            'finish_type': row.finish_type,
+            'stage': row.stage,
+            'status': row.status,
+            'count': 0,
+            'items': []
+        })
+        group['count'] += 1
+        group['items'].append({
+            'finishing_id': row.finishing_id,
+            'job_id': row.job_id,
+            'job_tag': row.job_tag,
+            'manual_part_name': row.manual_part_name,
+            'employee_id': row.employee_id,
+            'employee_name': f"{row.first_name} {row.last_initial}" if row.employee_id else None,
+            'batch_number': row.batch_number
+        })
+
+    return jsonify({
+        'finish_stages': FINISH_STAGES,
+        'total_open': len(rows),
+        'groups': list(groups.values())
+    })
+
+def parse_advance_options(data):
+    """completed_date and employee_id of an advance request, or an error response."""
+    try:
+        completed_date = date.fromisoformat(data['completed_date']) if data.get('completed_date') else date.today()
+    except ValueError:
+        return None, None, (jsonify({'message': 'Invalid completed_date format. Use THAT-MM-DD.'}), 400)
+    employee_id = data.get('employee_id')
+    if employee_id is not None and not Employee.query.get(employee_id):
+        return None, None, (jsonify({'message': f'Employee {employee_id} not found'}), 400)
+    return completed_date, employee_id, None
+
+def advance_finishing_items(selection, completed_date, employee_id, from_stage=None):
+    """
+    Completes the current stage of every item matching selection in one UPDATE: each
+    moves to the next stage of its finish type (status 'In Progress'), and items on
+    their final stage are marked Complete. Nothing is written unless every item can
+    make the transition. Returns the response for the advance endpoints.
+    """
+    items = db.session.query(
+        FinishingWork.finishing_id, FinishingWork.finish_type, FinishingWork.stage, FinishingWork.status,
+        FinishingWork.stage_entered_at
+    ).filter(selection).all()
+    if not items:
+        return jsonify({'message': 'No finishing work found for this selection'}), 404
+
+    errors = []
+    transitions = {} # (finish_type, stage) -> next stage, or None when the final stage completes
+    for item in items:
+        stages = FINISH_STAGES.get(item.finish_type)
+        if not stages or item.stage not in stages:
+            errors.append({'finishing_id': item.finishing_id, 'message': f'Unknown stage {item.stage} for finish type {item.finish_type}'})
+        elif from_stage and item.stage != from_stage:
+            errors.append({'finishing_id': item.finishing_id, 'message': f'Item is at {item.stage}, not {from_stage}'})
+        elif item.stage == stages[-1] and item.status == FINISHING_STATUS_COMPLETE:
+            errors.append({'finishing_id': item.finishing_id, 'message': 'Item has already finished its last stage'})
+        else:
+            stage_index = stages.index(item.stage)
+            transitions[(item.finish_type, item.stage)] = stages[stage_index + 1] if stage_index + 1 < len(stages) else None
+    if errors:
+        return jsonify({'message': 'Some items cannot be advanced. Nothing was changed.', 'errors': errors}), 409
+
+    def at_stage(finish_type, stage):
+        return db.and_(FinishingWork.finish_type == finish_type, FinishingWork.stage == stage)
+
+    stage_whens = [(at_stage(ft, st), new_stage) for (ft, st), new_stage in transitions.items() if new_stage is not None]
+    final_whens = [(at_stage(ft, st), FINISHING_STATUS_COMPLETE) for (ft, st), new_stage in transitions.items() if new_stage is None]
+    next_stage = case(*stage_whens, else_=FinishingWork.stage) if stage_whens else FinishingWork.stage
+    next_status = case(*final_whens, else_='In Progress') if final_whens else 'In Progress'
+
+    now = datetime.utcnow()
+    next_entered_at = case(*[(cond, now) for cond, _ in stage_whens], else_=FinishingWork.stage_entered_at) if stage_whens else FinishingWork.stage_entered_at
+
+    item_ids = [item.finishing_id for item in items]
+    try:
+        # Each item must still be at the stage and status read above, so a concurrent move of any
+        # of them fails the rowcount check instead of skipping a stage or logging a wrong event
+        updated = db.session.execute(
+            update(FinishingWork.__table__).where(
+                FinishingWork.finishing_id.in_(item_ids),
+                db.or_(*[db.and_(
+                    FinishingWork.finishing_id == item.finishing_id,
+                    FinishingWork.stage == item.stage,
+                    FinishingWork.status == item.status
+                ) for item in items]),
+                finishing_open_clause(FinishingWork.stage, FinishingWork.status)
+            ).values(
+                stage=next_stage,
+                status=next_status,
+                stage_completed_date=completed_date,
+                employee_id=employee_id,
+                stage_entered_at=next_entered_at
+            )
+        ).rowcount
+        if updated != len(item_ids):
+            db.session.rollback()
+            return jsonify({'message': 'Some items changed while advancing. Nothing was changed; reload and try again.'}), 409
+        record_finishing_events([{
+            'finishing_id': item.finishing_id,
+            'finish_type': item.finish_type,
+            'from_stage': item.stage,
+            'from_status': item.status,
+            'to_stage': transitions[(item.finish_type, item.stage)] or item.stage,
+            'to_status': 'In Progress' if transitions[(item.finish_type, item.stage)] else FINISHING_STATUS_COMPLETE,
+            'employee_id': employee_id,
+            'stage_entered_at': item.stage_entered_at
+        } for item in items], now)
+        db.session.commit()
+        return jsonify({'message': f'{updated} finishing items advanced successfully', 'advanced': updated}), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error advancing finishing work: {e}")
+        return jsonify({'message': 'An error occurred while advancing finishing work.', 'details': str(e)}), 500
+
+@bp.route('/api/finishing_work/advance', methods=['POST'])
+@api_login_required
+def advance_finishing_work():
+    """
+    Completes the current stage for a whole batch (batch_number) or an explicit
+    finishing_ids list; see advance_finishing_items. The completion date and employee
+    are recorded on every item. Unknown finishing_ids answer 404 and list the ids.
+    """
+    data = request.get_json() or {}
+    batch_number = data.get('batch_number')
+    finishing_ids = data.get('finishing_ids')
+
+    if not batch_number and not finishing_ids:
+        return jsonify({'message': 'Provide a batch_number or a list of finishing_ids'}), 400
+    if finishing_ids is not None and (not isinstance(finishing_ids, list) or
+                                      not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in finishing_ids)):
+        return jsonify({'message': 'finishing_ids must be a list of integers'}), 400
+    completed_date, employee_id, error = parse_advance_options(data)
+    if error:
+        return error
+
+    if batch_number:
+        # Parts of the batch that already finished are left out rather than blocking the rest
+        selection = db.and_(
+            FinishingWork.batch_number == batch_number,
+            finishing_open_clause(FinishingWork.stage, FinishingWork.status)
+        )
+    else:
+        found = {pk for (pk,) in db.session.query(FinishingWork.finishing_id).filter(FinishingWork.finishing_id.in_(finishing_ids))}
+        unknown_ids = sorted(set(finishing_ids) - found)
+        if unknown_ids:
+            return jsonify({'message': 'Some finishing items do not exist. Nothing was changed.', 'unknown_ids': unknown_ids}), 404
+        selection = FinishingWork.finishing_id.in_(finishing_ids)
+    return advance_finishing_items(selection, completed_date, employee_id, data.get('from_stage'))
+
+@bp.route('/api/finishing_work/<int:finishing_id>/advance', methods=['POST'])
+@api_login_required
+def advance_finishing_item(finishing_id):
+    """Completes one item's current stage, batch or not; the body takes the same options as /advance."""
+    FinishingWork.query.get_or_404(finishing_id)
+    data = request.get_json(silent=True) or {}
+    completed_date, employee_id, error = parse_advance_options(data)
+    if error:
+        return error
+    return advance_finishing_items(FinishingWork.finishing_id == finishing_id, completed_date, employee_id, data.get('from_stage'))
+
+@bp.route('/api/finishing_work/<int:finishing_id>/events', methods=['GET'])
+@api_login_required
+def get_finishing_work_events(finishing_id):
+    FinishingWork.query.get_or_404(finishing_id)
+    events = FinishingStageEvent.query.filter_by(finishing_id=finishing_id).order_by(FinishingStageEvent.occurred_at, FinishingStageEvent.event_id).all()
+    return jsonify([event.to_dict() for event in events])
+
+@bp.route('/api/finishing_work/<int:finishing_id>', methods=['PUT'])
+@api_login_required
+def update_finishing_work(finishing_id):
+    work_item = FinishingWork.query.get_or_404(finishing_id)
+    data = request.get_json()
+    stages = FINISH_STAGES.get(work_item.finish_type, [])
+    if 'stage' in data and data['stage'] not in stages:
+        return jsonify({'message': f"Unknown stage {data['stage']} for finish type {work_item.finish_type}. Choose one of: {', '.join(stages)}."}), 400
+    now = datetime.utcnow()
+    from_stage, from_status, stage_entered_at = work_item.stage, work_item.status, work_item.stage_entered_at
+    work_item.stage = data.get('stage', work_item.stage)
+    work_item.status = data.get('status', work_item.status)
+    work_item.stage_completed_date = data.get('stage_completed_date', work_item.stage_completed_date)
+    work_item.employee_id = data.get('employee_id', work_item.employee_id)
+    if work_item.stage != from_stage:
+        work_item.stage_entered_at = now
+    if (work_item.stage, work_item.status) != (from_stage, from_status):
+        record_finishing_events([finishing_change(work_item, from_stage, from_status, stage_entered_at)], now)
+    db.session.commit()
+    return jsonify({'message': 'Finishing work updated successfully'})
+# --- END NEW API ENDPOINTS ---
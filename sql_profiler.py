@@ -0,0 +1,128 @@
+# sql_profiler.py
+import json
+import logging
+import re
+import time
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+logger = logging.getLogger('slow_requests')
+
+_IN_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))*\s*\)')
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(statement):
+    """Statement text with literals and IN/VALUES lists collapsed, so repeats of one query compare equal."""
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _NUMBER.sub('?', statement)
+    return _IN_LIST.sub('(?)', statement)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, seconds):
+        self.query_count += 1
+        self.sql_seconds += seconds
+        self.statements[fingerprint(statement)] += 1
+
+    def repeated(self, threshold):
+        """SELECTs issued at least threshold times in this request: likely N+1 lazy loads."""
+        return [
+            {'count': count, 'statement': statement[:300]}
+            for statement, count in self.statements.most_common()
+            if count >= threshold and statement.upper().startswith('SELECT')
+        ]
+
+
+class SQLProfiler:
+    """
+    Opt-in per-request SQL profiling built on SQLAlchemy engine events.
+
+    SQL_PROFILING: 'off' (default, no listeners are installed), 'header' (only requests
+    sending X-Profile-SQL: 1) or 'all'. Profiled responses get a Server-Timing header
+    with query count and SQL time. Requests slower than SLOW_REQUEST_MS, or with any
+    SELECT repeated SQL_N_PLUS_ONE_THRESHOLD or more times, are written to the
+    'slow_requests' log (SLOW_REQUEST_LOG file when set, otherwise the app log).
+    """
+
+    def __init__(self, app=None, db=None):
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('SQL_PROFILING', 'off')
+        app.config.setdefault('SLOW_REQUEST_MS', 500)
+        app.config.setdefault('SQL_N_PLUS_ONE_THRESHOLD', 5)
+        app.config.setdefault('SLOW_REQUEST_LOG', None)
+        self.app = app
+        app.extensions['sql_profiler'] = self
+        if app.config['SQL_PROFILING'] == 'off':
+            return
+
+        if app.config['SLOW_REQUEST_LOG'] and not logger.handlers:
+            handler = RotatingFileHandler(app.config['SLOW_REQUEST_LOG'], maxBytes=10 * 1024 * 1024, backupCount=5)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+        with app.app_context():
+            for engine in db.engines.values(): # The read replica's queries count too
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def _start_request(self):
+        mode = self.app.config['SQL_PROFILING']
+        if mode == 'all' or (mode == 'header' and request.headers.get('X-Profile-SQL') == '1'):
+            g._sql_profile = RequestProfile()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_profile_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['_profile_query_start'].pop()
+        if not has_request_context():
+            return
+        profile = g.get('_sql_profile')
+        if profile is not None:
+            profile.record(statement, time.perf_counter() - started)
+
+    def _finish_request(self, response):
+        profile = g.pop('_sql_profile', None)
+        if profile is None:
+            return response
+
+        total_ms = (time.perf_counter() - profile.started_at) * 1000
+        sql_ms = profile.sql_seconds * 1000
+        response.headers.add(
+            'Server-Timing', f'db;dur={sql_ms:.1f};desc="{profile.query_count} queries", app;dur={total_ms:.1f}'
+        )
+
+        repeated = profile.repeated(self.app.config['SQL_N_PLUS_ONE_THRESHOLD'])
+        if total_ms >= self.app.config['SLOW_REQUEST_MS'] or repeated:
+            entry = json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round(total_ms, 1),
+                'sql_ms': round(sql_ms, 1),
+                'query_count': profile.query_count,
+                'n_plus_one': repeated,
+            })
+            if logger.handlers:
+                logger.info(entry)
+            else:
+                self.app.logger.warning(f"Slow request: {entry}")
+        return response
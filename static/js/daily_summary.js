@@ -21,22 +21,42 @@ document.addEventListener('DOMContentLoaded', function() {
                 });
             });
 
-        // Fetch jobs
-        fetch('/api/jobs')
+        // Seed each job dropdown with the most recent jobs; typing in its search box narrows it
+        jobDropdowns.forEach(dropdown => {
+            attachJobSearch(dropdown);
+            searchJobs(dropdown, '');
+        });
+    }
+
+    // Jobs are looked up on demand instead of downloading the whole job list
+    function searchJobs(dropdown, query) {
+        fetch(`/api/jobs/search?q=${encodeURIComponent(query)}&limit=20`)
             .then(response => response.json())
             .then(jobs => {
-                jobDropdowns.forEach(dropdown => {
-                    dropdown.innerHTML = '<option value="">Select Job</option>';
-                    jobs.forEach(job => {
-                        const option = document.createElement('option');
-                        option.value = job.job_id;
-                        option.textContent = job.job_tag;
-                        dropdown.appendChild(option);
-                    });
+                dropdown.innerHTML = '<option value="">Select Job</option>';
+                jobs.forEach(job => {
+                    const option = document.createElement('option');
+                    option.value = job.job_id;
+                    option.textContent = job.job_tag;
+                    dropdown.appendChild(option);
                 });
             });
     }
 
+    function attachJobSearch(dropdown) {
+        const searchInput = document.createElement('input');
+        searchInput.type = 'search';
+        searchInput.className = 'form-control mb-1';
+        searchInput.placeholder = 'Search job tag';
+        dropdown.parentNode.insertBefore(searchInput, dropdown);
+
+        let debounceTimer = null;
+        searchInput.addEventListener('input', () => {
+            clearTimeout(debounceTimer);
+            debounceTimer = setTimeout(() => searchJobs(dropdown, searchInput.value.trim()), 250);
+        });
+    }
+
     summaryForm.addEventListener('submit', function(event) {
         event.preventDefault();
 
@@ -78,11 +78,11 @@ document.addEventListener('DOMContentLoaded', () => {
             const employees = await response.json();
             tableBody.innerHTML = ''; // Clear existing rows
 
-            employees.forEach(emp => {
+            employees.forEach((emp, index) => {
                 const row = tableBody.insertRow();
                 row.setAttribute('data-id', emp.employee_id);
 
-                row.insertCell(0).textContent = emp.display_order;
+                row.insertCell(0).textContent = index + 1;
                 row.insertCell(1).textContent = emp.employee_id;
                 row.insertCell(2).textContent = emp.first_name;
                 row.insertCell(3).textContent = emp.last_initial;
@@ -321,23 +321,21 @@ document.addEventListener('DOMContentLoaded', () => {
             draggable: 'tr', // Makes the entire <tr> element draggable
             ghostClass: 'sortable-ghost', // Class name for the drop placeholder
             onEnd: async function (evt) {
-                // This event fires when drag-and-drop is finished
-                const newOrder = [];
-                // Iterate through the reordered rows to get their new sequence
-                employeesTableBody.querySelectorAll('tr').forEach((row, index) => {
-                    newOrder.push({
-                        employee_id: parseInt(row.getAttribute('data-id')), // Get employee ID from data-id attribute
-                        order: index // New order is simply its index in the list (0-based)
-                    });
-                });
-
-                // console.log('DEBUG: New position order being sent:', JSON.stringify(newOrder)); // Use JSON.stringify
+                if (evt.oldIndex === evt.newIndex) return; // Dropped back in place
+                // Only the moved row is saved: the backend slots it between its new neighbours
+                const movedRow = evt.item;
+                const previousRow = movedRow.previousElementSibling;
+                const nextRow = movedRow.nextElementSibling;
+                const moveData = {
+                    before_id: previousRow ? parseInt(previousRow.getAttribute('data-id')) : null,
+                    after_id: nextRow ? parseInt(nextRow.getAttribute('data-id')) : null
+                };
 
                 try {
-                    const response = await fetch('/api/employees/reorder', { // Call the new backend reorder API
+                    const response = await fetch(`/api/employees/${movedRow.getAttribute('data-id')}/move`, {
                         method: 'PUT',
                         headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(newOrder)
+                        body: JSON.stringify(moveData)
                     });
 
                     if (response.ok) {
@@ -1,32 +1,32 @@
 document.addEventListener('DOMContentLoaded', function () {
     const wipContainer = document.getElementById('finishing-wip-container');
     const modalEmployeeSelect = document.getElementById('modal-employee');
+    const newItemForm = document.getElementById('newFinishingItemForm');
+    const newItemJobSearch = document.getElementById('newItemJobSearch');
+    const newItemJobSelect = document.getElementById('newItemJob');
+    const newItemFinishType = document.getElementById('newItemFinishType');
+    const advanceItemBtn = document.getElementById('advanceItemBtn');
+    const advanceBatchBtn = document.getElementById('advanceBatchBtn');
 
-    const FINISH_STAGES = {
-        'PAINT': ['Picked', 'Sanded', 'Prime1', 'Scuff1', 'Prime2', 'Scuff2', 'Top Coat'],
-        'STAIN': ['Picked', 'Sanded', 'Stain', 'Sealer', 'Scuff1', 'Top Coat'],
-        'NATURAL': ['Picked', 'Sanded', 'Sealer', 'Scuff1', 'Top Coat'],
-        'GLAZE': ['Picked', 'Sanded', 'Prime1', 'Scuff1', 'Prime2', 'Scuff2', 'Top Coat1', 'Glaze', 'Top Coat2']
-    };
-
-    // Store data globally within this script's scope
-    let allJobs = [];
-    let allFinishingWork = [];
+    // Stage sequences come from the board endpoint so they match the backend
+    let finishStages = {};
+    let boardGroups = [];
     let allEmployees = [];
 
     async function loadInitialData() {
         try {
-            const [jobsRes, finishingWorkRes, employeesRes] = await Promise.all([
-                fetch('/api/jobs'),
-                fetch('/api/finishing_work'),
+            const [boardRes, employeesRes] = await Promise.all([
+                fetch('/api/finishing_work/board'),
                 fetch('/api/employees')
             ]);
-            allJobs = await jobsRes.json();
-            allFinishingWork = await finishingWorkRes.json();
-            allEmployees = (await employeesRes.json()).filter(e => e.is_active);
-            
+            const board = await boardRes.json();
+            finishStages = board.finish_stages;
+            boardGroups = board.groups;
+            allEmployees = (await employeesRes.json()).filter(e => !e.employment_end_date);
+
             populateEmployeeDropdown();
-            renderTables();
+            populateFinishTypeDropdown();
+            renderBoard();
 
         } catch (error) {
             console.error("Failed to load initial data:", error);
@@ -44,67 +44,93 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
 
-    function renderTables() {
+    function populateFinishTypeDropdown() {
+        newItemFinishType.innerHTML = '';
+        Object.keys(finishStages).forEach(finishType => {
+            const option = document.createElement('option');
+            option.value = finishType;
+            option.textContent = finishType;
+            newItemFinishType.appendChild(option);
+        });
+    }
+
+    function renderBoard() {
         wipContainer.innerHTML = ''; // Clear existing content
-        
-        for (const finishType in FINISH_STAGES) {
-            const jobsForType = allJobs.filter(job => job[`boxes_${finishType.toLowerCase()}`] > 0);
-            
-            if (jobsForType.length > 0) {
-                const stages = FINISH_STAGES[finishType];
-                const table = createTable(finishType, stages, jobsForType);
-                wipContainer.appendChild(table);
+
+        for (const finishType in finishStages) {
+            const groupsForType = boardGroups.filter(g => g.finish_type === finishType);
+            if (groupsForType.length > 0) {
+                wipContainer.appendChild(createBoard(finishType, finishStages[finishType], groupsForType));
             }
         }
+
+        if (!wipContainer.hasChildNodes()) {
+            wipContainer.innerHTML = '<p>No open finishing work.</p>';
+        }
     }
 
-    function createTable(finishType, stages, jobs) {
+    function createBoard(finishType, stages, groups) {
         const card = document.createElement('div');
         card.className = 'card mb-4';
 
-        let headerHtml = `<div class="card-header"><h4>${finishType} Jobs</h4></div>`;
-        let tableHtml = `<div class="card-body table-responsive"><table class="table table-bordered table-hover text-center">`;
-        
-        // Create table header
-        let thead = `<thead><tr><th style="width: 15%;">Job Tag</th>`;
+        const openCount = groups.reduce((total, g) => total + g.count, 0);
+        let headerHtml = `<div class="card-header"><h4>${finishType} (${openCount} open)</h4></div>`;
+        let tableHtml = `<div class="card-body table-responsive"><table class="table table-bordered text-center">`;
+
+        // One column per stage, headed by its open count
+        let thead = `<thead><tr>`;
         stages.forEach(stage => {
-            thead += `<th>${stage}</th>`;
+            const stageCount = groups.filter(g => g.stage === stage).reduce((total, g) => total + g.count, 0);
+            thead += `<th>${stage}<br><small>${stageCount}</small></th>`;
         });
         thead += `</tr></thead>`;
 
-        // Create table body
-        let tbody = `<tbody>`;
-        jobs.forEach(job => {
-            tbody += `<tr><td>${job.job_tag}</td>`;
-            stages.forEach(stage => {
-                const workItem = allFinishingWork.find(w => w.job_id === job.job_id && w.stage === stage && w.finish_type === finishType);
-                const status = workItem ? workItem.status : '';
-                const workId = workItem ? workItem.finishing_id : 'new';
-                let cellClass = '';
-                if (status === 'Complete') cellClass = 'bg-success';
-                if (status === 'In Progress') cellClass = 'bg-warning';
-
-                tbody += `<td class="${cellClass}" data-job-id="${job.job_id}" data-job-tag="${job.job_tag}" data-stage="${stage}" data-finish-type="${finishType}" data-work-id="${workId}" style="cursor:pointer;">${status}</td>`;
+        let tbody = `<tbody><tr>`;
+        stages.forEach(stage => {
+            tbody += `<td style="vertical-align: top;">`;
+            groups.filter(g => g.stage === stage).forEach(group => {
+                let itemClass = 'btn-light';
+                if (group.status === 'Complete') itemClass = 'btn-success';
+                if (group.status === 'In Progress') itemClass = 'btn-warning';
+
+                tbody += `<div class="small text-muted">${group.status || 'Not Started'} (${group.count})</div>`;
+                group.items.forEach(item => {
+                    const label = item.job_tag || item.manual_part_name || `#${item.finishing_id}`;
+                    const batch = item.batch_number ? ` <small>[${item.batch_number}]</small>` : '';
+                    tbody += `<button type="button" class="btn btn-sm ${itemClass} btn-block wip-item" data-work-id="${item.finishing_id}" data-label="${label}" data-stage="${stage}" data-status="${group.status || ''}" data-finish-type="${finishType}" data-batch="${item.batch_number || ''}">${label}${batch}</button>`;
+                });
             });
-            tbody += `</tr>`;
+            tbody += `</td>`;
         });
-        tbody += `</tbody>`;
+        tbody += `</tr></tbody>`;
 
         card.innerHTML = headerHtml + tableHtml + thead + tbody + '</table></div>';
         return card;
     }
 
     wipContainer.addEventListener('click', function(e) {
-        if (e.target.tagName === 'TD' && e.target.dataset.jobId) {
-            const cell = e.target;
-            const { jobId, jobTag, stage, finishType, workId } = cell.dataset;
-            
+        const item = e.target.closest('.wip-item');
+        if (item) {
+            const { workId, label, stage, status, finishType, batch } = item.dataset;
+
             // Populate and show the modal
-            document.getElementById('modal-job-tag').textContent = jobTag;
+            document.getElementById('modal-job-tag').textContent = label;
             document.getElementById('modal-stage-name').textContent = stage;
             document.getElementById('modal-work-id').value = workId;
-            document.getElementById('modal-job-id').value = jobId;
-            document.getElementById('modal-finish-type').value = finishType;
+            // The item can be moved to any stage of its finish type, e.g. to correct a mistake
+            const stageSelect = document.getElementById('modal-stage');
+            stageSelect.innerHTML = '';
+            finishStages[finishType].forEach(stageName => {
+                const option = document.createElement('option');
+                option.value = stageName;
+                option.textContent = stageName;
+                stageSelect.appendChild(option);
+            });
+            stageSelect.value = stage;
+            document.getElementById('modal-status').value = status || 'In Progress';
+            document.getElementById('modal-batch').value = batch;
+            advanceBatchBtn.style.display = batch ? '' : 'none';
+            advanceBatchBtn.textContent = `Advance Batch ${batch}`;
 
             $('#statusUpdateModal').modal('show');
         }
@@ -112,54 +138,128 @@ document.addEventListener('DOMContentLoaded', function () {
 
     document.getElementById('saveStatusBtn').addEventListener('click', async function() {
         const workId = document.getElementById('modal-work-id').value;
+        const stage = document.getElementById('modal-stage').value;
         const status = document.getElementById('modal-status').value;
         const employeeId = document.getElementById('modal-employee').value;
 
-        let url, method, body;
-
-        if (workId === 'new') {
-            // Create a new finishing work item
-            url = '/api/finishing_work';
-            method = 'POST';
-            body = {
-                job_id: document.getElementById('modal-job-id').value,
-                finish_type: document.getElementById('modal-finish-type').value,
-                stage: document.getElementById('modal-stage-name').textContent,
-                status: status,
-                employee_id: employeeId || null,
-                stage_completed_date: status === 'Complete' ? new Date().toISOString().split('T')[0] : null
-            };
-        } else {
-            // Update an existing item
-            url = `/api/finishing_work/${workId}`;
-            method = 'PUT';
-            body = {
-                status: status,
-                employee_id: employeeId || null,
-                stage_completed_date: status === 'Complete' ? new Date().toISOString().split('T')[0] : null
-            };
-        }
-
         try {
-            const response = await fetch(url, {
-                method: method,
+            const response = await fetch(`/api/finishing_work/${workId}`, {
+                method: 'PUT',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(body)
+                body: JSON.stringify({
+                    stage: stage,
+                    status: status,
+                    employee_id: employeeId || null,
+                    stage_completed_date: status === 'Complete' ? new Date().toISOString().split('T')[0] : null
+                })
             });
             if (!response.ok) throw new Error('Failed to save status');
-            
+
             await response.json();
             $('#statusUpdateModal').modal('hide');
-            
-            // Reload all data to reflect changes
+
+            // Reload the board to reflect changes
             await loadInitialData();
-            
+
         } catch (error) {
             console.error("Error saving status:", error);
             alert("Failed to save status.");
         }
     });
 
+    // Completes the current stage (moving on to the next) for one item or a whole batch
+    async function advance(url, body) {
+        const employeeId = document.getElementById('modal-employee').value;
+        try {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(Object.assign({
+                    employee_id: employeeId ? parseInt(employeeId) : null,
+                    completed_date: new Date().toISOString().split('T')[0]
+                }, body))
+            });
+            const result = await response.json();
+            if (!response.ok) {
+                const details = (result.errors || []).map(e => `#${e.finishing_id}: ${e.message}`).join('\n');
+                alert(`${result.message}${details ? '\n' + details : ''}`);
+                return;
+            }
+            $('#statusUpdateModal').modal('hide');
+            await loadInitialData();
+
+        } catch (error) {
+            console.error("Error advancing finishing work:", error);
+            alert("Failed to advance finishing work.");
+        }
+    }
+
+    advanceItemBtn.addEventListener('click', function() {
+        advance(`/api/finishing_work/${document.getElementById('modal-work-id').value}/advance`, {
+            from_stage: document.getElementById('modal-stage-name').textContent
+        });
+    });
+
+    advanceBatchBtn.addEventListener('click', function() {
+        advance('/api/finishing_work/advance', { batch_number: document.getElementById('modal-batch').value });
+    });
+
+    // --- Starting new items: jobs are looked up on demand ---
+    function searchJobs(query) {
+        fetch(`/api/jobs/search?q=${encodeURIComponent(query)}&limit=20`)
+            .then(response => response.json())
+            .then(jobs => {
+                newItemJobSelect.innerHTML = '<option value="">Select Job</option>';
+                jobs.forEach(job => {
+                    const option = document.createElement('option');
+                    option.value = job.job_id;
+                    option.textContent = job.job_tag;
+                    newItemJobSelect.appendChild(option);
+                });
+            });
+    }
+
+    let debounceTimer = null;
+    newItemJobSearch.addEventListener('input', () => {
+        clearTimeout(debounceTimer);
+        debounceTimer = setTimeout(() => searchJobs(newItemJobSearch.value.trim()), 250);
+    });
+
+    newItemForm.addEventListener('submit', async function(event) {
+        event.preventDefault();
+        const finishType = newItemFinishType.value;
+        const body = {
+            job_id: newItemJobSelect.value || null,
+            manual_part_name: document.getElementById('newItemPartName').value || null,
+            batch_number: document.getElementById('newItemBatch').value || null,
+            finish_type: finishType,
+            stage: finishStages[finishType][0],
+            status: 'In Progress'
+        };
+        if (!body.job_id && !body.manual_part_name) {
+            alert('Select a job or enter a part name.');
+            return;
+        }
+
+        try {
+            const response = await fetch('/api/finishing_work', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(body)
+            });
+            if (!response.ok) throw new Error('Failed to start finishing work');
+
+            await response.json();
+            newItemForm.reset();
+            await loadInitialData();
+
+        } catch (error) {
+            console.error("Error starting finishing work:", error);
+            alert("Failed to start finishing work.");
+        }
+    });
+
 
+    searchJobs('');
     loadInitialData();
-});
\ No newline at end of file
+});
@@ -3,6 +3,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const jobsTableBody = document.querySelector('#jobsTable tbody');
     const saveButton = jobForm.querySelector('button[type="submit"]');
     const clearFormBtn = document.getElementById('clearFormBtn');
+    const loadMoreJobsBtn = document.getElementById('loadMoreJobsBtn');
 
     const commonButtonStyleInline = `
         padding: 0; /* Remove padding */
@@ -36,15 +37,28 @@ document.addEventListener('DOMContentLoaded', function() {
         clearForm();
     });
 
-    async function fetchJobs() {
+    loadMoreJobsBtn.addEventListener('click', function() {
+        fetchJobs(nextCursor);
+    });
+
+    // The jobs API is paged (newest first); nextCursor is null once the last page is loaded
+    let nextCursor = null;
+
+    async function fetchJobs(cursor = null) {
         try{
-            const response = await fetch('/api/jobs');
+            const url = cursor ? `/api/jobs?cursor=${cursor}` : '/api/jobs';
+            const response = await fetch(url);
             if (!response.ok) {
                 const errorData = await response.json();
                 throw new Error(`HTTP error! status: ${response.status}, Message: ${errorData.message || 'Unknown error'}`);
             }
-            const jobs = await response.json();
-            jobsTableBody.innerHTML = ''; // Clear existing rows
+            const page = await response.json();
+            const jobs = page.jobs;
+            nextCursor = page.next_cursor;
+            loadMoreJobsBtn.style.display = nextCursor ? '' : 'none';
+            if (!cursor) {
+                jobsTableBody.innerHTML = ''; // Clear existing rows when (re)loading the first page
+            }
 
             jobs.forEach(job => {
                 const row = jobsTableBody.insertRow();
@@ -58,6 +58,28 @@ document.addEventListener('DOMContentLoaded', () => {
         return params;
     }
 
+    // Runs a report as a background job (POST /api/reports/jobs) and polls until it finishes.
+    // Resolves to a Response like fetch() does: the stored result, or the error that stopped it.
+    async function fetchReportJob(report, filterParams) {
+        const submitResponse = await fetch('/api/reports/jobs', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ report: report, params: Object.fromEntries(new URLSearchParams(filterParams)) })
+        });
+        if (!submitResponse.ok) return submitResponse;
+        let job = await submitResponse.json();
+        while (job.status === 'queued' || job.status === 'running') {
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            const statusResponse = await fetch(job.status_url);
+            if (!statusResponse.ok) return statusResponse;
+            job = await statusResponse.json();
+        }
+        if (job.status === 'failed') {
+            return new Response(JSON.stringify({ message: job.error }), { status: 500, headers: { 'Content-Type': 'application/json' } });
+        }
+        return fetch(job.result_url);
+    }
+
     window.toggleWorkAreaYearDetails = function(workAreaName, summaryRow) {
         const sanitizedWorkAreaName = workAreaName.replace(/\s+/g, '-').replace(/\//g, '-');
         const detailRows = document.querySelectorAll(`.year-details-of-${sanitizedWorkAreaName}`); // Selects year summary rows under this work area
@@ -402,7 +424,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const filterParams = getFilterParams(); // Get filters
             
             // Fetch Work Area data for bars
-            const workAreaResponse = await fetch(`/api/reports/monthly-work-area-hours?${filterParams}`); // Add params
+            const workAreaResponse = await fetchReportJob('monthly-work-area-hours', filterParams); // Add params
             
             if (!workAreaResponse.ok) {
                 const errorData = await workAreaResponse.json();
@@ -411,7 +433,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const workAreaReportData = await workAreaResponse.json();
 
             // Fetch Company Actuals data for lines
-            const companyActualsResponse = await fetch(`/api/reports/monthly-company-actuals?${filterParams}`); // Add params
+            const companyActualsResponse = await fetchReportJob('monthly-company-actuals', filterParams); // Add params
             if (!companyActualsResponse.ok) {
                 const errorData = await companyActualsResponse.json();
                 throw new Error(`HTTP error! Status: ${companyActualsResponse.status}, Message: ${errorData.message || 'Unknown error'}`);
@@ -678,7 +700,7 @@ document.addEventListener('DOMContentLoaded', () => {
         const filterParams = getFilterParams(); // Get filters
         workAreaTableBody.innerHTML = '<tr><td colspan="5">Loading monthly work area report...</td></tr>';
         try {
-            const response = await fetch(`/api/reports/monthly-work-area-hours?${filterParams}`); // Add params
+            const response = await fetchReportJob('monthly-work-area-hours', filterParams); // Add params
             if (!response.ok) {
                 const errorData = await response.json();
                 throw new Error(`HTTP error! status: ${response.status}, Message: ${errorData.message || 'Unknown error'}`);
@@ -918,7 +940,7 @@ document.addEventListener('DOMContentLoaded', () => {
         try {
             const filterParams = getFilterParams();
             // Backend now provides base-sorted data, frontend will do the primary sort
-            const response = await fetch(`/api/reports/monthly-employee-hours?${filterParams}`);
+            const response = await fetchReportJob('monthly-employee-hours', filterParams);
             if (!response.ok) {
                 const errorData = await response.json();
                 throw new Error(`HTTP error! status: ${response.status}, Message: ${errorData.message || 'Unknown error'}`);
@@ -51,11 +51,11 @@ document.addEventListener('DOMContentLoaded', () => {
                 return;
             }
 
-            positions.forEach(pos => {
+            positions.forEach((pos, index) => {
                 const row = positionsTableBody.insertRow();
                 row.setAttribute('data-id', String(pos.position_id)); 
 
-                row.insertCell(0).textContent = pos.display_order;
+                row.insertCell(0).textContent = index + 1;
                 row.insertCell(1).textContent = pos.position_id;
                 row.insertCell(2).textContent = pos.title;
                 row.insertCell(3).textContent = pos.default_hours;
@@ -189,21 +189,21 @@ document.addEventListener('DOMContentLoaded', () => {
             draggable: 'tr',
             ghostClass: 'sortable-ghost',
             onEnd: async function (evt) {
-                const newOrder = [];
-                positionsTableBody.querySelectorAll('tr').forEach((row, index) => {
-                    const positionIdRaw = row.getAttribute('data-id');
-                    const parsedPositionId = parseInt(positionIdRaw);
-                    newOrder.push({
-                        position_id: parsedPositionId,
-                        order: index
-                    });
-                });
+                if (evt.oldIndex === evt.newIndex) return; // Dropped back in place
+                // Only the moved row is saved: the backend slots it between its new neighbours
+                const movedRow = evt.item;
+                const previousRow = movedRow.previousElementSibling;
+                const nextRow = movedRow.nextElementSibling;
+                const moveData = {
+                    before_id: previousRow ? parseInt(previousRow.getAttribute('data-id')) : null,
+                    after_id: nextRow ? parseInt(nextRow.getAttribute('data-id')) : null
+                };
 
                 try {
-                    const response = await fetch('/api/positions/reorder', {
+                    const response = await fetch(`/api/positions/${movedRow.getAttribute('data-id')}/move`, {
                         method: 'PUT',
                         headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(newOrder)
+                        body: JSON.stringify(moveData)
                     });
 
                     if (response.ok) {
@@ -50,11 +50,11 @@ document.addEventListener('DOMContentLoaded', () => {
                 return;
             }
 
-            workAreas.forEach(area => {
+            workAreas.forEach((area, index) => {
                 const row = tableBody.insertRow();
                 row.setAttribute('data-id', area.work_area_id);
 
-                row.insertCell(0).textContent = area.display_order;
+                row.insertCell(0).textContent = index + 1;
                 row.insertCell(1).textContent = area.work_area_id;
                 row.insertCell(2).textContent = area.work_area_name;
                 row.insertCell(3).textContent = area.reporting_week_start_offset_days;
@@ -187,19 +187,21 @@ document.addEventListener('DOMContentLoaded', () => {
             draggable: 'tr',
             ghostClass: 'sortable-ghost',
             onEnd: async function (evt) {
-                const newOrder = [];
-                workAreasTableBody.querySelectorAll('tr').forEach((row, index) => {
-                    newOrder.push({
-                        work_area_id: parseInt(row.getAttribute('data-id')),
-                        order: index
-                    });
-                });
+                if (evt.oldIndex === evt.newIndex) return; // Dropped back in place
+                // Only the moved row is saved: the backend slots it between its new neighbours
+                const movedRow = evt.item;
+                const previousRow = movedRow.previousElementSibling;
+                const nextRow = movedRow.nextElementSibling;
+                const moveData = {
+                    before_id: previousRow ? parseInt(previousRow.getAttribute('data-id')) : null,
+                    after_id: nextRow ? parseInt(nextRow.getAttribute('data-id')) : null
+                };
 
                 try {
-                    const response = await fetch('/api/work-areas/reorder', {
+                    const response = await fetch(`/api/work-areas/${movedRow.getAttribute('data-id')}/move`, {
                         method: 'PUT',
                         headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(newOrder)
+                        body: JSON.stringify(moveData)
                     });
 
                     if (response.ok) {
@@ -0,0 +1,71 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SECRET_KEY', 'tests')
+
+from config import Config, engine_options
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Builds the app on a fresh SQLite file with every table created; keyword arguments override config."""
+    from app import create_app
+    from extensions import db
+
+    apps = []
+
+    def make(**settings):
+        database_uri = 'sqlite:///' + str(tmp_path / f'test{len(apps)}.db')
+
+        class TestConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = database_uri
+            SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_uri)
+            SQLALCHEMY_BINDS = {}
+            METRICS_DIR = None
+            SQL_PROFILING = 'off'
+
+        for name, value in settings.items():
+            setattr(TestConfig, name, value)
+        app = create_app(TestConfig)
+        with app.app_context():
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def user_id(app):
+    from extensions import db
+    from models import User
+
+    with app.app_context():
+        user = User(username='tester', email='tester@example.com', password_hash='!')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+@pytest.fixture
+def client(app, user_id):
+    """A test client logged in as user_id."""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
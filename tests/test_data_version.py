@@ -0,0 +1,38 @@
+# tests/test_data_version.py
+from datetime import date
+
+from sqlalchemy import text
+
+from extensions import db
+from models import DataVersion, Holiday, Notification, REPORT_VERSION_SHARDS, increment_report_data_version
+from report_jobs import report_data_version
+
+
+def test_every_write_commit_bumps_the_summed_version(app, user_id):
+    with app.app_context():
+        assert db.session.query(DataVersion).count() == REPORT_VERSION_SHARDS
+        for expected in range(1, 21):
+            db.session.add(Holiday(holiday_date=date(2026, 1, expected), description='Day off'))
+            db.session.commit()
+            assert report_data_version() == expected
+        assert db.session.query(DataVersion).filter(DataVersion.version > 0).count() > 1 # Spread over several rows
+
+
+def test_ignored_tables_and_reads_do_not_bump(app, user_id):
+    with app.app_context():
+        db.session.add(Notification(user_id=user_id, message='Hours saved'))
+        db.session.commit()
+        db.session.execute(text('SELECT 1'))
+        db.session.commit()
+        assert report_data_version() == 0
+
+
+def test_raw_sql_writes_bump(app):
+    with app.app_context():
+        db.session.execute(text("INSERT INTO holidays (holiday_date, description) VALUES ('2026-12-25', 'Christmas')"))
+        db.session.commit()
+        assert report_data_version() == 1
+        with db.engine.begin() as connection: # Writers outside the session bump explicitly
+            connection.execute(text("DELETE FROM holidays"))
+            increment_report_data_version(connection)
+        assert report_data_version() == 2
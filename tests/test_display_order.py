@@ -0,0 +1,88 @@
+# tests/test_display_order.py
+import pytest
+
+from extensions import db
+from helpers import ORDER_GAP
+from models import WorkArea
+
+
+@pytest.fixture
+def areas(app):
+    """Work areas A..E at the usual gapped keys; returns their ids in order."""
+    with app.app_context():
+        rows = [WorkArea(work_area_name=name, reporting_week_start_offset_days=0, display_order=(index + 1) * ORDER_GAP) for index, name in enumerate('ABCDE')]
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.work_area_id for row in rows]
+
+
+def ordered_ids(app):
+    with app.app_context():
+        return [row.work_area_id for row in WorkArea.query.order_by(WorkArea.display_order, WorkArea.work_area_id)]
+
+
+def test_move_writes_only_the_moved_row(app, client, areas):
+    a, b, c, d, e = areas
+    response = client.put(f'/api/work-areas/{e}/move', json={'before_id': a, 'after_id': b})
+    assert response.status_code == 200
+    assert ordered_ids(app) == [a, e, b, c, d]
+    with app.app_context():
+        assert [db.session.get(WorkArea, pk).display_order for pk in (a, b, c, d)] == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP, 4 * ORDER_GAP]
+
+
+def test_moves_to_either_end(app, client, areas):
+    a, b, c, d, e = areas
+    assert client.put(f'/api/work-areas/{c}/move', json={'before_id': None, 'after_id': a}).status_code == 200
+    assert client.put(f'/api/work-areas/{a}/move', json={'before_id': e, 'after_id': None}).status_code == 200
+    assert ordered_ids(app) == [c, b, d, e, a]
+
+
+def test_exhausted_gap_rebalances(app, client, areas):
+    a, b, c, d, e = areas
+    with app.app_context():
+        db.session.get(WorkArea, b).display_order = ORDER_GAP + 1
+        db.session.commit()
+    response = client.put(f'/api/work-areas/{e}/move', json={'before_id': a, 'after_id': b})
+    assert response.status_code == 200
+    assert ordered_ids(app) == [a, e, b, c, d]
+    with app.app_context():
+        assert WorkArea.query.filter(WorkArea.display_order.is_(None)).count() == 0
+
+
+@pytest.mark.parametrize('neighbours', [
+    lambda a, b, c, d, e: {'before_id': c, 'after_id': a}, # Inverted
+    lambda a, b, c, d, e: {'before_id': a, 'after_id': c}, # B sits between them
+    lambda a, b, c, d, e: {'before_id': c, 'after_id': None}, # C is not last
+    lambda a, b, c, d, e: {'before_id': None, 'after_id': b}, # B is not first
+    lambda a, b, c, d, e: {'before_id': a, 'after_id': 9999}, # Gone
+])
+def test_stale_neighbours_conflict_without_writing(app, client, areas, neighbours):
+    a, b, c, d, e = areas
+    response = client.put(f'/api/work-areas/{e}/move', json=neighbours(*areas))
+    assert response.status_code == 409
+    assert ordered_ids(app) == areas
+    with app.app_context():
+        assert db.session.get(WorkArea, e).display_order == 5 * ORDER_GAP
+
+
+def test_row_next_to_itself_is_rejected(client, areas):
+    a, b, c, d, e = areas
+    assert client.put(f'/api/work-areas/{c}/move', json={'before_id': c, 'after_id': d}).status_code == 400
+
+
+def test_full_reorder_respaces_in_posted_order(app, client, areas):
+    a, b, c, d, e = areas
+    posted = [{'work_area_id': pk, 'order': index} for index, pk in enumerate([e, d, c, b, a])]
+    assert client.put('/api/work-areas/reorder', json=posted).status_code == 200
+    assert ordered_ids(app) == [e, d, c, b, a]
+
+
+@pytest.mark.parametrize('posted_ids', [
+    lambda a, b, c, d, e: [e, a], # Partial: c, b and d left out
+    lambda a, b, c, d, e: [a, b, c, d, e, 9999], # Unknown row
+    lambda a, b, c, d, e: [a, b, c, d, e, a], # Duplicate
+])
+def test_full_reorder_rejects_a_list_without_every_row_once(app, client, areas, posted_ids):
+    posted = [{'work_area_id': pk, 'order': index} for index, pk in enumerate(posted_ids(*areas))]
+    assert client.put('/api/work-areas/reorder', json=posted).status_code == 400
+    assert ordered_ids(app) == areas
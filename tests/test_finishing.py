@@ -0,0 +1,146 @@
+# tests/test_finishing.py
+import pytest
+
+from extensions import db
+from models import FinishingWork, FinishingStageEvent, Job
+
+
+@pytest.fixture
+def job_id(app):
+    with app.app_context():
+        job = Job(job_tag='J-100')
+        db.session.add(job)
+        db.session.commit()
+        return job.job_id
+
+
+def start_item(client, job_id, finish_type='NATURAL', batch_number=None):
+    response = client.post('/api/finishing_work', json={
+        'job_id': job_id, 'finish_type': finish_type, 'stage': 'Picked', 'status': 'In Progress', 'batch_number': batch_number
+    })
+    assert response.status_code == 201
+    return max(item['finishing_id'] for group in client.get('/api/finishing_work/board').get_json()['groups'] for item in group['items'])
+
+
+def board_items(client):
+    return {item['finishing_id']: (group['stage'], group['status'])
+            for group in client.get('/api/finishing_work/board').get_json()['groups'] for item in group['items']}
+
+
+def test_board_shows_items_until_their_final_stage_is_complete(client, job_id):
+    item_id = start_item(client, job_id)
+    assert client.put(f'/api/finishing_work/{item_id}', json={'status': 'Complete'}).status_code == 200
+    assert board_items(client) == {item_id: ('Picked', 'Complete')} # Done with Picked, waiting to move on
+
+    assert client.put(f'/api/finishing_work/{item_id}', json={'stage': 'Top Coat', 'status': 'In Progress'}).status_code == 200
+    assert board_items(client) == {item_id: ('Top Coat', 'In Progress')}
+    assert client.put(f'/api/finishing_work/{item_id}', json={'status': 'Complete'}).status_code == 200
+    assert board_items(client) == {}
+
+
+def test_put_rejects_a_stage_outside_the_finish_type(app, client, job_id):
+    item_id = start_item(client, job_id)
+    response = client.put(f'/api/finishing_work/{item_id}', json={'stage': 'Glaze'}) # A GLAZE stage, not NATURAL
+    assert response.status_code == 400
+    with app.app_context():
+        assert db.session.get(FinishingWork, item_id).stage == 'Picked'
+
+
+def test_put_moving_stage_is_logged(app, client, job_id):
+    item_id = start_item(client, job_id)
+    client.put(f'/api/finishing_work/{item_id}', json={'stage': 'Sanded', 'status': 'In Progress'})
+    with app.app_context():
+        events = FinishingStageEvent.query.filter_by(finishing_id=item_id).order_by(FinishingStageEvent.event_id).all()
+        assert [(event.from_stage, event.to_stage) for event in events] == [(None, 'Picked'), ('Picked', 'Sanded')]
+
+
+def test_advance_single_item_without_a_batch(client, job_id):
+    item_id = start_item(client, job_id)
+    client.put(f'/api/finishing_work/{item_id}', json={'status': 'Complete'})
+    response = client.post(f'/api/finishing_work/{item_id}/advance', json={'from_stage': 'Picked'})
+    assert response.status_code == 200
+    assert board_items(client) == {item_id: ('Sanded', 'In Progress')}
+    # The same click again is stale
+    assert client.post(f'/api/finishing_work/{item_id}/advance', json={'from_stage': 'Picked'}).status_code == 409
+
+
+def test_advance_through_the_final_stage_closes_the_item(client, job_id):
+    item_id = start_item(client, job_id)
+    for _ in range(5): # Picked, Sanded, Sealer, Scuff1, Top Coat
+        assert client.post(f'/api/finishing_work/{item_id}/advance').status_code == 200
+    assert board_items(client) == {}
+    assert client.post(f'/api/finishing_work/{item_id}/advance').status_code == 409
+    assert client.post('/api/finishing_work/9999/advance').status_code == 404
+
+
+def test_advance_batch_moves_every_open_item(client, job_id):
+    first = start_item(client, job_id, batch_number='B1')
+    second = start_item(client, job_id, finish_type='PAINT', batch_number='B1')
+    other = start_item(client, job_id, batch_number='B2')
+    response = client.post('/api/finishing_work/advance', json={'batch_number': 'B1'})
+    assert response.get_json()['advanced'] == 2
+    assert board_items(client) == {first: ('Sanded', 'In Progress'), second: ('Sanded', 'In Progress'), other: ('Picked', 'In Progress')}
+
+
+def test_advance_unknown_ids_changes_nothing(client, job_id):
+    item_id = start_item(client, job_id)
+    response = client.post('/api/finishing_work/advance', json={'finishing_ids': [item_id, 9998, 9999]})
+    assert response.status_code == 404
+    assert response.get_json()['unknown_ids'] == [9998, 9999]
+    assert board_items(client) == {item_id: ('Picked', 'In Progress')}
+    assert client.post('/api/finishing_work/advance', json={'finishing_ids': ['x']}).status_code == 400
+
+
+def test_daily_stats_add_to_counters_committed_by_another_request(app, client, job_id):
+    from datetime import date
+    from models import FinishingStageDailyStat
+    item_id = start_item(client, job_id)
+    with app.app_context():
+        engine = db.engine
+        stats = FinishingStageDailyStat.__table__
+        created = []
+
+        def create_row_first(conn, clauseelement, multiparams, params, execution_options):
+            # Another request commits the day's first Sanded counters while this one is advancing (SQLite
+            # allows one writer, so before this one's first write)
+            if getattr(clauseelement, 'table', None) is FinishingWork.__table__ and clauseelement.is_update and not created:
+                created.append(True)
+                with engine.connect() as other:
+                    other.execute(stats.insert().values(stat_date=date.today(), finish_type='NATURAL', stage='Sanded', entered_count=3,
+                                                        exited_count=0, timed_exit_count=0, total_seconds_in_stage=0.0))
+                    other.commit()
+
+        db.event.listen(engine, 'before_execute', create_row_first)
+        try:
+            assert client.post(f'/api/finishing_work/{item_id}/advance').status_code == 200
+        finally:
+            db.event.remove(engine, 'before_execute', create_row_first)
+        assert created
+        counts = {row.stage: (row.entered_count, row.exited_count) for row in FinishingStageDailyStat.query.filter_by(finish_type='NATURAL')}
+        assert counts == {'Picked': (1, 1), 'Sanded': (4, 0)}
+
+
+def test_advance_fails_when_an_item_moved_after_it_was_read(app, client, job_id):
+    first = start_item(client, job_id)
+    second = start_item(client, job_id)
+    client.post(f'/api/finishing_work/{second}/advance') # A mixed-stage batch: Picked and Sanded
+    with app.app_context():
+        engine = db.engine
+        moved = []
+
+        def move_first_item(conn, clauseelement, multiparams, params, execution_options):
+            # Another request advances the first item to Sanded after this one read it at Picked
+            if getattr(clauseelement, 'table', None) is FinishingWork.__table__ and clauseelement.is_update and not moved:
+                moved.append(True)
+                with engine.connect() as other:
+                    other.execute(FinishingWork.__table__.update().where(FinishingWork.finishing_id == first).values(stage='Sanded'))
+                    other.commit()
+
+        db.event.listen(engine, 'before_execute', move_first_item)
+        try:
+            response = client.post('/api/finishing_work/advance', json={'finishing_ids': [first, second]})
+        finally:
+            db.event.remove(engine, 'before_execute', move_first_item)
+    assert moved
+    assert response.status_code == 409
+    assert board_items(client) == {first: ('Sanded', 'In Progress'), second: ('Sanded', 'In Progress')}
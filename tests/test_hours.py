@@ -0,0 +1,47 @@
+# tests/test_hours.py
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from extensions import db
+from models import DailyEmployeeHours, Employee, Holiday, OverallProductionWeek, Position, WorkArea
+
+
+def test_batch_update_creates_new_entries(app, client):
+    monday = date(2026, 3, 30)
+    with app.app_context():
+        area = WorkArea(work_area_name='Cutting', reporting_week_start_offset_days=0)
+        leader = Position(title='Team Leader', default_hours=7.75)
+        operator = Position(title='Operator', default_hours=7.5)
+        week = OverallProductionWeek(reporting_week_start_date=monday, reporting_week_end_date=monday + timedelta(days=6))
+        db.session.add_all([area, leader, operator, week, Holiday(holiday_date=date(2026, 4, 3), description='Good Friday')])
+        db.session.flush()
+        employees = [Employee(first_name=name, last_initial='B', position_id=position.position_id, primary_work_area_id=area.work_area_id,
+                              employment_start_date=date(2020, 1, 1), display_order=index)
+                     for index, (name, position) in enumerate([('Ana', leader), ('Ben', operator)])]
+        db.session.add_all(employees)
+        db.session.commit()
+        ids = {'area': area.work_area_id, 'week': week.overall_production_week_id, 'leader': employees[0].employee_id, 'operator': employees[1].employee_id}
+        engine = db.engine
+
+    payload = [{'employee_id': ids[who], 'work_date': (monday + timedelta(days=offset)).isoformat(), 'work_area_id': ids['area'],
+                'actual_hours': '8', 'overall_production_week_id': ids['week']}
+               for who in ('leader', 'operator') for offset in range(7)]
+    calendar_queries = []
+
+    def count_calendar_queries(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM calendar_days' in statement:
+            calendar_queries.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count_calendar_queries)
+    try:
+        response = client.post('/api/daily-hours-entry/batch-update', json=payload)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_calendar_queries)
+    assert response.status_code == 200
+    assert len(calendar_queries) == 1 # One workday map for the whole payload
+
+    with app.app_context():
+        forecasts = {(row.employee_id, row.work_date.weekday()): float(row.forecasted_hours) for row in DailyEmployeeHours.query}
+    assert [forecasts[(ids['leader'], day)] for day in range(7)] == [7.75, 7.75, 7.75, 7.75, 0.0, 0.0, 0.0]
+    assert [forecasts[(ids['operator'], day)] for day in range(7)] == [7.5, 7.5, 7.5, 7.5, 0.0, 0.0, 0.0]
@@ -0,0 +1,73 @@
+# tests/test_job_progress.py
+from datetime import date
+
+import pytest
+
+from extensions import db
+from models import Employee, Job, JobProgress, Position, WorkArea
+from shift import apply_job_progress
+
+
+@pytest.fixture
+def ids(app):
+    with app.app_context():
+        area = WorkArea(work_area_name='Cutting', reporting_week_start_offset_days=0)
+        position = Position(title='Operator', default_hours=8)
+        job = Job(job_tag='J-1', num_sheets=10)
+        db.session.add_all([area, position, job])
+        db.session.flush()
+        employee = Employee(first_name='Ana', last_initial='B', position_id=position.position_id, primary_work_area_id=area.work_area_id,
+                            employment_start_date=date(2020, 1, 1), display_order=1)
+        db.session.add(employee)
+        db.session.commit()
+        return job.job_id, employee.employee_id
+
+
+def test_progress_row_created_on_first_summary(app, ids):
+    job_id, _ = ids
+    rows = [{'job_id': job_id, 'summary_date': date(2026, 3, 2), 'sheets_cut_mtr': 3, 'sheets_cut_cs43': 1}]
+    with app.app_context():
+        assert db.session.get(JobProgress, job_id) is None # A job from before job_progress existed
+        apply_job_progress(rows)
+        apply_job_progress(rows)
+        db.session.commit()
+        progress = db.session.get(JobProgress, job_id)
+        assert (progress.sheets_cut, progress.summary_count, float(progress.completion_pct)) == (8, 2, 80.0)
+
+
+def test_first_row_created_concurrently_is_added_to(app, ids):
+    job_id, _ = ids
+    with app.app_context():
+        engine = db.engine
+        created = []
+
+        def create_row_first(conn, clauseelement, multiparams, params, execution_options):
+            # Another upload commits the job's first progress row after this one found it missing
+            if getattr(clauseelement, 'table', None) is JobProgress.__table__ and clauseelement.is_insert and not created:
+                created.append(True)
+                with engine.connect() as other:
+                    other.execute(JobProgress.__table__.insert().values(
+                        job_id=job_id, sheets_cut=5, mdf_doors_cut=0, edgebanding_ran=0, drawer_boxes_built=0,
+                        boxes_built=0, summary_count=1, completion_pct=50))
+                    other.commit()
+
+        db.event.listen(engine, 'before_execute', create_row_first)
+        try:
+            apply_job_progress([{'job_id': job_id, 'summary_date': date(2026, 3, 3), 'sheets_cut_mtr': 2}])
+            db.session.commit()
+        finally:
+            db.event.remove(engine, 'before_execute', create_row_first)
+        assert created
+        progress = db.session.get(JobProgress, job_id)
+        assert (progress.sheets_cut, progress.summary_count) == (7, 2)
+
+
+def test_bulk_upload_updates_progress(app, client, ids):
+    job_id, employee_id = ids
+    response = client.post('/api/daily_shift_summary/bulk', json=[
+        {'summary_date': '2026-03-02', 'department': 'Cutting', 'employee_id': employee_id, 'job_id': job_id, 'sheets_cut_mtr': 4},
+        {'summary_date': '2026-03-03', 'department': 'Cutting', 'employee_id': employee_id, 'job_id': job_id, 'sheets_cut_cs43': 6},
+    ])
+    assert response.status_code == 201
+    progress = client.get('/api/jobs/progress', query_string={'include_complete': 'true'}).get_json()
+    assert [(row['job_id'], row['completion_pct'], row['summary_count']) for row in progress] == [(job_id, '100.00', 2)]
@@ -0,0 +1,42 @@
+# tests/test_jobs.py
+import pytest
+
+from extensions import db
+from models import Job
+
+
+@pytest.fixture
+def job_ids(app):
+    """25 jobs, JOB-001..JOB-025; returns their ids newest first."""
+    with app.app_context():
+        jobs = [Job(job_tag=f'JOB-{number:03d}') for number in range(1, 26)]
+        db.session.add_all(jobs)
+        db.session.commit()
+        return sorted((job.job_id for job in jobs), reverse=True)
+
+
+def test_cursor_pages_cover_every_job_once(client, job_ids):
+    seen, cursor = [], None
+    while True:
+        page = client.get('/api/jobs', query_string={'limit': 10, 'cursor': cursor} if cursor else {'limit': 10}).get_json()
+        seen += [job['job_id'] for job in page['jobs']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert seen == job_ids
+
+
+@pytest.mark.parametrize('limit', [0, -5])
+def test_limit_below_one_is_clamped(client, job_ids, limit):
+    page = client.get('/api/jobs', query_string={'limit': limit}).get_json()
+    assert [job['job_id'] for job in page['jobs']] == job_ids[:1]
+    assert page['next_cursor'] == job_ids[0]
+    following = client.get('/api/jobs', query_string={'limit': 1, 'cursor': page['next_cursor']}).get_json()
+    assert [job['job_id'] for job in following['jobs']] == job_ids[1:2]
+
+
+def test_search_prefix_then_substring(client, job_ids):
+    tags = [job['job_tag'] for job in client.get('/api/jobs/search', query_string={'q': 'job-02', 'limit': 0}).get_json()]
+    assert tags == ['JOB-020']
+    tags = [job['job_tag'] for job in client.get('/api/jobs/search', query_string={'q': '-01'}).get_json()]
+    assert tags == [f'JOB-{number:03d}' for number in range(10, 20)]
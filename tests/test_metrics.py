@@ -0,0 +1,57 @@
+# tests/test_metrics.py
+import json
+import os
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from extensions import db, metrics
+from metrics import ARCHIVE_FILE
+
+
+@pytest.fixture
+def metrics_dir(make_app, tmp_path):
+    directory = tmp_path / 'metrics'
+    app = make_app(METRICS_DIR=str(directory))
+    yield app, directory
+    metrics.reset() # Values and the dead flag live on the shared extension
+
+
+def requests_total(text):
+    return sum(float(line.rsplit(' ', 1)[1]) for line in text.splitlines() if line.startswith('http_requests_total{'))
+
+
+def test_exited_workers_are_archived(metrics_dir):
+    app, directory = metrics_dir
+    metrics.reset()
+    metrics.inc('http_requests_total', 2, route='index', method='GET', status='200')
+    metrics.set('http_requests_in_flight', 1)
+    metrics.flush()
+    # A worker killed before its exit hook ran left its file behind
+    (directory / '4242.json').write_text(json.dumps([
+        ['http_requests_total', {'route': 'index', 'method': 'GET', 'status': '200'}, 3],
+        ['http_requests_in_flight', {}, 5],
+    ]))
+    assert requests_total(metrics.render()) == 5
+
+    metrics.mark_process_dead(4242) # From the master's child_exit
+    assert not (directory / '4242.json').exists()
+    assert requests_total(metrics.render()) == 5
+
+    metrics.mark_process_dead() # This worker's own exit
+    assert sorted(os.listdir(directory)) == [ARCHIVE_FILE, 'archive.lock']
+    archived = json.loads((directory / ARCHIVE_FILE).read_text())
+    assert [(name, value) for name, _, value in archived if name == 'http_requests_total'] == [('http_requests_total', 5)]
+    assert all(name != 'http_requests_in_flight' for name, _, _ in archived) # Gauges are dropped
+    metrics.flush()
+    assert not (directory / f'{os.getpid()}.json').exists() # Nothing is written back after exit
+
+
+def test_failed_statements_do_not_leak_timings(app):
+    with app.app_context(), db.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql('SELECT * FROM no_such_table')
+        assert connection.info['_metrics_query_start'] == []
+        connection.exec_driver_sql('SELECT 1')
+        assert connection.info['_metrics_query_start'] == []
@@ -0,0 +1,33 @@
+# tests/test_pool_exhaustion.py
+import time
+
+from config import engine_options
+from extensions import db
+from pool_stats import pool_monitor
+
+
+def test_exhausted_pool_fails_fast_and_recovers(make_app):
+    app = make_app(SQLALCHEMY_ENGINE_OPTIONS=dict(engine_options('sqlite:///pool.db'), pool_size=2, max_overflow=1, pool_timeout=1))
+    client = app.test_client()
+    assert client.get('/health/ready').status_code == 200
+    timeouts_before = pool_monitor.stats()['timeouts']
+
+    with app.app_context():
+        held = [db.engine.connect() for _ in range(3)] # pool_size + max_overflow
+    try:
+        assert pool_monitor.stats()['checked_out'] == 3
+        start = time.perf_counter()
+        response = client.get('/health/ready')
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 503
+        assert response.get_json()['status'] == 'unavailable'
+        assert 0.9 <= elapsed < 5 # Waits pool_timeout, then gives up instead of hanging
+    finally:
+        for connection in held:
+            connection.close()
+
+    assert client.get('/health/ready').status_code == 200
+    stats = pool_monitor.stats()
+    assert stats['timeouts'] == timeouts_before + 1
+    assert stats['checked_out'] == 0
+    assert stats['pool_class'] == 'InstrumentedQueuePool'
@@ -0,0 +1,80 @@
+# tests/test_report_jobs.py
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+import report_jobs
+from extensions import db
+from models import OverallProductionWeek, ReportJob
+
+
+def wait_for(client, status_url, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        status = client.get(status_url).get_json()
+        if status['status'] in ('done', 'failed') or time.monotonic() > deadline:
+            return status
+        time.sleep(0.05)
+
+
+def boxes(client):
+    return [row['forecasted_boxes_built'] for row in client.get('/api/reports/weekly-overview').get_json()]
+
+
+def test_stored_result_served_until_data_changes(app, client):
+    with app.app_context():
+        week = OverallProductionWeek(reporting_week_start_date=date(2026, 3, 2), reporting_week_end_date=date(2026, 3, 8), forecasted_boxes_built=100)
+        db.session.add(week)
+        db.session.commit()
+        week_id = week.overall_production_week_id
+
+    response = client.post('/api/reports/jobs', json={'report': 'weekly-overview'})
+    assert response.status_code == 202
+    assert wait_for(client, response.get_json()['status_url'])['status'] == 'done'
+    assert client.post('/api/reports/jobs', json={'report': 'weekly-overview'}).status_code == 200 # Already stored
+
+    with app.app_context(), db.engine.begin() as connection:
+        # A write that does not move the data version: the stored result keeps being served
+        connection.execute(text('UPDATE overall_production_weeks SET forecasted_boxes_built = 200'))
+    assert boxes(client) == [100]
+
+    assert client.put(f'/api/overall-production-weeks/{week_id}', json={'forecasted_boxes_built': 300}).status_code == 200
+    assert boxes(client) == [300]
+    assert client.post('/api/reports/jobs', json={'report': 'weekly-overview'}).status_code == 202 # Stale result not reused
+
+
+@pytest.fixture
+def job_id(app, user_id, monkeypatch):
+    monkeypatch.setattr(report_jobs, '_stream_slots', None) # Sized from this app's config on first use
+    with app.app_context():
+        job = ReportJob(cache_key='k' * 64, report='weekly-overview', params='{}', data_version=0, status='queued', requested_by=user_id)
+        db.session.add(job)
+        db.session.commit()
+        return job.report_job_id
+
+
+def test_stream_ends_when_the_job_is_removed(app, client, job_id):
+    response = client.get(f'/api/reports/jobs/{job_id}/events', buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'event: status')
+    with app.app_context():
+        ReportJob.query.filter_by(report_job_id=job_id).delete() # Another job's retention cleanup
+        db.session.commit()
+    assert next(chunks).startswith(b'event: gone')
+    assert list(chunks) == []
+    response.close()
+
+
+def test_open_streams_are_capped(app, client, job_id):
+    app.config['REPORT_JOB_MAX_STREAMS'] = 1
+    first = client.get(f'/api/reports/jobs/{job_id}/events', buffered=False)
+    assert first.status_code == 200
+    refused = client.get(f'/api/reports/jobs/{job_id}/events')
+    assert refused.status_code == 503
+    assert refused.get_json()['status_url'] == f'/api/reports/jobs/{job_id}'
+    first.close() # The client went away: its slot is free again
+    second = client.get(f'/api/reports/jobs/{job_id}/events', buffered=False)
+    assert second.status_code == 200
+    second.close()
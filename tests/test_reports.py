@@ -0,0 +1,48 @@
+# tests/test_reports.py
+from datetime import date
+
+import pytest
+
+from extensions import db
+from models import DailyEmployeeHours, Employee, Holiday, OverallProductionWeek, Position, WorkArea
+from work_calendar import ensure_calendar, workday_map
+
+
+@pytest.fixture
+def hours(app):
+    with app.app_context():
+        area = WorkArea(work_area_name='Cutting', reporting_week_start_offset_days=0)
+        position = Position(title='Operator', default_hours=8)
+        week = OverallProductionWeek(reporting_week_start_date=date(2026, 3, 30), reporting_week_end_date=date(2026, 4, 5))
+        db.session.add_all([area, position, week])
+        db.session.flush()
+        employee = Employee(first_name='Ana', last_initial='B', position_id=position.position_id, primary_work_area_id=area.work_area_id,
+                            employment_start_date=date(2020, 1, 1), display_order=1)
+        db.session.add(employee)
+        db.session.flush()
+        # Only March is in calendar_days; the April day was saved before its calendar row existed
+        ensure_calendar(date(2026, 3, 1), date(2026, 3, 31))
+        for work_date, actual in [(date(2026, 3, 31), 7), (date(2026, 4, 1), 6)]:
+            db.session.add(DailyEmployeeHours(employee_id=employee.employee_id, work_area_id=area.work_area_id, work_date=work_date,
+                                              forecasted_hours=8, actual_hours=actual, overall_production_week_id=week.overall_production_week_id))
+        db.session.commit()
+
+
+def test_work_area_report_keeps_days_missing_from_calendar(client, hours):
+    response = client.get('/api/reports/monthly-work-area-hours?year=2026')
+    assert response.status_code == 200
+    assert [(row['year'], row['month'], row['total_actual_hours']) for row in response.get_json()] == [(2026, 3, '7.00'), (2026, 4, '6.00')]
+
+
+def test_employee_report_keeps_days_missing_from_calendar(client, hours):
+    response = client.get('/api/reports/monthly-employee-hours?year=2026')
+    assert response.status_code == 200
+    assert [(row['year'], row['month'], row['total_actual_hours']) for row in response.get_json()] == [(2026, 4, '6.00'), (2026, 3, '7.00')]
+
+
+def test_workday_map_falls_back_to_holidays(app):
+    with app.app_context():
+        db.session.add(Holiday(holiday_date=date(2026, 4, 3), description='Good Friday'))
+        db.session.commit()
+        workdays = workday_map(date(2026, 4, 1), date(2026, 4, 5))
+        assert [workdays[date(2026, 4, day)] for day in range(1, 6)] == [True, True, False, False, False]
@@ -0,0 +1,81 @@
+# tests/test_week_delete.py
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from models import DailyEmployeeHours, Employee, OverallProductionWeek, Position, WorkArea
+
+
+@pytest.fixture
+def week_ids(app):
+    with app.app_context():
+        area = WorkArea(work_area_name='Cutting', reporting_week_start_offset_days=0)
+        position = Position(title='Operator', default_hours=8)
+        db.session.add_all([area, position])
+        db.session.flush()
+        employee = Employee(first_name='Ana', last_initial='B', position_id=position.position_id, primary_work_area_id=area.work_area_id,
+                            employment_start_date=date(2020, 1, 1), display_order=1)
+        db.session.add(employee)
+        db.session.flush()
+        ids = []
+        for monday in (date(2026, 3, 2), date(2026, 3, 9), date(2026, 3, 16)):
+            week = OverallProductionWeek(reporting_week_start_date=monday, reporting_week_end_date=monday + timedelta(days=6))
+            db.session.add(week)
+            db.session.flush()
+            for offset in range(5):
+                db.session.add(DailyEmployeeHours(employee_id=employee.employee_id, work_area_id=area.work_area_id, work_date=monday + timedelta(days=offset),
+                                                  forecasted_hours=8, actual_hours=8, overall_production_week_id=week.overall_production_week_id))
+            ids.append(week.overall_production_week_id)
+        db.session.commit()
+        return ids
+
+
+def remaining(app):
+    with app.app_context():
+        weeks = sorted(week_id for (week_id,) in db.session.query(OverallProductionWeek.overall_production_week_id))
+        return weeks, db.session.query(DailyEmployeeHours).count()
+
+
+def fail_deleting_week(app, week_id):
+    """Makes the DELETE of week_id's overall_production_weeks row fail, after its hours were deleted."""
+    def before_execute(conn, clauseelement, multiparams, params, execution_options):
+        if clauseelement.is_delete and clauseelement.table.name == OverallProductionWeek.__tablename__ \
+                and week_id in clauseelement.compile().params.values():
+            raise RuntimeError('disk full')
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_execute', before_execute)
+    return lambda: event.remove(engine, 'before_execute', before_execute)
+
+
+def test_delete_week_removes_its_hours(app, client, week_ids):
+    assert client.delete(f'/api/overall-production-weeks/{week_ids[0]}').status_code == 204
+    assert remaining(app) == (week_ids[1:], 10)
+
+
+def test_failed_delete_leaves_week_whole(app, client, week_ids):
+    restore = fail_deleting_week(app, week_ids[0])
+    try:
+        response = client.delete(f'/api/overall-production-weeks/{week_ids[0]}')
+    finally:
+        restore()
+    assert response.status_code == 500
+    assert remaining(app) == (week_ids, 15)
+
+
+def test_bulk_delete_reports_partial_progress(app, client, week_ids):
+    restore = fail_deleting_week(app, week_ids[1])
+    try:
+        response = client.post('/api/overall-production-weeks/bulk-delete', json={'start_date': '2026-03-01', 'end_date': '2026-03-31'})
+    finally:
+        restore()
+    body = response.get_json()
+    assert response.status_code == 500
+    assert (body['deleted_week_ids'], body['failed_week_id'], body['hours_deleted']) == ([week_ids[0]], week_ids[1], 5)
+    assert remaining(app) == (week_ids[1:], 10)
+
+    response = client.post('/api/overall-production-weeks/bulk-delete', json={'start_date': '2026-03-01', 'end_date': '2026-03-31'})
+    assert (response.status_code, response.get_json()['weeks_deleted']) == (200, 2)
+    assert remaining(app) == ([], 0)
@@ -0,0 +1,103 @@
+# traffic_capture.py
+import json
+import logging
+import os
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from flask import g, request
+
+logger = logging.getLogger('traffic_capture')
+
+SKIPPED_PATHS = ('/login', '/logout', '/metrics', '/health/', '/static/')
+_SENSITIVE_KEY = re.compile(r'password|passwd|secret|token|csrf|email', re.I)
+REDACTED = '[redacted]'
+
+
+def sanitize(value):
+    """Copy of a JSON value with sensitive keys redacted; ids, dates and numbers are kept for replay."""
+    if isinstance(value, dict):
+        return {key: REDACTED if _SENSITIVE_KEY.search(str(key)) else sanitize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+class TrafficCapture:
+    """
+    Optional recording of request shapes for `flask replay`. When TRAFFIC_CAPTURE_FILE
+    is set, every request except logins, health checks, metrics and static files is
+    written to it as one JSON line: time, method, path, endpoint, query string args,
+    the JSON body with sensitive keys redacted, status and duration. Form bodies,
+    cookies and headers are never recorded. The file rotates at
+    TRAFFIC_CAPTURE_MAX_BYTES keeping TRAFFIC_CAPTURE_BACKUPS old files; under a
+    multi-worker server include {pid} in the file name so workers never share a file.
+    """
+
+    def __init__(self, app=None):
+        self._handler_pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('TRAFFIC_CAPTURE_FILE', None)
+        app.config.setdefault('TRAFFIC_CAPTURE_MAX_BYTES', 50 * 1024 * 1024)
+        app.config.setdefault('TRAFFIC_CAPTURE_BACKUPS', 5)
+        self.app = app
+        app.extensions['traffic_capture'] = self
+        if not app.config['TRAFFIC_CAPTURE_FILE']:
+            return
+
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def _open_handler(self):
+        # Opened in the worker itself, so a preloading master never holds the file
+        with self._lock:
+            if self._handler_pid == os.getpid():
+                return
+            self._replace_handler()
+
+    def _replace_handler(self):
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+        path = self.app.config['TRAFFIC_CAPTURE_FILE'].format(pid=os.getpid())
+        handler = RotatingFileHandler(path, maxBytes=self.app.config['TRAFFIC_CAPTURE_MAX_BYTES'],
+                                      backupCount=self.app.config['TRAFFIC_CAPTURE_BACKUPS'])
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        self._handler_pid = os.getpid()
+
+    def _start_request(self):
+        if not request.path.startswith(SKIPPED_PATHS):
+            g._capture_started = (time.time(), time.perf_counter())
+
+    def _finish_request(self, response):
+        started = g.pop('_capture_started', None)
+        if started is None:
+            return response
+        wall_clock, perf_start = started
+        body = request.get_json(silent=True) if request.is_json else None
+        entry = {
+            'ts': round(wall_clock, 3),
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'args': sanitize(request.args.to_dict(flat=False)),
+            'json': sanitize(body),
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - perf_start) * 1000, 1),
+        }
+        try:
+            if self._handler_pid != os.getpid():
+                self._open_handler()
+            logger.info(json.dumps(entry, default=str))
+        except OSError as e:
+            print(f"Error writing traffic capture: {e}")
+        return response
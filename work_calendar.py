@@ -0,0 +1,72 @@
+# work_calendar.py
+from datetime import date, timedelta
+
+import click
+from sqlalchemy import insert
+
+from extensions import db
+from helpers import get_monday_of_week
+from models import CalendarDay, Holiday
+
+CALENDAR_INSERT_CHUNK = 1000
+
+
+def is_busday(days, holiday_dates=frozenset()):
+    """numpy.is_busday over plain dates: [is_workday] for days, Monday to Friday and not a holiday."""
+    return [day.weekday() < 5 and day not in holiday_dates for day in days]
+
+def calendar_row(day, holiday_dates):
+    is_holiday = day in holiday_dates
+    return {
+        'calendar_date': day,
+        'weekday': day.weekday(),
+        'is_holiday': is_holiday,
+        'is_workday': is_busday([day], holiday_dates)[0],
+        'reporting_week_start': get_monday_of_week(day),
+        'fiscal_month': day.replace(day=1),
+    }
+
+def ensure_calendar(start, end):
+    """
+    Adds any missing calendar_days rows between start and end (inclusive) with one
+    query for what exists, one for the holidays in range and chunked INSERTs.
+    Returns the number of rows added. The caller commits.
+    """
+    existing = {d for (d,) in db.session.query(CalendarDay.calendar_date).filter(CalendarDay.calendar_date.between(start, end))}
+    if len(existing) == (end - start).days + 1:
+        return 0
+    holiday_dates = {d for (d,) in db.session.query(Holiday.holiday_date).filter(Holiday.holiday_date.between(start, end))}
+    rows = [
+        calendar_row(start + timedelta(days=offset), holiday_dates)
+        for offset in range((end - start).days + 1)
+        if start + timedelta(days=offset) not in existing
+    ]
+    for index in range(0, len(rows), CALENDAR_INSERT_CHUNK):
+        db.session.execute(insert(CalendarDay), rows[index:index + CALENDAR_INSERT_CHUNK])
+    return len(rows)
+
+def workday_map(start, end):
+    """
+    {date: is_workday} for start..end inclusive, read from calendar_days. Read-only:
+    dates the table does not cover yet are worked out from the holidays table instead.
+    """
+    workdays = dict(db.session.query(CalendarDay.calendar_date, CalendarDay.is_workday).filter(CalendarDay.calendar_date.between(start, end)))
+    if len(workdays) < (end - start).days + 1:
+        holiday_dates = {d for (d,) in db.session.query(Holiday.holiday_date).filter(Holiday.holiday_date.between(start, end))}
+        missing = [start + timedelta(days=offset) for offset in range((end - start).days + 1) if start + timedelta(days=offset) not in workdays]
+        workdays.update(zip(missing, is_busday(missing, holiday_dates)))
+    return workdays
+
+
+@click.command('rebuild-calendar')
+@click.option('--start', type=click.DateTime(formats=['%Y-%m-%d']), help='First date (default: 1 January, two years ago).')
+@click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), help='Last date (default: 31 December next year).')
+def rebuild_calendar_command(start, end):
+    """Rebuilds calendar_days for a date range from the holidays table."""
+    today = date.today()
+    start = start.date() if start else date(today.year - 2, 1, 1)
+    end = end.date() if end else date(today.year + 1, 12, 31)
+    db.session.query(CalendarDay).filter(CalendarDay.calendar_date.between(start, end)).delete(synchronize_session=False)
+    added = ensure_calendar(start, end)
+    db.session.commit()
+    print(f"Rebuilt {added} calendar days from {start} to {end}.")
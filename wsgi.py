@@ -0,0 +1,6 @@
+# wsgi.py
+# Production entry point. `flask serve` runs it under gunicorn with the WEB_* settings from Config;
+# other WSGI servers can point at wsgi:app directly.
+from app import create_app
+
+app = create_app()